@@ -1,7 +1,9 @@
 from __future__ import absolute_import
+from . import aio
 from . import sfdc
 
 name = 'SalesforcePy'
 client = sfdc.client
+async_client = aio.client
 
 LoginException = sfdc.LoginException
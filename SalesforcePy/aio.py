@@ -0,0 +1,766 @@
+"""
+.. module:: aio
+   :synopsis: An asyncio client mirroring `sfdc.Client`, built on `httpx`.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import asyncio
+import logging
+
+from . import chatter
+from . import codec
+from . import commons
+from . import jobs
+from . import retry
+from . import sfdc
+from . import tokens
+from . import wave
+from .einstein.llm import embeddings
+from .einstein.llm import prompt
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+HttpxAuth = object if httpx is None else httpx.Auth
+
+
+async def request(base_request, http, auth=None, policy=None):
+    """ Sends `base_request` through the `httpx.AsyncClient` provided and returns the serialised response. This is the
+    async counterpart of `BaseRequest.request()`: the URL, headers and body come from the same request object, and the
+    response is deserialised by its `parse_response()`. Catches any exceptions and appends them to
+    `base_request.exceptions`.
+
+      :param: base_request: Request to send
+      :type: base_request: commons.BaseRequest
+      :param: http: Async HTTP client
+      :type: http: httpx.AsyncClient
+      :param: auth: Auth flow through which the request is sent, eg. `AsyncSessionAuth`
+      :type: auth: httpx.Auth|None
+      :param: policy: Policy with which the request is sent again if it fails, see `send_with_retry()`
+      :type: policy: retry.RetryPolicy|None
+      :return: response: Salesforce response, if available
+      :rtype: list|dict|None
+    """
+    (headers, logger, request_object, response, service) = base_request.get_request_vars()
+    logger.info('%s %s' % (base_request.http_method, service))
+
+    body_kwargs = base_request.get_body_kwargs()
+    if auth is not None:
+        body_kwargs['auth'] = auth
+    if isinstance(body_kwargs.get('data'), (str, bytes)):
+        body_kwargs['content'] = body_kwargs.pop('data')
+    elif hasattr(body_kwargs.get('data'), '__next__'):
+        body_kwargs['content'] = aiter_chunks(body_kwargs.pop('data'))
+
+    try:
+        request_object = await send_with_retry(
+            http, policy, base_request.http_method, service, headers=headers, timeout=base_request.timeout,
+            **body_kwargs)
+        base_request.status = request_object.status_code
+        base_request.response_headers = request_object.headers
+        response = base_request.parse_response(request_object)
+    except Exception as e:
+        base_request.exceptions.append(e)
+        logger.error('%s %s %s' % (base_request.http_method, service, base_request.status))
+        logger.error(e)
+
+    return response
+
+
+async def send_with_retry(http, policy, method, url, **kwargs):
+    """ Sends a request through `http`, and sends it again according to `policy` while it fails with a transient
+    error, waiting with `asyncio.sleep()` in between. The async counterpart of `retry.RetryAdapter`.
+
+      :param: http: Async HTTP client
+      :type: http: httpx.AsyncClient
+      :param: policy: Retry policy, or `None` to send the request once
+      :type: policy: retry.RetryPolicy|None
+      :param: method: HTTP method
+      :type: method: string
+      :param: url: URL
+      :type: url: string
+      :param: **kwargs: kwargs of `httpx.AsyncClient.request()`
+      :type: **kwargs: dict
+      :return: response
+      :rtype: httpx.Response
+    """
+    if policy is None:
+        return await http.request(method, url, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    budget = policy.get_budget(method, 'content' not in kwargs or isinstance(kwargs['content'], (str, bytes)))
+    deadline = loop.time() + policy.deadline
+    attempt = 0
+
+    while True:
+        (response, error) = (None, None)
+        try:
+            response = await http.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            error = e
+
+        if attempt >= budget:
+            retryable = False
+        elif error is not None:
+            retryable = policy.is_retryable_error(
+                method, not isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)))
+        else:
+            retryable = response.status_code >= 400 and policy.is_retryable_response(
+                response.status_code, response.content)
+
+        wait = policy.get_backoff(attempt, None if response is None else response.headers) if retryable else 0
+        if not retryable or loop.time() + wait > deadline:
+            if error is not None:
+                raise error
+            return response
+
+        policy.record(retry.get_endpoint(method, url), wait)
+        await asyncio.sleep(wait)
+        attempt += 1
+
+
+def get_unsupported_error(method, alternative):
+    """ Returns the error raised by a method of the sync client which the async client doesn't support.
+
+      :param: method: Name of the method
+      :type: method: string
+      :param: alternative: Name of the async method to use instead
+      :type: alternative: string
+      :return: error
+      :rtype: NotImplementedError
+    """
+    return NotImplementedError('%s() is not supported by AsyncClient. Gather %s() calls, or use sfdc.Client' % (
+        method, alternative))
+
+
+class AsyncSessionAuth(commons.SessionAuth, HttpxAuth):
+    """ The asyncio counterpart of `commons.SessionAuth`, as an `httpx` auth flow: when a response reports an invalid
+    session, the client logs in again once for all the coroutines whose requests failed with the same session, and
+    the failed request is replayed with the new session if its method is idempotent and its body isn't streamed.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, client):
+        """ Constructor.
+
+          :param: client: Client whose session is renewed
+          :type: client: AsyncClient
+        """
+        super(AsyncSessionAuth, self).__init__(client)
+        self.lock = asyncio.Lock()
+
+    async def refresh(self, stale):
+        async with self.lock:
+            if stale in self.stale:
+                return self.client.session_id
+            elif stale != self.client.session_id or stale == self.failed:
+                return None
+
+            self.client.load_token(self.client.client_kwargs)
+            if self.client.session_id == stale and self.client.relogin is not None:
+                await self.client.relogin(refresh=True)
+            return self.renewed(stale)
+
+    async def async_auth_flow(self, request):
+        if self.get_session_id(request.headers) in self.stale and self.client.session_id is not None:
+            request.headers['Authorization'] = 'OAuth %s' % self.client.session_id
+        response = yield request
+
+        if response.status_code != 401:
+            return
+        await response.aread()
+        stale = self.get_stale_session_id(response.status_code, response.content, request.headers)
+        if stale is None:
+            return
+
+        session_id = await self.refresh(stale)
+        body = b'' if isinstance(request.stream, httpx.ByteStream) else request.stream
+        if session_id is None or not self.can_replay(request.method, body):
+            return
+        request.headers['Authorization'] = 'OAuth %s' % session_id
+        self.replays += 1
+        yield request
+
+
+async def aiter_chunks(chunks):
+    """ Wraps a generator of body chunks, eg. a streamed CSV upload, into an async generator. Each chunk is produced
+    on the default executor, so that reading files doesn't block the event loop.
+
+      :param: chunks: Chunks
+      :type: chunks: generator
+      :return: async generator of bytes
+      :rtype: async generator
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, next, chunks, None)
+        if chunk is None:
+            break
+        yield chunk
+
+
+def get_proxy_mounts(proxies):
+    """ Converts a `requests` style proxies dict into `httpx` transport mounts.
+
+      :param: proxies: A dict containing proxies, eg. `{"https": "example.org:443"}`
+      :type: proxies: dict
+      :return: mounts
+      :rtype: dict
+    """
+    mounts = {}
+    for scheme, proxy in (proxies or {}).items():
+        if '://' not in proxy:
+            proxy = 'http://%s' % proxy
+        mounts['%s://' % scheme] = httpx.AsyncHTTPTransport(proxy=proxy)
+    return mounts
+
+
+class AsyncClient(object):
+    """ The asyncio client class from which all API calls to a Salesforce organisation are made. Every method mirrors
+    its `sfdc.Client` namesake as a coroutine and returns the same `(response, request)` tuples.
+
+    All requests are sent through one `httpx.AsyncClient`, so a single event loop can keep many calls in flight over a
+    shared connection pool.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, *args, **kwargs):
+        """ Constructor.
+
+            :Parameters:
+                - `*username` (`string`) - Salesforce username.
+                - `*password` (`string`) - Salesforce password.
+                - `*client_id` (`string`) - Salesforce client ID.
+                - `*client_secret` (`string`) - Salesforce client secret.
+                - `\\**kwargs` - kwargs (see below)
+
+            :Keyword Arguments:
+                * *proxies* (`dict`) --
+                    A dict containing proxies, applied to the whole connection pool. Ex:
+                        `{"https": "example.org:443"}`
+                    Default: `None`
+                * *version* (`string`) --
+                   SFDC API version to use e.g. '39.0'
+                * *http* (`httpx.AsyncClient`) --
+                   Async HTTP client to send every request through. If not provided, one is built with the limits below.
+                * *max_connections* (`int`) --
+                   Maximum number of concurrent connections in the pool. Default: `100`
+                * *max_keepalive_connections* (`int`) --
+                   Maximum number of idle connections kept alive. Default: `20`
+                * *codec* (`string|codec.JsonCodec`) --
+                   JSON codec with which bodies are encoded and decoded. Default: `'auto'`, the fastest installed
+                * *version_cache* (`cache.VersionCache`) --
+                   Cache of the latest API version of each instance, consulted on login when `version` isn't set.
+                * *token_store* (`tokens.TokenStore`) --
+                   Store of session tokens, which `login()` resumes without any request unless `refresh=True`.
+                * *reauth* (`bool`) --
+                   Whether to log in again once, for every coroutine, when a request fails with `INVALID_SESSION_ID`,
+                   and replay the failed request if it is idempotent. Default: `True`
+                * *retry* (`bool|retry.RetryPolicy`) --
+                   Policy with which requests failing with a transient error are sent again, with backoff. `True`
+                   selects a default `retry.RetryPolicy`. Default: `False`, no retries
+        """
+        if httpx is None:
+            raise ImportError('AsyncClient requires httpx. Install it with `pip install SalesforcePy[async]`')
+
+        self.username = args[0]
+        self.password = args[1]
+        self.client_id = args[2]
+        self.client_secret = args[3]
+        self.proxies = kwargs.get('proxies')
+        self.instance_url = None
+        self.session_id = None
+        self.owns_http = 'http' not in kwargs
+        self.http = kwargs['http'] if not self.owns_http else httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=kwargs.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+                max_keepalive_connections=kwargs.get('max_keepalive_connections', DEFAULT_MAX_KEEPALIVE_CONNECTIONS)),
+            mounts=get_proxy_mounts(self.proxies),
+            timeout=None)
+        self.codec = kwargs['codec'] = codec.get_codec(kwargs.get('codec'))
+        self.retry_policy = kwargs['retry'] = retry.get_retry_policy(kwargs.get('retry'))
+        self.client_kwargs = kwargs
+        self.relogin = None
+        self.auth = AsyncSessionAuth(self) if kwargs.get('reauth', True) else None
+        self.chatter = AsyncChatter(self)
+        self.jobs = AsyncJobs(self)
+        self.wave = AsyncWave(self)
+        self.einstein = AsyncEinstein(self)
+
+    async def send(self, base_request):
+        """ Sends `base_request` through the client's connection pool.
+
+          :param: base_request: Request to send
+          :type: base_request: commons.BaseRequest
+          :return: response
+          :rtype: list|dict|None
+        """
+        return await request(base_request, self.http, self.auth, self.retry_policy)
+
+    def set_instance_url(self, url):
+        sfdc.Client.set_instance_url(self, url)
+
+    @commons.kwarg_adder
+    async def login(self, **kwargs):
+        """ Performs a login request.
+
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Login response
+          :rtype: (dict, sfdc.Login)
+        """
+
+        login_response = sfdc.Login(
+            self.username,
+            self.password,
+            self.client_id,
+            self.client_secret,
+            **kwargs
+        )
+        token = self.load_token(kwargs)
+        if token is not None:
+            await self.set_api_version()
+            login_response.session_id = self.session_id
+            login_response.instance_url = self.instance_url
+            login_response.from_cache = True
+            self.relogin = self.login
+            return tokens.get_token_response(token), login_response
+
+        req = await self.send(login_response)
+        login_response.from_cache = False
+
+        if req is not None:
+            self.session_id = login_response.get_session_id()
+            self.set_instance_url(req.get('instance_url', str()))
+            await self.set_api_version()
+            self.save_token()
+            self.relogin = self.login
+
+        return req, login_response
+
+    def get_token_key(self):
+        return sfdc.Client.get_token_key(self)
+
+    def load_token(self, kwargs):
+        """ Resumes the session stored in the `token_store` kwarg, as `sfdc.Client.load_token()` does, leaving the API
+        version to `set_api_version()`.
+
+          :return: token
+          :rtype: dict|None
+        """
+        token_store = kwargs.get('token_store')
+        token = None if token_store is None or kwargs.get('refresh', False) else token_store.get(self.get_token_key())
+        if token is not None:
+            self.session_id = token['session_id']
+            self.instance_url = token['instance_url']
+            if 'version' not in self.client_kwargs and token.get('version') is not None:
+                self.client_kwargs['version'] = token['version']
+        return token
+
+    def save_token(self):
+        sfdc.Client.save_token(self)
+
+    def delete_token(self):
+        sfdc.Client.delete_token(self)
+
+    async def set_api_version(self):
+        """
+        Sets the api version to be used by the client. If not provided, it will get the latest version
+        available
+        """
+        if 'version' not in self.client_kwargs:
+            version_cache = self.client_kwargs.get('version_cache')
+            version = None if version_cache is None else version_cache.get(self.instance_url)
+            if version is not None:
+                self.client_kwargs.update({'version': version})
+                return
+
+            service = 'https://' + self.instance_url + sfdc.VERSIONS_SERVICE
+            try:
+                r = await self.http.get(service, headers={'Content-Type': 'application/json'})
+                if r.status_code == 200:
+                    version = max(i['version'] for i in self.codec.loads(r.content))
+            except (httpx.TransportError, ValueError, TypeError, KeyError) as e:
+                logging.getLogger('sfdc_py').error(
+                    'Unable to discover the API version of %s: %s' % (self.instance_url, e))
+                version = None
+
+            if version is None:
+                # use a known recent api version
+                version = sfdc.DEFAULT_API_VERSION
+            elif version_cache is not None:
+                version_cache.put(self.instance_url, version)
+            self.client_kwargs.update({'version': version})
+
+    @commons.kwarg_adder
+    async def logout(self, **kwargs):
+        """ Performs a logout request.
+
+          :return: Logout response
+          :rtype: (dict, sfdc.Logout)
+        """
+
+        logout_response = sfdc.Logout(self.session_id, self.instance_url, **kwargs)
+        req = await self.send(logout_response)
+        self.delete_token()
+        return req, logout_response
+
+    @commons.kwarg_adder
+    async def query(self, qs, **kwargs):
+        """ Performs a query request.
+
+          :param: qs: Query string. eg `'SELECT Id FROM Account LIMIT 10'`
+          :type: qs: string
+          :return: Query response
+          :rtype: (dict, sfdc.Query)
+        """
+
+        q = sfdc.Query(self.session_id, self.instance_url, qs, **kwargs)
+        req = await self.send(q)
+        return req, q
+
+    @commons.kwarg_adder
+    async def query_more(self, qs, **kwargs):
+        """ Performs a query more request, following each `nextRecordsUrl` until the last batch.
+
+          :param: qs: Query string. eg `'SELECT Id FROM Lead'`
+          :type: qs: string
+          :return: QueryMore response
+          :rtype: ([dict], sfdc.QueryMore)
+        """
+
+        qm = sfdc.QueryMore(self.session_id, self.instance_url, qs, **kwargs)
+        q = sfdc.Query(self.session_id, self.instance_url, qs, **dict(kwargs, schemas=qm.schemas))
+        last = await self.send(q)
+        qm.status = q.status
+        if last is None:
+            qm.exceptions.extend(q.exceptions)
+            return None, qm
+
+        results = [last]
+        while isinstance(last, dict) and last.get('done') is False:
+            qm.service = last.get('nextRecordsUrl')
+            qm.request_url = None
+            last = await self.send(qm)
+            if last is None:
+                return None, qm
+            results.append(last)
+
+        return results, qm
+
+    @commons.kwarg_adder
+    async def search(self, ss, **kwargs):
+        """ Performs a search request.
+
+          :param: ss: Search string. eg `'FIND {sfdc_py} RETURNING Account(Id, Name) LIMIT 5'`
+          :type: ss: string
+          :return: Search response
+          :rtype: (dict, sfdc.Search)
+        """
+
+        s = sfdc.Search(self.session_id, self.instance_url, ss, **kwargs)
+        req = await self.send(s)
+        return req, s
+
+    @commons.kwarg_adder
+    def sobjects(self, **kwargs):
+        """ Prepares an SObject controller whose methods are coroutines.
+
+          :return: SObjects controller
+          :rtype: AsyncSObjectController
+        """
+
+        return AsyncSObjectController(
+            self,
+            kwargs.get('object_type'),
+            kwargs.get('id'),
+            kwargs.get('binary_field'),
+            kwargs.get('version'),
+            kwargs.get('external_id'))
+
+    async def close(self):
+        """ Closes the connection pool. Clients passed in through the `http` kwarg are left open for their owner to
+        close.
+        """
+        if self.owns_http:
+            await self.http.aclose()
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, _type, value, traceback):
+        try:
+            await self.logout()
+        except Exception as e:
+            logging.getLogger('sfdc_py').warning('Unable to logout. Reason: {}'.format(e.args[0]))
+        finally:
+            await self.close()
+
+
+class AsyncSObjectController(sfdc.SObjectController):
+    """ Async counterpart of `sfdc.SObjectController`. Requests are built exactly as in the sync controller and sent
+    through the client's connection pool.
+
+        .. versionadded:: 2.3.0
+    """
+    @commons.kwarg_adder
+    async def insert(self, body, **kwargs):
+        sobj = self.get_insert_request(body, kwargs)
+        req = await self.__client__.send(sobj)
+        return req, sobj
+
+    @commons.kwarg_adder
+    async def update(self, body, **kwargs):
+        sobj = self.get_sobjects_request('PATCH', kwargs, body=body)
+        req = await self.__client__.send(sobj)
+        self.invalidate_records(kwargs)
+        return req, sobj
+
+    @commons.kwarg_adder
+    async def upsert(self, body, **kwargs):
+        sobj = self.get_sobjects_request('PATCH', kwargs, body=body)
+        req = await self.__client__.send(sobj)
+        self.invalidate_records(kwargs)
+        return req, sobj
+
+    @commons.kwarg_adder
+    async def delete(self, **kwargs):
+        sobj = self.get_sobjects_request('DELETE', kwargs)
+        req = await self.__client__.send(sobj)
+        self.invalidate_records(kwargs)
+        return req, sobj
+
+    def insert_many(self, records, all_or_none=False, **kwargs):
+        """ Not supported: the sObject Collections executors send their chunks from worker threads through a
+        `requests` session, which the async client doesn't have. Gather `insert()` calls, or use `sfdc.Client`.
+
+          :raises: NotImplementedError
+        """
+        raise get_unsupported_error('insert_many', 'insert')
+
+    def update_many(self, records, all_or_none=False, **kwargs):
+        """ Not supported: the sObject Collections executors send their chunks from worker threads through a
+        `requests` session, which the async client doesn't have. Gather `update()` calls, or use `sfdc.Client`.
+
+          :raises: NotImplementedError
+        """
+        raise get_unsupported_error('update_many', 'update')
+
+    def upsert_many(self, records, all_or_none=False, **kwargs):
+        """ Not supported: the sObject Collections executors send their chunks from worker threads through a
+        `requests` session, which the async client doesn't have. Gather `upsert()` calls, or use `sfdc.Client`.
+
+          :raises: NotImplementedError
+        """
+        raise get_unsupported_error('upsert_many', 'upsert')
+
+    def delete_many(self, ids, all_or_none=False, **kwargs):
+        """ Not supported: the sObject Collections executors send their chunks from worker threads through a
+        `requests` session, which the async client doesn't have. Gather `delete()` calls, or use `sfdc.Client`.
+
+          :raises: NotImplementedError
+        """
+        raise get_unsupported_error('delete_many', 'delete')
+
+    @commons.kwarg_adder
+    async def query(self, **kwargs):
+        sobj = self.get_sobjects_request('GET', kwargs)
+        key = self.get_record_key(kwargs)
+        if key is not None and not kwargs.get('refresh', False):
+            cached = kwargs['record_cache'].get(key)
+            if cached is not None:
+                sobj.from_cache = True
+                return cached, sobj
+
+        req = await self.__client__.send(sobj)
+        if key is not None and sobj.status == 200 and isinstance(req, dict):
+            kwargs['record_cache'].put(key, req)
+        sob_blob = self.get_blob_request(req)
+        if sob_blob is not None:
+            sob_blob.response = await self.__client__.send(sob_blob)
+            return req, sobj, sob_blob
+        return req, sobj
+
+    @commons.kwarg_adder
+    async def describe(self, **kwargs):
+        sobj = self.get_sobjects_request('GET', kwargs, resource_suffix='/describe')
+        return await self.send_describe(sobj, kwargs, '/describe')
+
+    @commons.kwarg_adder
+    async def describe_global(self, **kwargs):
+        sobj = self.get_sobjects_request('GET', kwargs)
+        return await self.send_describe(sobj, kwargs)
+
+    async def send_describe(self, sobj, kwargs, resource=''):
+        describe_cache = kwargs.get('describe_cache')
+        if describe_cache is None:
+            return await self.__client__.send(sobj), sobj
+
+        key = describe_cache.get_key(sobj.instance_url, sobj.api_version, self.object_type, resource)
+        cached = describe_cache.prepare(key, sobj, kwargs.get('refresh', False))
+        if cached is not None:
+            return cached, sobj
+        return describe_cache.store(key, sobj, await self.__client__.send(sobj)), sobj
+
+
+class AsyncChatter(commons.ApiNamespace):
+    """ Async counterpart of `chatter.Chatter`.
+
+        .. versionadded:: 2.3.0
+    """
+    @commons.kwarg_adder
+    async def feed_item(self, body, **kwargs):
+        client = self.client
+        fi = chatter.ChatterFeedItem(client.session_id, client.instance_url, body, **kwargs)
+        res = await client.send(fi)
+
+        return res, fi
+
+    @commons.kwarg_adder
+    async def feed_comment(self, _id, body, **kwargs):
+        client = self.client
+        fc = chatter.ChatterFeedComment(client.session_id, client.instance_url, _id, body, **kwargs)
+        res = await client.send(fc)
+
+        return res, fc
+
+
+class AsyncIngest(commons.ApiNamespace):
+    """ Async counterpart of `jobs.Ingest`.
+
+        .. versionadded:: 2.3.0
+    """
+    @commons.kwarg_adder
+    async def batches(self, job_id, csv_file, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        batches = jobs.Batches(client.session_id, client.instance_url, api_version, job_id, csv_file, **kwargs)
+        response = await client.send(batches)
+
+        return response, batches
+
+    @commons.kwarg_adder
+    async def create(self, job_resource, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        create_job = jobs.CreateJob(client.session_id, client.instance_url, api_version, job_resource, **kwargs)
+        response = await client.send(create_job)
+
+        return response, create_job
+
+    @commons.kwarg_adder
+    async def get(self, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        get_job = jobs.GetJob(client.session_id, client.instance_url, api_version, **kwargs)
+        response = await client.send(get_job)
+
+        return response, get_job
+
+    @commons.kwarg_adder
+    async def delete(self, job_id, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        delete_job = jobs.DeleteJob(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+        response = await client.send(delete_job)
+
+        return response, delete_job
+
+    @commons.kwarg_adder
+    async def update(self, job_id, state, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        update_job = jobs.UpdateJob(
+            client.session_id, client.instance_url, api_version, job_id, {'state': state}, **kwargs)
+        response = await client.send(update_job)
+
+        return response, update_job
+
+
+class AsyncJobs(commons.ApiNamespace):
+    def __init__(self, client):
+        super(AsyncJobs, self).__init__(client)
+
+        self.ingest = AsyncIngest(client)
+
+
+class AsyncWave(commons.ApiNamespace):
+    """ Async counterpart of `wave.Wave`.
+
+        .. versionadded:: 2.3.0
+    """
+    @commons.kwarg_adder
+    async def dataset(self, api_name, **kwargs):
+        client = self.client
+        wds = wave.WaveDataSet(client.session_id, client.instance_url, api_name, **kwargs)
+        res = await client.send(wds)
+
+        return res, wds
+
+    @commons.kwarg_adder
+    async def query(self, q, **kwargs):
+        client = self.client
+        wq = wave.WaveQuery(client.session_id, client.instance_url, q, **kwargs)
+        res = await client.send(wq)
+
+        return res, wq
+
+
+class AsyncPrompt(commons.ApiNamespace):
+    @commons.kwarg_adder
+    async def generations(self, request_body, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        generated = prompt.Generations(client.session_id, client.instance_url, api_version, request_body, **kwargs)
+        response = await client.send(generated)
+
+        return response, generated
+
+
+class AsyncLLM(commons.ApiNamespace):
+    def __init__(self, client):
+        super(AsyncLLM, self).__init__(client)
+        self.prompt = AsyncPrompt(client)
+
+    @commons.kwarg_adder
+    async def embeddings(self, request_body, **kwargs):
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        embedding_vector = embeddings.Embeddings(
+            client.session_id, client.instance_url, api_version, request_body, **kwargs)
+        response = await client.send(embedding_vector)
+
+        return response, embedding_vector
+
+
+class AsyncEinstein(commons.ApiNamespace):
+    def __init__(self, client):
+        super(AsyncEinstein, self).__init__(client)
+
+        self.llm = AsyncLLM(client)
+
+
+def client(username, password, client_id=None, client_secret=None, **kwargs):
+    """ Builds an `AsyncClient` and returns it.
+
+        .. versionadded:: 2.3.0
+
+        :returns: client
+        :rtype: AsyncClient
+        :raises: ImportError if `httpx` is not installed
+    """
+
+    return AsyncClient(
+        username,
+        password,
+        client_id,
+        client_secret,
+        **kwargs)
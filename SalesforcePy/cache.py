@@ -0,0 +1,479 @@
+"""
+.. module:: cache
+   :synopsis: In-process and on-disk caches for data which rarely changes, eg. API versions, describe results and
+      reference records.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import collections
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import requests
+
+DEFAULT_DESCRIBE_TTL = 300
+DEFAULT_DESCRIBE_MAXSIZE = 256
+DEFAULT_RECORD_TTL = 300
+DEFAULT_RECORD_MAXSIZE = 10000
+DEFAULT_VERSION_TTL = 86400
+GLOBAL_DESCRIBE = ''
+
+
+class LRUCache(object):
+    """ A thread-safe mapping holding up to `maxsize` entries, evicting the least recently used one first.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, maxsize):
+        """ Constructor.
+
+          :param: maxsize: Maximum number of entries
+          :type: maxsize: int
+        """
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """ Returns the entry for `key`, marking it as the most recently used, or `default`. """
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        """ Stores `value` for `key`, evicting the least recently used entries beyond `maxsize`. """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """ Removes the entry for `key` and returns it, or `default`. """
+        with self.lock:
+            return self.entries.pop(key, default)
+
+    def keys(self):
+        with self.lock:
+            return list(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class DescribeEntry(object):
+    """ A cached describe result, with the validators with which it can be revalidated.
+
+        .. versionadded:: 2.3.0
+    """
+    __slots__ = ('body', 'etag', 'last_modified', 'fetched')
+
+    def __init__(self, body, etag=None, last_modified=None, fetched=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched = time.time() if fetched is None else fetched
+
+
+class DescribeCache(object):
+    """ Caches the results of `SObjectController.describe()` and `describe_global()` by instance, API version, object
+    and resource, in an in-process LRU and optionally in a SQLite database on disk, shared between processes and runs.
+
+    A result younger than `ttl` seconds is returned without any request. An older one is revalidated with
+    `If-None-Match` and `If-Modified-Since`: a `304 Not Modified` response renews it, and anything else replaces it.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, ttl=DEFAULT_DESCRIBE_TTL, maxsize=DEFAULT_DESCRIBE_MAXSIZE, path=None):
+        """ Constructor.
+
+          :param: ttl: Seconds during which a result is returned without revalidation, or `None` to never revalidate.
+            Default: `300`
+          :type: ttl: int|float|None
+          :param: maxsize: Maximum number of results held in memory. Default: `256`
+          :type: maxsize: int
+          :param: path: Path of the SQLite database in which results are also stored. Default: memory only
+          :type: path: string
+        """
+        self.ttl = ttl
+        self.entries = LRUCache(maxsize)
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = None
+
+        if path is not None:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS describes (instance_url TEXT, api_version TEXT, object_type TEXT, '
+                'resource TEXT, etag TEXT, last_modified TEXT, fetched REAL, body TEXT, '
+                'PRIMARY KEY (instance_url, api_version, object_type, resource))')
+            self.connection.commit()
+
+    def get_key(self, instance_url, api_version, object_type=None, resource=''):
+        """ Returns the key of the describe result of `object_type`, or of the global describe.
+
+          :param: instance_url: Instance URL, eg. `'eu11.salesforce.com'`
+          :type: instance_url: string
+          :param: api_version: API version, eg. `'45.0'`
+          :type: api_version: string
+          :param: object_type: Name of the SObject, or `None` for the global describe
+          :type: object_type: string|None
+          :param: resource: Resource requested under the object, eg. `'/describe'`. Default: the object itself
+          :type: resource: string
+          :return: key
+          :rtype: (string, string, string, string)
+        """
+        return instance_url, str(api_version), object_type or GLOBAL_DESCRIBE, resource
+
+    def get(self, key):
+        """ Returns the entry for `key` from memory, or from disk, or `None`.
+
+          :param: key: key
+          :type: key: tuple
+          :return: entry
+          :rtype: DescribeEntry|None
+        """
+        entry = self.entries.get(key)
+        if entry is None and self.connection is not None:
+            with self.lock:
+                row = self.connection.execute(
+                    'SELECT etag, last_modified, fetched, body FROM describes '
+                    'WHERE instance_url = ? AND api_version = ? AND object_type = ? AND resource = ?', key).fetchone()
+            if row is not None:
+                entry = DescribeEntry(json.loads(row[3]), row[0], row[1], row[2])
+                self.entries.put(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        """ Stores `entry` for `key`, in memory and on disk.
+
+          :param: key: key
+          :type: key: tuple
+          :param: entry: entry
+          :type: entry: DescribeEntry
+        """
+        self.entries.put(key, entry)
+        if self.connection is not None:
+            with self.lock:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO describes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    key + (entry.etag, entry.last_modified, entry.fetched, json.dumps(entry.body)))
+                self.connection.commit()
+
+    def is_fresh(self, entry):
+        return self.ttl is None or time.time() - entry.fetched < self.ttl
+
+    def prepare(self, key, sobj, refresh=False):
+        """ Returns the cached result for `key` if it is fresh, marking `sobj` as served from the cache. Otherwise adds
+        the validators of the cached result, if any, to the headers of `sobj` and returns `None`.
+
+          :param: key: key
+          :type: key: tuple
+          :param: sobj: Describe request, not sent yet
+          :type: sobj: sfdc.SObjects
+          :param: refresh: Revalidate the cached result even if it is fresh
+          :type: refresh: bool
+          :return: Cached describe result
+          :rtype: dict|None
+        """
+        entry = self.get(key)
+        sobj.from_cache = False
+        if entry is None:
+            return None
+        elif self.is_fresh(entry) and not refresh:
+            sobj.from_cache = True
+            return entry.body
+
+        headers = sobj.get_headers()
+        if entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+        return None
+
+    def store(self, key, sobj, response):
+        """ Stores the result of the describe request `sobj` once sent, and returns the describe result: the cached one
+        if the response is `304 Not Modified`.
+
+          :param: key: key
+          :type: key: tuple
+          :param: sobj: Describe request, sent
+          :type: sobj: sfdc.SObjects
+          :param: response: Deserialised response
+          :type: response: dict|None
+          :return: Describe result
+          :rtype: dict|None
+        """
+        headers = sobj.response_headers or {}
+        if sobj.status == requests.codes.not_modified:
+            entry = self.get(key)
+            if entry is not None:
+                entry.fetched = time.time()
+                self.put(key, entry)
+                sobj.from_cache = True
+                return entry.body
+        elif sobj.status == requests.codes.ok and isinstance(response, dict):
+            last_modified = headers.get('Last-Modified') or headers.get('Date')
+            self.put(key, DescribeEntry(response, headers.get('ETag'), last_modified))
+        return response
+
+    def invalidate(self, object_type=None):
+        """ Removes the cached results of `object_type`, for every instance, API version and resource, or every cached
+        result.
+        Use `GLOBAL_DESCRIBE` as `object_type` to remove global describe results.
+
+          :param: object_type: Name of the SObject. Default: every result
+          :type: object_type: string|None
+        """
+        for key in self.entries.keys():
+            if object_type is None or key[2] == object_type:
+                self.entries.pop(key)
+
+        if self.connection is not None:
+            with self.lock:
+                if object_type is None:
+                    self.connection.execute('DELETE FROM describes')
+                else:
+                    self.connection.execute('DELETE FROM describes WHERE object_type = ?', (object_type,))
+                self.connection.commit()
+
+    def close(self):
+        """ Closes the database, if any. """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class RecordCache(object):
+    """ A bounded read-through cache of the records returned by `SObjectController.query()` by ID or external ID,
+    evicting the least recently used records first and expiring them after `ttl` seconds.
+
+    Records updated, upserted or deleted through a client using the cache are invalidated: updates and deletes by ID
+    invalidate that record, along with the records of the same object cached by external ID, and upserts or writes by
+    external ID invalidate every record of the object. Writes made elsewhere are only seen once records expire.
+
+    Cached records are shared between callers and should not be modified.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, maxsize=DEFAULT_RECORD_MAXSIZE, ttl=DEFAULT_RECORD_TTL):
+        """ Constructor.
+
+          :param: maxsize: Maximum number of records. Default: `10000`
+          :type: maxsize: int
+          :param: ttl: Seconds after which a record expires, or `None` for never. Default: `300`
+          :type: ttl: int|float|None
+        """
+        self.entries = LRUCache(maxsize)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.external_ids = False
+
+    def get_key(self, instance_url, object_type, record_id, external_id=None):
+        """ Returns the key of a record. IDs are keyed by their case-sensitive 15 character form, so that both forms
+        of an ID share an entry.
+
+          :param: instance_url: Instance URL, eg. `'eu11.salesforce.com'`
+          :type: instance_url: string
+          :param: object_type: Name of the SObject
+          :type: object_type: string
+          :param: record_id: ID of the record, or its external ID value
+          :type: record_id: string
+          :param: external_id: External ID field, if `record_id` is an external ID value
+          :type: external_id: string|None
+          :return: key
+          :rtype: (string, string, string, string)
+        """
+        if external_id is None:
+            return instance_url, object_type, 'Id', record_id[:15]
+        return instance_url, object_type, external_id, record_id
+
+    def get(self, key):
+        """ Returns the record for `key`, or `None` if it is missing or expired, counting a hit or a miss.
+
+          :param: key: key
+          :type: key: tuple
+          :return: record
+          :rtype: dict|None
+        """
+        entry = self.entries.get(key)
+        if entry is not None and self.ttl is not None and time.time() - entry[1] >= self.ttl:
+            self.entries.pop(key)
+            entry = None
+
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, record):
+        """ Stores `record` for `key`.
+
+          :param: key: key
+          :type: key: tuple
+          :param: record: record
+          :type: record: dict
+        """
+        if key[2] != 'Id':
+            self.external_ids = True
+        self.entries.put(key, (record, time.time()))
+
+    def invalidate(self, instance_url=None, object_type=None, record_id=None):
+        """ Removes the record with ID `record_id`, along with the records of the same object cached by external ID,
+        or every record of `object_type`, or every record. `None` matches any instance and object.
+
+          :param: instance_url: Instance URL
+          :type: instance_url: string|None
+          :param: object_type: Name of the SObject
+          :type: object_type: string|None
+          :param: record_id: ID of the record
+          :type: record_id: string|None
+        """
+        if record_id is not None and instance_url is not None and object_type is not None and not self.external_ids:
+            self.entries.pop(self.get_key(instance_url, object_type, record_id))
+            return
+
+        for key in self.entries.keys():
+            (url, sobject, field, value) = key
+            if instance_url not in (None, url) or object_type not in (None, sobject):
+                continue
+            elif record_id is None or field != 'Id' or value == record_id[:15]:
+                self.entries.pop(key)
+
+    def clear(self):
+        """ Removes every record and resets the counters. """
+        self.entries.clear()
+        with self.lock:
+            (self.hits, self.misses) = (0, 0)
+
+    def get_stats(self):
+        """ Returns the hit and miss counters and the number of records held.
+
+          :return: stats, eg. `{'hits': 980, 'misses': 20, 'size': 20}`
+          :rtype: dict
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+
+class VersionCache(object):
+    """ Caches the latest API version of each instance, so that `Client.set_api_version()` doesn't query
+    `/services/data/` on every login. Versions are held in memory and optionally in a JSON file, shared between
+    processes, eg. short-lived workers, and expire after `ttl` seconds.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, ttl=DEFAULT_VERSION_TTL, path=None):
+        """ Constructor.
+
+          :param: ttl: Seconds after which a version is discovered again, or `None` for never. Default: `86400`
+          :type: ttl: int|float|None
+          :param: path: Path of the JSON file in which versions are also stored. Default: memory only
+          :type: path: string
+        """
+        self.ttl = ttl
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def is_fresh(self, entry):
+        return self.ttl is None or time.time() - entry['fetched'] < self.ttl
+
+    def read(self):
+        """ Returns the versions stored in the file, or an empty dict if it is missing or unreadable. """
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, instance_url):
+        """ Returns the cached API version of `instance_url`, from memory or from the file, or `None` if it is missing
+        or expired.
+
+          :param: instance_url: Instance URL, eg. `'eu11.salesforce.com'`
+          :type: instance_url: string
+          :return: API version, eg. `'45.0'`
+          :rtype: string|None
+        """
+        with self.lock:
+            entry = self.entries.get(instance_url)
+            if (entry is None or not self.is_fresh(entry)) and self.path is not None:
+                entry = self.read().get(instance_url)
+                if isinstance(entry, dict) and 'version' in entry and 'fetched' in entry:
+                    self.entries[instance_url] = entry
+                else:
+                    entry = None
+            if entry is None or not self.is_fresh(entry):
+                return None
+            return entry['version']
+
+    def put(self, instance_url, version):
+        """ Stores the API version of `instance_url`, in memory and in the file, see `write()`.
+
+          :param: instance_url: Instance URL
+          :type: instance_url: string
+          :param: version: API version
+          :type: version: string
+        """
+        entry = {'version': version, 'fetched': time.time()}
+        with self.lock:
+            self.entries[instance_url] = entry
+            if self.path is None:
+                return
+            entries = self.read()
+            entries[instance_url] = entry
+            self.write(entries)
+
+    def invalidate(self, instance_url=None):
+        """ Removes the API version of `instance_url`, or every version.
+
+          :param: instance_url: Instance URL. Default: every instance
+          :type: instance_url: string|None
+        """
+        with self.lock:
+            if instance_url is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(instance_url, None)
+            if self.path is None:
+                return
+            entries = {} if instance_url is None else self.read()
+            entries.pop(instance_url, None)
+            self.write(entries)
+
+    def write(self, entries):
+        """ Replaces the file with `entries` atomically, so that concurrent processes never read it half written.
+
+          :param: entries: Versions by instance URL
+          :type: entries: dict
+        """
+        (fd, temp_path) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+        except (IOError, OSError):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
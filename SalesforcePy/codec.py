@@ -0,0 +1,120 @@
+"""
+.. module:: codec
+   :synopsis: Pluggable JSON codecs with which request bodies are encoded and response bodies decoded.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+AUTO = 'auto'
+PREFERRED_CODECS = ('orjson', 'simdjson', 'json')
+
+
+class JsonCodec(object):
+    """ Encodes and decodes JSON with the standard library. Subclasses swap in faster backends; bodies are always
+    decoded from and encoded to `bytes`, so that no intermediate `str` is built.
+
+        .. versionadded:: 2.3.0
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """ Deserialises a JSON document.
+
+          :param: data: JSON document
+          :type: data: bytes|string
+          :return: value
+          :rtype: list|dict|string|int|float|bool|None
+        """
+        return json.loads(data)
+
+    def dumps(self, value):
+        """ Serialises `value` to a UTF-8 encoded JSON document.
+
+          :param: value: value
+          :type: value: list|dict|string|int|float|bool|None
+          :return: JSON document
+          :rtype: bytes
+        """
+        return json.dumps(value).encode('utf-8')
+
+    def __repr__(self):
+        return '%s()' % type(self).__name__
+
+
+class OrjsonCodec(JsonCodec):
+    """ Encodes and decodes JSON with `orjson`. Values `orjson` can't serialise, eg. dicts with non-string keys or
+    integers beyond 64 bits, are serialised by the standard library instead.
+
+        .. versionadded:: 2.3.0
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson. Install it with `pip install orjson`')
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, value):
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            return super(OrjsonCodec, self).dumps(value)
+
+
+class SimdjsonCodec(JsonCodec):
+    """ Decodes JSON with `pysimdjson`, and encodes it with the standard library.
+
+        .. versionadded:: 2.3.0
+    """
+    name = 'simdjson'
+
+    def __init__(self):
+        if simdjson is None:
+            raise ImportError('SimdjsonCodec requires pysimdjson. Install it with `pip install pysimdjson`')
+
+    def loads(self, data):
+        return simdjson.loads(data)
+
+
+CODECS = {c.name: c for c in (JsonCodec, OrjsonCodec, SimdjsonCodec)}
+AVAILABLE = {'json': True, 'orjson': orjson is not None, 'simdjson': simdjson is not None}
+instances = {}
+
+
+def get_codec(codec=None):
+    """
+    Returns the codec named `codec`, or `codec` itself if it is already a codec. `None` and `'auto'` select the fastest
+    backend installed: `orjson`, then `simdjson`, then the standard library. Named codecs are built once and shared.
+
+    :param: codec: `'auto'`, `'orjson'`, `'simdjson'`, `'json'`, or any object with `loads()` and `dumps()`
+    :type: codec: string|JsonCodec|None
+    :return: codec
+    :rtype: JsonCodec
+    :raises: ValueError if `codec` is an unknown name, ImportError if its backend isn't installed
+    """
+    if codec is not None and not isinstance(codec, str):
+        return codec
+    elif codec is None or codec == AUTO:
+        codec = next(name for name in PREFERRED_CODECS if AVAILABLE[name])
+    elif codec not in CODECS:
+        raise ValueError('codec must be one of %s' % ', '.join((AUTO,) + PREFERRED_CODECS))
+
+    if codec not in instances:
+        instances[codec] = CODECS[codec]()
+    return instances[codec]
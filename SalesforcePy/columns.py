@@ -0,0 +1,390 @@
+"""
+.. module:: columns
+   :synopsis: Builds query results into typed, per-field columns for analytics.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import array
+import collections
+import datetime
+import re
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+BOOLEAN = 'boolean'
+INT = 'int'
+DOUBLE = 'double'
+DATE = 'date'
+DATETIME = 'datetime'
+OBJECT = 'object'
+TYPECODES = {BOOLEAN: 'b', INT: 'q', DOUBLE: 'd', DATE: 'q', DATETIME: 'q'}
+NUMPY_DTYPES = {BOOLEAN: 'bool', INT: 'int64', DOUBLE: 'float64', DATE: 'datetime64[D]', DATETIME: 'datetime64[ms]'}
+NAT = -2 ** 63
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+DATE_PATTERN = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+DATETIME_PATTERN = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z|([+-])(\d{2}):?(\d{2}))$')
+
+
+def parse_date(value):
+    """
+    Parses a date returned by the API, eg. `'2019-01-31'`, into days since the epoch.
+
+    :param: value: date string
+    :type: value: string
+    :return: days since 1970-01-01, or `None` if `value` is not a date
+    :rtype: int|None
+    """
+    match = DATE_PATTERN.match(value)
+    if match is None:
+        return None
+    try:
+        return datetime.date(*(int(g) for g in match.groups())).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def parse_datetime(value):
+    """
+    Parses a datetime returned by the API, eg. `'2019-01-31T10:56:43.000+0000'`, into milliseconds since the epoch.
+
+    :param: value: datetime string
+    :type: value: string
+    :return: milliseconds since 1970-01-01T00:00:00Z, or `None` if `value` is not a datetime
+    :rtype: int|None
+    """
+    match = DATETIME_PATTERN.match(value)
+    if match is None:
+        return None
+    (year, month, day, hour, minute, second, fraction, zone, sign, zone_hours, zone_minutes) = match.groups()
+    try:
+        days = datetime.date(int(year), int(month), int(day)).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+    seconds = days * 86400 + int(hour) * 3600 + int(minute) * 60 + int(second)
+    if zone != 'Z':
+        offset = int(zone_hours) * 3600 + int(zone_minutes) * 60
+        seconds -= offset if sign == '+' else -offset
+    return seconds * 1000 + int((fraction or '0').ljust(3, '0')[:3])
+
+
+def format_datetime(millis):
+    """
+    Formats milliseconds since the epoch the way the API does, eg. `'2019-01-31T10:56:43.000+0000'`.
+
+    :param: millis: milliseconds since 1970-01-01T00:00:00Z
+    :type: millis: int
+    :return: datetime string
+    :rtype: string
+    """
+    value = EPOCH + datetime.timedelta(milliseconds=millis)
+    return value.strftime('%Y-%m-%dT%H:%M:%S.') + '%03d+0000' % (value.microsecond // 1000)
+
+
+def get_kind(value):
+    """
+    Returns the column kind inferred from the first non-null value of a field.
+
+    :param: value: Field value
+    :type: value: any
+    :return: kind, eg. `'double'`
+    :rtype: string
+    """
+    if isinstance(value, bool):
+        return BOOLEAN
+    elif isinstance(value, int):
+        return INT
+    elif isinstance(value, float):
+        return DOUBLE
+    elif isinstance(value, str) and parse_date(value) is not None:
+        return DATE
+    elif isinstance(value, str) and parse_datetime(value) is not None:
+        return DATETIME
+    return OBJECT
+
+
+def flatten(record, prefix=''):
+    """
+    Yields the fields of `record` as (name, value) tuples, relationship fields flattened into dotted names, eg.
+    `('Account.Owner.Name', 'Jane')`. `attributes` are left out, and subquery results are yielded as lists of records.
+
+    :param: record: Record
+    :type: record: dict|records.Record
+    :param: prefix: Prefix of the field names, for related records
+    :type: prefix: string
+    :return: A generator of (name, value) tuples
+    :rtype: generator
+    """
+    for (field, value) in record.items():
+        if field == 'attributes':
+            continue
+        elif isinstance(value, Mapping) and isinstance(value.get('records'), list):
+            yield prefix + field, value['records']
+        elif isinstance(value, Mapping):
+            for item in flatten(value, prefix + field + '.'):
+                yield item
+            yield prefix + field, value
+        else:
+            yield prefix + field, value
+
+
+class Column(object):
+    """ Values of one field, held in an `array.array` for booleans, integers, doubles, dates and datetimes, or in a list
+    for strings and anything else. The kind of a column is given, or inferred from its first non-null value; an
+    integer column receiving a double becomes a double column, and any other mismatch turns it into an object column.
+
+    Nulls are recorded in `mask`. They are also stored in the array as `NaN` in double columns and as `NaT` in date
+    and datetime columns, whose values are days and milliseconds since the epoch.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, kind=None, length=0):
+        """ Constructor.
+
+          :param: kind: `'boolean'`, `'int'`, `'double'`, `'date'`, `'datetime'` or `'object'`. Default: inferred
+          :type: kind: string
+          :param: length: Number of nulls to start with, for fields first seen after some rows
+          :type: length: int
+        """
+        self.kind = None
+        self.values = []
+        self.mask = bytearray()
+        if kind is not None:
+            self.set_kind(kind)
+        for _ in range(length):
+            self.append(None)
+
+    def __len__(self):
+        return len(self.mask)
+
+    def set_kind(self, kind):
+        """ Sets the kind of the column, converting the values held so far.
+
+          :param: kind: kind
+          :type: kind: string
+        """
+        values = self.to_list(raw=True) if self.kind is not None else [None] * len(self.mask)
+        (self.kind, self.values, self.mask) = (kind, [], bytearray())
+        if kind in TYPECODES:
+            self.values = array.array(TYPECODES[kind])
+        for value in values:
+            self.append(value)
+
+    def get_null(self):
+        if self.kind == DOUBLE:
+            return float('nan')
+        elif self.kind in (DATE, DATETIME):
+            return NAT
+        elif self.kind in TYPECODES:
+            return 0
+
+    def convert(self, value):
+        """ Returns `value` as stored in a column of this kind, or raises `TypeError` if it doesn't fit. """
+        if self.kind == OBJECT:
+            return value
+        elif self.kind == BOOLEAN and isinstance(value, bool):
+            return value
+        elif self.kind == INT and isinstance(value, int) and not isinstance(value, bool):
+            return value
+        elif self.kind == DOUBLE and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        elif self.kind in (DATE, DATETIME) and isinstance(value, str):
+            converted = parse_date(value) if self.kind == DATE else parse_datetime(value)
+            if converted is not None:
+                return converted
+        raise TypeError('%r does not fit a %s column' % (value, self.kind))
+
+    def append(self, value):
+        """ Appends a value, or a null if `value` is `None`.
+
+          :param: value: value
+          :type: value: any
+        """
+        if value is None:
+            self.values.append(self.get_null())
+            self.mask.append(1)
+            return
+        elif self.kind is None:
+            self.set_kind(get_kind(value))
+
+        try:
+            converted = self.convert(value)
+        except TypeError:
+            promote = self.kind == INT and isinstance(value, float)
+            self.set_kind(DOUBLE if promote else OBJECT)
+            converted = self.convert(value)
+
+        try:
+            self.values.append(converted)
+        except OverflowError:
+            self.set_kind(OBJECT)
+            self.values.append(value)
+        self.mask.append(0)
+
+    def null_count(self):
+        """ Returns the number of nulls in the column.
+
+          :return: nulls
+          :rtype: int
+        """
+        return self.mask.count(1)
+
+    def to_list(self, raw=False):
+        """ Returns the values of the column as a list, nulls as `None`. Dates and datetimes are returned as
+        `datetime.date` and timezone-aware `datetime.datetime` objects, or as the strings returned by the API if `raw`.
+
+          :param: raw: Return dates and datetimes as strings. Default: `False`
+          :type: raw: bool
+          :return: values
+          :rtype: list
+        """
+        values = []
+        for (value, null) in zip(self.values, self.mask):
+            if null:
+                value = None
+            elif self.kind == BOOLEAN:
+                value = bool(value)
+            elif self.kind == DATE:
+                value = datetime.date.fromordinal(value + EPOCH_ORDINAL)
+                value = value.isoformat() if raw else value
+            elif self.kind == DATETIME:
+                value = format_datetime(value) if raw else EPOCH + datetime.timedelta(milliseconds=value)
+            values.append(value)
+        return values
+
+    def to_numpy(self):
+        """ Returns the values of the column as a NumPy array. Booleans, integers, doubles, dates and datetimes without
+        nulls are returned without a copy, as a view over the column's buffer; the column can't grow while the view
+        exists. Nulls are `NaN` in double columns and `NaT` in date and datetime columns; integer columns with nulls
+        are returned as doubles, and boolean columns with nulls as objects.
+
+          :return: values
+          :rtype: numpy.ndarray
+        """
+        numpy = import_numpy()
+        nulls = self.null_count()
+
+        if self.kind in (DOUBLE, DATE, DATETIME) or (self.kind in (INT, BOOLEAN) and nulls == 0):
+            if len(self.values) == 0:
+                return numpy.empty(0, dtype=NUMPY_DTYPES[self.kind])
+            dtype = 'int8' if self.kind == BOOLEAN else 'int64' if self.kind in (DATE, DATETIME) else None
+            return numpy.frombuffer(self.values, dtype=dtype or NUMPY_DTYPES[self.kind]).view(NUMPY_DTYPES[self.kind])
+        elif self.kind == INT:
+            values = numpy.frombuffer(self.values, dtype='int64').astype('float64')
+            values[numpy.frombuffer(self.mask, dtype='bool')] = numpy.nan
+            return values
+
+        values = numpy.empty(len(self.mask), dtype=object)
+        values[:] = self.to_list()
+        return values
+
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('Columnar NumPy output requires numpy. Install it with `pip install numpy`')
+    return numpy
+
+
+class ColumnTable(object):
+    """ Accumulates records into one `Column` per field, relationship fields flattened into dotted names, eg.
+    `Account.Owner.Name`. Fields first seen after some rows, or missing from a row, are null for those rows.
+
+    A related record that is null in the first rows starts out as a column of nulls named after the relationship, eg.
+    `Account`; it is dropped as soon as the related record's fields appear.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, types=None):
+        """ Constructor.
+
+          :param: types: Kind of each column by name, eg. `{'CloseDate': 'date'}`. Default: inferred
+          :type: types: dict
+        """
+        self.types = types or {}
+        self.columns = collections.OrderedDict()
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def keys(self):
+        return self.columns.keys()
+
+    def add_record(self, record):
+        """ Appends one record.
+
+          :param: record: Record
+          :type: record: dict|records.Record
+        """
+        for (name, value) in flatten(record):
+            column = self.columns.get(name)
+            if isinstance(value, Mapping):
+                if column is not None and column.null_count() == len(column):
+                    del self.columns[name]
+                continue
+            elif column is None:
+                if value is None and any(n.startswith(name + '.') for n in self.columns):
+                    continue
+                column = self.columns[name] = Column(self.types.get(name), self.length)
+            if len(column) == self.length:
+                column.append(value)
+
+        self.length += 1
+        for column in self.columns.values():
+            if len(column) < self.length:
+                column.append(None)
+
+    def add_records(self, records):
+        """ Appends records, eg. the `records` of a query result page.
+
+          :param: records: Records
+          :type: iterable of dict|records.Record
+          :return: The table
+          :rtype: ColumnTable
+        """
+        for record in records:
+            self.add_record(record)
+        return self
+
+    def to_dict(self):
+        """ Returns the table as lists of values by column name.
+
+          :return: columns
+          :rtype: collections.OrderedDict
+        """
+        return collections.OrderedDict((name, column.to_list()) for (name, column) in self.columns.items())
+
+    def to_numpy(self):
+        """ Returns the table as NumPy arrays by column name. See `Column.to_numpy()`.
+
+          :return: columns
+          :rtype: collections.OrderedDict
+        """
+        return collections.OrderedDict((name, column.to_numpy()) for (name, column) in self.columns.items())
+
+    def to_pandas(self):
+        """ Returns the table as a pandas DataFrame, built from `to_numpy()`.
+
+          :return: DataFrame
+          :rtype: pandas.DataFrame
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError('Columnar pandas output requires pandas. Install it with `pip install pandas`')
+        return pandas.DataFrame(self.to_numpy(), copy=False)
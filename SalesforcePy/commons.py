@@ -9,12 +9,22 @@
 from __future__ import absolute_import
 
 import collections
+import concurrent.futures
 import logging
+import queue
 import requests
+import threading
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 
+from . import codec
+from . import retry
+
 DEFAULT_API_VERSION = '37.0'
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+IDEMPOTENT_METHODS = retry.IDEMPOTENT_METHODS
+INVALID_SESSION_ERRORS = (b'INVALID_SESSION_ID', b'InvalidSessionId')
 
 
 def delete_request(base_request):
@@ -28,7 +38,7 @@ def delete_request(base_request):
     """
     (headers, _, _, _, service) = base_request.get_request_vars()
 
-    return requests.delete(
+    return base_request.session.delete(
         service, headers=headers, proxies=base_request.proxies, timeout=base_request.timeout)
 
 
@@ -43,7 +53,7 @@ def get_request(base_request):
     """
     (headers, _, _, _, service) = base_request.get_request_vars()
 
-    return requests.get(
+    return base_request.session.get(
         service, headers=headers, proxies=base_request.proxies, timeout=base_request.timeout)
 
 
@@ -58,9 +68,9 @@ def patch_request(base_request):
     """
     (headers, _, _, _, service) = base_request.get_request_vars()
 
-    return requests.patch(
+    return base_request.session.patch(
         service, headers=headers, proxies=base_request.proxies, timeout=base_request.timeout,
-        json=base_request.request_body)
+        **base_request.get_body_kwargs())
 
 
 def post_request(base_request):
@@ -74,9 +84,9 @@ def post_request(base_request):
     """
     (headers, _, _, _, service) = base_request.get_request_vars()
 
-    return requests.post(
+    return base_request.session.post(
         service, headers=headers, proxies=base_request.proxies, timeout=base_request.timeout,
-        json=base_request.request_body)
+        **base_request.get_body_kwargs())
 
 
 def put_request(base_request):
@@ -90,9 +100,105 @@ def put_request(base_request):
     """
     (headers, _, _, _, service) = base_request.get_request_vars()
 
-    return requests.put(
+    return base_request.session.put(
         service, headers=headers, proxies=base_request.proxies, timeout=base_request.timeout,
-        data=base_request.request_body)
+        **base_request.get_body_kwargs())
+
+
+def new_session(**kwargs):
+    """
+    Builds a `requests.Session` whose connections are pooled and kept alive between requests, so that consecutive calls
+    to the same instance reuse an established TCP+TLS connection.
+
+    :param: **kwargs: kwargs
+    :type: **kwargs: dict
+    :Keyword Arguments:
+        * *pool_connections* (`int`) --
+            Number of per-host connection pools to keep.
+            Default: `10`
+        * *pool_maxsize* (`int`) --
+            Maximum number of connections kept alive per host.
+            Default: `10`
+        * *pool_block* (`bool`) --
+            Whether to block, rather than open a throwaway connection, when all pooled connections are in use.
+            Default: `False`
+        * *max_retries* (`int|urllib3.util.Retry`) --
+            Retry configuration passed to the transport adapter.
+            Default: `0`
+        * *retry* (`retry.RetryPolicy`) --
+            Policy with which failed requests are sent again, see `retry.RetryAdapter`.
+            Default: `None`, no request is sent again
+    :return: session
+    :rtype: requests.Session
+    """
+    policy = kwargs.get('retry')
+    adapter_kwargs = dict(
+        pool_connections=kwargs.get('pool_connections', DEFAULT_POOL_CONNECTIONS),
+        pool_maxsize=kwargs.get('pool_maxsize', DEFAULT_POOL_MAXSIZE),
+        pool_block=kwargs.get('pool_block', False),
+        max_retries=kwargs.get('max_retries', 0))
+    if policy is None:
+        adapter = requests.adapters.HTTPAdapter(**adapter_kwargs)
+    else:
+        adapter = retry.RetryAdapter(policy, **adapter_kwargs)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+def prefetch(iterable, depth=1):
+    """
+    Iterates over `iterable` in a background thread, keeping up to `depth` items ready ahead of the consumer. Producing
+    the next item, eg. requesting the next batch of query results, therefore overlaps with the consumer's processing of
+    the current one. At most `depth` items are buffered, and an exception raised by `iterable` is re-raised to the
+    consumer once the items produced before it have been consumed.
+
+    .. versionadded:: 2.3.0
+
+    :param: iterable: Items to prefetch
+    :type: iterable: iterable
+    :param: depth: Number of items to keep ready ahead of the consumer
+    :type: depth: int
+    :return: generator
+    :rtype: generator
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stopped = threading.Event()
+    done = object()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((done, e))
+
+    producer = threading.Thread(target=produce, name='sfdc_py-prefetch', daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            (item, error) = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
 
 
 def get_soap_login_request_body(username, password):
@@ -127,12 +233,36 @@ def kwarg_adder(func):
     """
     def decorated(self, *args, **function_kwarg):
         if hasattr(self, 'client_kwargs'):
-            function_kwarg = collections.ChainMap(function_kwarg, self.client_kwargs)
+            function_kwarg = collections.ChainMap(function_kwarg, resolve_kwargs(self.client_kwargs))
         return func(self, *args, **function_kwarg)
 
     return decorated
 
 
+def resolve_kwargs(client_kwargs):
+    """
+    Replaces a `version` client kwarg still being discovered, ie. a `concurrent.futures.Future`, with its result, in
+    place, waiting for it if need be. If the discovery failed, the kwarg is removed instead, so that requests use the
+    default version and the next login discovers it again.
+
+    .. versionadded:: 2.3.0
+
+    :param client_kwargs: client kwargs
+    :type client_kwargs: dict
+    :return: `client_kwargs`
+    :rtype: dict
+    """
+    version = client_kwargs.get('version')
+    if isinstance(version, concurrent.futures.Future):
+        try:
+            client_kwargs['version'] = version.result()
+        except Exception as e:
+            logging.getLogger('sfdc_py').error('Unable to discover the API version: %s' % e)
+            if client_kwargs.get('version') is version:
+                client_kwargs.pop('version', None)
+    return client_kwargs
+
+
 class SFDCRequestException(Exception):
     """
     This exception is raised when we fail to complete requests to the # noqa
@@ -143,6 +273,143 @@ class SFDCRequestException(Exception):
     pass
 
 
+def is_invalid_session(status, content):
+    """
+    Returns whether a response rejected the request because its session expired or was revoked: a `401` status code
+    and an `INVALID_SESSION_ID` error, or `InvalidSessionId` for the Bulk API.
+
+    .. versionadded:: 2.3.0
+
+    :param: status: Status code
+    :type: status: int
+    :param: content: Body
+    :type: content: bytes
+    :return: whether the session is invalid
+    :rtype: bool
+    """
+    return status == requests.codes.unauthorized and any(e in (content or b'') for e in INVALID_SESSION_ERRORS)
+
+
+class SessionAuth(requests.auth.AuthBase):
+    """ Keeps the requests sent through a client's session authenticated. When a response reports an invalid session,
+    the client logs in again, once for all the threads whose requests failed with the same session, and the failed
+    request is replayed with the new session if its method is idempotent and its body can be sent again. Requests
+    still carrying a replaced session, eg. later pages of a query, are sent with the new one.
+
+    The client logs in again the way it last did, through its `relogin` attribute, or resumes a session renewed by
+    another process in its `token_store` kwarg.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, client):
+        """ Constructor.
+
+          :param: client: Client whose session is renewed
+          :type: client: sfdc.Client
+        """
+        self.client = client
+        self.lock = threading.Lock()
+        self.stale = set()
+        self.failed = None
+        self.refreshes = 0
+        self.replays = 0
+
+    def __call__(self, r):
+        session_id = self.get_session_id(r.headers)
+        if session_id in self.stale and self.client.session_id is not None:
+            r.headers['Authorization'] = 'OAuth %s' % self.client.session_id
+        r.register_hook('response', self.handle_401)
+        return r
+
+    def get_session_id(self, headers):
+        """ Returns the session ID of the `Authorization` header in `headers`, or `None`. """
+        authorization = headers.get('Authorization') or ''
+        return authorization[6:] if authorization.startswith('OAuth ') else None
+
+    def can_replay(self, method, body):
+        return method in IDEMPOTENT_METHODS and (body is None or isinstance(body, (str, bytes)))
+
+    def get_stale_session_id(self, status, content, headers):
+        """ Returns the session ID rejected by a response reporting an invalid session, or `None`. """
+        if not is_invalid_session(status, content):
+            return None
+        return self.get_session_id(headers)
+
+    def renew(self, stale):
+        """ Returns the session with which to replace `stale`, logging in again unless another thread already did, or
+        `None` if the client can't log in again.
+
+          :param: stale: Session ID rejected
+          :type: stale: string
+          :return: Session ID
+          :rtype: string|None
+        """
+        if stale in self.stale:
+            return self.client.session_id
+        elif stale != self.client.session_id or stale == self.failed:
+            return None
+
+        self.client.load_token(self.client.client_kwargs)
+        if self.client.session_id == stale and getattr(self.client, 'relogin', None) is not None:
+            self.client.relogin(refresh=True)
+        return self.renewed(stale)
+
+    def renewed(self, stale):
+        """ Records whether `stale` was replaced, and returns the session replacing it, or `None`. """
+        if self.client.session_id in (None, stale):
+            self.failed = stale
+            return None
+
+        self.stale.add(stale)
+        self.refreshes += 1
+        return self.client.session_id
+
+    def refresh(self, stale):
+        with self.lock:
+            return self.renew(stale)
+
+    def rotate(self):
+        """ Renews the session before it expires, eg. from `oauth.TokenRefresher`. Requests still carrying the previous
+        session are sent with the new one.
+
+          :return: Whether the session was renewed
+          :rtype: bool
+        """
+        with self.lock:
+            stale = self.client.session_id
+            if stale is None or getattr(self.client, 'relogin', None) is None:
+                return False
+            self.client.relogin(refresh=True)
+            if self.client.session_id in (None, stale):
+                return False
+            self.stale.add(stale)
+            return True
+
+    def handle_401(self, r, **kwargs):
+        """ Response hook: renews the session if `r` reports an invalid one, and returns `r` replayed with the new
+        session if possible, or `r` itself.
+        """
+        if r.status_code != requests.codes.unauthorized:
+            return r
+        stale = self.get_stale_session_id(r.status_code, r.content, r.request.headers)
+        if stale is None:
+            return r
+
+        session_id = self.refresh(stale)
+        if session_id is None or not self.can_replay(r.request.method, r.request.body):
+            return r
+
+        prep = r.request.copy()
+        prep.headers['Authorization'] = 'OAuth %s' % session_id
+        prep.deregister_hook('response', self.handle_401)
+        r.close()
+        replay = self.client.session.send(prep, **kwargs)
+        replay.history.append(r)
+        with self.lock:
+            self.replays += 1
+        return replay
+
+
 class ApiNamespace(object):
     """ Base class for API namespaces.
 
@@ -185,17 +452,26 @@ class BaseRequest(object):
                 * *request_body* (`dict`) --
                     A dict containing the request body
                     Default: `None`
+                * *session* (`requests.Session`) --
+                    Session through which the request is sent, usually the pooled session owned by the client
+                    Default: the `requests` module, i.e. a new connection per request
+                * *codec* (`string|codec.JsonCodec`) --
+                    JSON codec with which bodies are encoded and decoded, see `codec.get_codec()`
+                    Default: `'auto'`, the fastest backend installed
         """
         self.proxies = kwargs.get('proxies')
+        self.session = kwargs.get('session', requests)
         self.session_id = session_id
         self.http_method = kwargs.get('http_method', 'GET')
         self.instance_url = instance_url
         self.request_body = kwargs.get('request_body')
         self.api_version = kwargs.get('version', DEFAULT_API_VERSION)
         self.timeout = float(kwargs['timeout']) if 'timeout' in kwargs else None
+        self.codec = codec.get_codec(kwargs.get('codec'))
         self.service = None
         self.status = None
         self.response = None
+        self.response_headers = None
         self.headers = None
         self.request_url = None
         self.exceptions = []
@@ -238,6 +514,80 @@ class BaseRequest(object):
             self.get_request_url()
         )
 
+    def get_body_kwargs(self):
+        """ Returns the kwargs with which `request_body` is sent: serialised by `codec` for `'POST'` and `'PATCH'`,
+        as it is for `'PUT'`, and none otherwise. A `request_body` that is already `bytes` is sent as it is, so that
+        callers can serialise bodies ahead of time.
+
+          :return: body kwargs
+          :rtype: dict
+        """
+        if self.http_method in ('POST', 'PATCH'):
+            return self.get_json_body_kwargs()
+        elif self.http_method == 'PUT':
+            return {'data': self.request_body}
+        return {}
+
+    def get_json_body_kwargs(self):
+        """ Returns the kwargs with which `request_body` is sent as JSON.
+
+          :return: body kwargs
+          :rtype: dict
+        """
+        if self.request_body is None:
+            return {}
+        elif isinstance(self.request_body, bytes):
+            return {'data': self.request_body}
+        return {'data': self.codec.dumps(self.request_body)}
+
+    def parse_response(self, request_object):
+        """ Returns the deserialised body of `request_object`. Raises `SFDCRequestException` if the body is `null`.
+
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
+          :return: response
+          :rtype: list|dict
+        """
+        content = request_object.content
+        if content == b'null':
+            raise SFDCRequestException('Request body is null')
+        return self.codec.loads(content)
+
+    def stream_records(self, service, stream, chunk_size):
+        """ Sends a streamed GET request to `service` and yields the records parsed by `stream` as they arrive, so that
+        they can be processed while the rest of the body is still being received. Catches any exceptions, including a
+        status code other than `200`, and appends them to `self.exceptions`.
+
+        .. versionadded:: 2.3.0
+
+          :param: service: URL
+          :type: service: string
+          :param: stream: Incremental parser
+          :type: stream: jsonstream.RecordStream
+          :param: chunk_size: Size in bytes of the chunks read from the network
+          :type: chunk_size: int
+          :return: A generator of records
+          :rtype: generator
+        """
+        (headers, logger, request_object, response, _) = self.get_request_vars()
+        logger.info('GET %s' % service)
+
+        try:
+            request_object = self.session.get(
+                service, headers=headers, proxies=self.proxies, timeout=self.timeout, stream=True)
+            self.status = request_object.status_code
+            if self.status != requests.codes.ok:
+                raise SFDCRequestException(
+                    'Request failed. Received %s status code: %s' % (self.status, request_object.text))
+            for record in stream.parse(request_object.iter_content(chunk_size)):
+                yield record
+        except Exception as e:
+            self.exceptions.append(e)
+            logger.error('GET %s %s' % (service, self.status))
+        finally:
+            if request_object is not None:
+                request_object.close()
+
     def request(self):
         """ Makes request to Salesforce and returns serialised response. Catches any exceptions and appends them to
         `self.exceptions`.
@@ -263,11 +613,8 @@ class BaseRequest(object):
         try:
             request_object = request_fn(self)
             self.status = request_object.status_code
-
-            if request_object.content.decode('utf-8') == 'null':
-                raise SFDCRequestException('Request body is null')
-            else:
-                response = request_object.json()
+            self.response_headers = request_object.headers
+            response = self.parse_response(request_object)
         except Exception as e:
             self.exceptions.append(e)
             logger.error('%s %s %s' % (self.http_method, service, self.status))
@@ -288,22 +635,26 @@ class OAuthRequest(BaseRequest):
         self.login_url = None
         self.payload = None
 
+    def get_body_kwargs(self):
+        return {'data': self.payload}
+
+    def parse_response(self, request_object):
+        if request_object.status_code == requests.codes.ok:
+            return self.codec.loads(request_object.content)
+        ex = SFDCRequestException('OAuth call failed. Received %s status code' % request_object.status_code)
+        ex.oauth_response = self.codec.loads(request_object.content)
+
+        raise ex
+
     def request(self):
         (headers, logger, request_object, response,
          service) = self.get_request_vars()
-        payload = self.payload
         logging.getLogger('sfdc_py').info('%s %s' % ('POST', service))
         try:
-            request_object = requests.post(
-                service, headers=headers, data=payload, proxies=self.proxies, timeout=self.timeout)
+            request_object = self.session.post(
+                service, headers=headers, proxies=self.proxies, timeout=self.timeout, **self.get_body_kwargs())
             self.status = request_object.status_code
-            if self.status == requests.codes.ok:
-                response = request_object.json()
-            else:
-                ex = SFDCRequestException('OAuth call failed. Received %s status code' % self.status)
-                ex.oauth_response = request_object.json()
-
-                raise ex
+            response = self.parse_response(request_object)
         except Exception as e:
             self.exceptions.append(e)
             logger.error('%s %s %s' % (self.http_method, service, self.status))
@@ -349,7 +700,7 @@ class SoapLoginRequest(BaseRequest):
         xml = get_soap_login_request_body(self.username, self.password)
         logging.getLogger('sfdc_py').info('%s %s' % ('POST', service))
         try:
-            request_object = requests.post(
+            request_object = self.session.post(
                 service, headers=headers, data=xml, proxies=self.proxies, timeout=self.timeout)
             self.status = request_object.status_code
 
@@ -0,0 +1,459 @@
+"""
+.. module:: composite
+   :synopsis: A Salesforce Composite API implementation: sObject Collections and Batch requests.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import abc
+import concurrent.futures
+import logging
+import threading
+import time
+
+from . import commons
+from . import retry
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+BATCH_URI = '/services/data/v%s/composite/batch'
+COLLECTIONS_URI = '/services/data/v%s/composite/sobjects'
+COLLECTIONS_UPSERT_URI = '/services/data/v%s/composite/sobjects/%s/%s'
+BATCH_LIMIT = 25
+COLLECTIONS_LIMIT = 200
+THROTTLE_ERRORS = ('REQUEST_LIMIT_EXCEEDED', 'SERVER_UNAVAILABLE')
+THROTTLE_STATUSES = (503,)
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_THROTTLE_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+
+def chunks(items, size):
+    """
+    Splits `items` into consecutive lists of at most `size` items.
+
+    :param: items: Items to split
+    :type: items: list
+    :param: size: Maximum number of items per list
+    :type: size: int
+    :return: generator of lists
+    :rtype: generator
+    """
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def is_throttled(request):
+    """
+    Returns whether Salesforce turned down `request` because of its concurrent request limits, ie. with a `503` status
+    or a `REQUEST_LIMIT_EXCEEDED` or `SERVER_UNAVAILABLE` error.
+
+    :param: request: Request made
+    :type: request: commons.BaseRequest
+    :return: throttled
+    :rtype: bool
+    """
+    if request.status in THROTTLE_STATUSES:
+        return True
+    errors = request.response if isinstance(request.response, list) else [request.response]
+    return any(isinstance(e, dict) and e.get('errorCode') in THROTTLE_ERRORS for e in errors)
+
+
+def get_errors(request):
+    """
+    Returns the errors to report for every record of a request that failed as a whole, eg. because the session expired.
+
+    :param: request: Failed request
+    :type: request: commons.BaseRequest
+    :return: errors
+    :rtype: [dict]
+    """
+    if isinstance(request.response, list) and all(isinstance(e, dict) and 'errorCode' in e for e in request.response):
+        return request.response
+    message = '; '.join(str(e) for e in request.exceptions) or 'Received %s status code' % request.status
+    return [{'errorCode': 'REQUEST_FAILED', 'message': message, 'fields': []}]
+
+
+class CompositeBatch(commons.BaseRequest):
+    """ Performs a POST request to `'/services/data/vX.XX/composite/batch'`
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, session_id, instance_url, api_version, batch_requests, halt_on_error=False, **kwargs):
+        """ Constructor. Calls `super`, then prepares the request body with the `batch_requests` provided.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: batch_requests: Up to 25 subrequests, eg. `{'method': 'GET', 'url': 'v45.0/sobjects/Account/001...'}`
+          :type: batch_requests: [dict]
+          :param: halt_on_error: Whether to skip the remaining subrequests once one fails
+          :type: halt_on_error: bool
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+        """
+        super(CompositeBatch, self).__init__(session_id, instance_url, **kwargs)
+
+        self.http_method = 'POST'
+        self.request_body = {'batchRequests': batch_requests, 'haltOnError': halt_on_error}
+        self.service = BATCH_URI % api_version
+
+    def request(self):
+        self.response = super(CompositeBatch, self).request()
+        return self.response
+
+
+class SObjectCollection(commons.BaseRequest):
+    """ Performs a request to `'/services/data/vX.XX/composite/sobjects'`: `'POST'` creates, `'PATCH'` updates or
+    upserts, and `'DELETE'` deletes up to 200 records.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, session_id, instance_url, api_version, http_method, records, all_or_none=False, **kwargs):
+        """ Constructor. Calls `super`, then prepares the service and request body for the `records` provided.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: http_method: `'POST'`, `'PATCH'` or `'DELETE'`
+          :type: http_method: string
+          :param: records: Up to 200 records, each including `attributes.type`, or record IDs for `'DELETE'`
+          :type: records: [dict]|[string]
+          :param: all_or_none: Whether to roll back every record if one fails
+          :type: all_or_none: bool
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *object_type* (`string`) --
+                Name of the SObject, required to upsert
+            * *external_id* (`string`) --
+                External ID field to match records on, required to upsert
+        """
+        super(SObjectCollection, self).__init__(session_id, instance_url, **kwargs)
+
+        self.http_method = http_method
+        external_id = kwargs.get('external_id')
+
+        if http_method == 'DELETE':
+            params = urlencode({'ids': ','.join(records), 'allOrNone': str(all_or_none).lower()})
+            self.service = '%s?%s' % (COLLECTIONS_URI % api_version, params)
+        elif http_method == 'PATCH' and external_id is not None:
+            self.request_body = {'allOrNone': all_or_none, 'records': records}
+            self.service = COLLECTIONS_UPSERT_URI % (api_version, kwargs.get('object_type'), external_id)
+        else:
+            self.request_body = {'allOrNone': all_or_none, 'records': records}
+            self.service = COLLECTIONS_URI % api_version
+
+    def request(self):
+        self.response = super(SObjectCollection, self).request()
+        return self.response
+
+
+class ConcurrencyLimit(object):
+    """ Bounds the number of requests in flight. The bound is halved whenever Salesforce throttles a request, and raised
+    by one after as many successful requests in a row as the current bound.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, maximum, initial=None):
+        """ Constructor.
+
+          :param: maximum: Highest bound
+          :type: maximum: int
+          :param: initial: Starting bound. Default: `maximum`
+          :type: initial: int
+        """
+        self.maximum = max(1, maximum)
+        self.limit = min(self.maximum, max(1, initial or self.maximum))
+        self.active = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """ Blocks until fewer requests than the current bound are in flight, then counts one more. """
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def release(self, throttled=False):
+        """ Counts one request less in flight and adapts the bound to its outcome.
+
+          :param: throttled: Whether Salesforce throttled the request
+          :type: throttled: bool
+        """
+        with self.condition:
+            self.active -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self.successes = 0
+            else:
+                self.successes += 1
+                if self.successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self.successes = 0
+            self.condition.notify_all()
+
+
+class ConcurrentExecutor(abc.ABC):
+    """ Base class for executors which split items into chunks and send one request per chunk on a pool of worker
+    threads. The number of requests in flight adapts to Salesforce's concurrent request limits through a
+    `ConcurrencyLimit`, and throttled chunks are sent again after an exponential backoff, instead of by the client's
+    `retry.RetryAdapter`. Results are returned in input order whatever the order in which requests complete.
+
+    Subclasses define `chunk_size`, `get_request()` and `get_results()`.
+
+        .. versionadded:: 2.3.0
+    """
+    chunk_size = None
+
+    def __init__(self, client, items, **kwargs):
+        """ Constructor.
+
+          :param: client: Client whose session ID and instance URL the chunk requests are sent with
+          :type: client: sfdc.Client
+          :param: items: Items to send
+          :type: items: list
+          :param: **kwargs: kwargs, also passed on to the request of each chunk
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *session* (`requests.Session`) --
+                Session through which chunks are sent. Default: the client's session
+            * *version* (`string`) --
+                API version. Default: `'37.0'`
+            * *max_workers* (`int`) --
+                Maximum number of requests in flight. Default: `4`
+            * *initial_workers* (`int`) --
+                Number of requests in flight to start with. Default: `max_workers`
+            * *retries* (`int`) --
+                Number of times a throttled chunk is sent again. Default: `3`
+            * *backoff* (`float`) --
+                Seconds to wait before sending a throttled chunk again, doubled on each attempt. Default: `1.0`
+        """
+        self.client = client
+        self.session = kwargs.get('session', client.session)
+        self.api_version = kwargs.get('version', commons.DEFAULT_API_VERSION)
+        self.items = list(items)
+        self.kwargs = dict(kwargs, session=self.session)
+        self.max_workers = kwargs.get('max_workers', DEFAULT_MAX_WORKERS)
+        self.retries = kwargs.get('retries', DEFAULT_THROTTLE_RETRIES)
+        self.backoff = kwargs.get('backoff', DEFAULT_BACKOFF)
+        self.limit = ConcurrencyLimit(self.max_workers, kwargs.get('initial_workers'))
+        self.requests = []
+        self.latencies = []
+        self.throttled = 0
+        self.elapsed = None
+        self.status = None
+        self.response = None
+        self.exceptions = []
+        self.lock = threading.Lock()
+
+    @abc.abstractmethod
+    def get_request(self, chunk):
+        """ Returns the request object sending `chunk`.
+
+          :param: chunk: Items of the chunk
+          :type: chunk: list
+          :return: request object
+          :rtype: commons.BaseRequest
+        """
+
+    @abc.abstractmethod
+    def get_results(self, request, chunk):
+        """ Returns one result per item of `chunk`, once `request` has been made.
+
+          :param: request: Request made
+          :type: request: commons.BaseRequest
+          :param: chunk: Items of the chunk
+          :type: chunk: list
+          :return: results
+          :rtype: [dict]
+        """
+
+    @property
+    def throughput(self):
+        """ Items processed per second over the whole execution, or `None` before it completes. """
+        if self.elapsed is None:
+            return None
+        return len(self.items) / self.elapsed if self.elapsed > 0 else float(len(self.items))
+
+    def request_chunk(self, index, chunk):
+        """ Sends `chunk` once a slot is free, sending it again up to `retries` times while it gets throttled.
+
+          :param: index: Position of the chunk
+          :type: index: int
+          :param: chunk: Items of the chunk
+          :type: chunk: list
+          :return: One result per item of `chunk`
+          :rtype: [dict]
+        """
+        for attempt in range(self.retries + 1):
+            self.limit.acquire()
+            start = time.time()
+            request = self.get_request(chunk)
+            try:
+                with retry.disabled():
+                    request.request()
+            finally:
+                throttled = is_throttled(request)
+                self.limit.release(throttled)
+            with self.lock:
+                self.latencies.append((index, time.time() - start))
+                self.requests[index] = request
+                self.throttled += 1 if throttled else 0
+            if not throttled or attempt == self.retries:
+                break
+            logging.getLogger('sfdc_py').warning(
+                'Chunk %s throttled (attempt %s of %s), concurrency down to %s' % (
+                    index, attempt + 1, self.retries + 1, self.limit.limit))
+            time.sleep(self.backoff * 2 ** attempt)
+
+        with self.lock:
+            self.exceptions.extend(request.exceptions)
+            self.status = request.status
+        return self.get_results(request, chunk)
+
+    def request(self):
+        """ Sends every chunk concurrently.
+
+          :return: One result per item, in input order
+          :rtype: [dict]
+        """
+        chunk_list = list(chunks(self.items, self.chunk_size))
+        self.requests = [None] * len(chunk_list)
+        start = time.time()
+
+        if len(chunk_list) > 0:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(self.limit.maximum, len(chunk_list)))
+            try:
+                results = list(executor.map(self.request_chunk, range(len(chunk_list)), chunk_list))
+            finally:
+                executor.shutdown(wait=True)
+        else:
+            results = []
+
+        self.elapsed = time.time() - start
+        self.response = [result for chunk_results in results for result in chunk_results]
+        return self.response
+
+
+class BatchExecutor(ConcurrentExecutor):
+    """ Sends subrequests to `'/services/data/vX.XX/composite/batch'`, 25 per request.
+
+        .. versionadded:: 2.3.0
+    """
+    chunk_size = BATCH_LIMIT
+
+    def __init__(self, client, batch_requests, halt_on_error=False, **kwargs):
+        """ Constructor. Calls `super`.
+
+          :param: batch_requests: Subrequests, eg. `{'method': 'GET', 'url': 'v45.0/sobjects/Account/001...'}`
+          :type: batch_requests: [dict]
+          :param: halt_on_error: Whether to skip the remaining subrequests of a batch once one fails
+          :type: halt_on_error: bool
+        """
+        super(BatchExecutor, self).__init__(client, batch_requests, **kwargs)
+        self.halt_on_error = halt_on_error
+
+    def get_request(self, chunk):
+        return CompositeBatch(
+            self.client.session_id, self.client.instance_url, self.api_version, chunk, self.halt_on_error,
+            **self.kwargs)
+
+    def get_results(self, request, chunk):
+        if isinstance(request.response, dict) and len(request.response.get('results', [])) == len(chunk):
+            return request.response['results']
+        errors = get_errors(request)
+        return [{'statusCode': request.status, 'result': errors} for _ in chunk]
+
+
+class CollectionExecutor(ConcurrentExecutor):
+    """ Sends records to `'/services/data/vX.XX/composite/sobjects'`, 200 per request.
+
+        .. versionadded:: 2.3.0
+    """
+    chunk_size = COLLECTIONS_LIMIT
+
+    def __init__(self, client, http_method, records, all_or_none=False, **kwargs):
+        """ Constructor. Calls `super`.
+
+          :param: http_method: `'POST'`, `'PATCH'` or `'DELETE'`
+          :type: http_method: string
+          :param: records: Records, each including `attributes.type`, or record IDs for `'DELETE'`
+          :type: records: [dict]|[string]
+          :param: all_or_none: Whether to roll back every record of a request if one fails
+          :type: all_or_none: bool
+        """
+        super(CollectionExecutor, self).__init__(client, records, **kwargs)
+        self.http_method = http_method
+        self.all_or_none = all_or_none
+
+    def get_request(self, chunk):
+        return SObjectCollection(
+            self.client.session_id, self.client.instance_url, self.api_version, self.http_method, chunk,
+            self.all_or_none, **self.kwargs)
+
+    def get_results(self, request, chunk):
+        response = request.response
+        if isinstance(response, list) and len(response) == len(chunk) and all(
+                isinstance(r, dict) and 'success' in r for r in response):
+            return response
+        errors = get_errors(request)
+        return [{'id': None, 'success': False, 'errors': errors} for _ in chunk]
+
+
+class Composite(commons.ApiNamespace):
+    """ The Composite namespace class, which groups many record operations into few API calls.
+
+        .. versionadded:: 2.3.0
+    """
+    @commons.kwarg_adder
+    def batch(self, batch_requests, halt_on_error=False, **kwargs):
+        """ Executes any number of subrequests, sent as batches of 25 on a pool of worker threads. See
+        `ConcurrentExecutor` for the kwargs controlling concurrency.
+
+          :param: batch_requests: Subrequests, eg. `{'method': 'GET', 'url': 'v45.0/sobjects/Account/001...'}`
+          :type: batch_requests: [dict]
+          :param: halt_on_error: Whether to skip the remaining subrequests of a batch once one fails
+          :type: halt_on_error: bool
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: One result per subrequest, in the order provided, and the executor
+          :rtype: ([dict], BatchExecutor)
+        """
+        executor = BatchExecutor(self.client, batch_requests, halt_on_error, **kwargs)
+        return executor.request(), executor
+
+    @commons.kwarg_adder
+    def collections(self, http_method, records, all_or_none=False, **kwargs):
+        """ Creates (`'POST'`), updates or upserts (`'PATCH'`), or deletes (`'DELETE'`) any number of records, sent as
+        collections of 200 on a pool of worker threads. See `ConcurrentExecutor` for the kwargs controlling
+        concurrency.
+
+        If a whole collection request fails, every one of its records gets a result whose `success` is `False`.
+
+          :param: http_method: `'POST'`, `'PATCH'` or `'DELETE'`
+          :type: http_method: string
+          :param: records: Records, each including `attributes.type`, or record IDs for `'DELETE'`
+          :type: records: [dict]|[string]
+          :param: all_or_none: Whether to roll back every record of a collection if one fails
+          :type: all_or_none: bool
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: One result per record, in the order provided, and the executor
+          :rtype: ([dict], CollectionExecutor)
+        """
+        executor = CollectionExecutor(self.client, http_method, records, all_or_none, **kwargs)
+        return executor.request(), executor
@@ -6,6 +6,27 @@
 
 """
 from __future__ import absolute_import
+
+import codecs
+import collections
+import concurrent.futures
+import csv
+import heapq
+import io
+import itertools
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import zlib
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
 from . import commons
 
 BATCHES_URI = '/services/data/v%s/jobs/ingest/%s/batches'
@@ -17,6 +38,199 @@ GET_SUCCESSES_URI = '/services/data/v%s/jobs/ingest/%s/successfulResults'
 GET_FAILURES_URI = '/services/data/v%s/jobs/ingest/%s/failedResults'
 GET_UNPROCESSED_URI = '/services/data/v%s/jobs/ingest/%s/unprocessedrecords'
 UPDATE_URI = '/services/data/v%s/jobs/ingest/%s'
+QUERY_URI = '/services/data/v%s/jobs/query'
+QUERY_JOB_URI = '/services/data/v%s/jobs/query/%s'
+QUERY_RESULTS_URI = '/services/data/v%s/jobs/query/%s/results'
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+LINE_ENDINGS = {'LF': '\n', 'CRLF': '\r\n'}
+COLUMN_DELIMITERS = {'BACKQUOTE': '`', 'CARET': '^', 'COMMA': ',', 'PIPE': '|', 'SEMICOLON': ';', 'TAB': '\t'}
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+DEFAULT_LOAD_WORKERS = 4
+TERMINAL_STATES = ('JobComplete', 'Failed', 'Aborted')
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_POLL_INTERVAL = 30.0
+DEFAULT_POLL_BACKOFF = 2.0
+DEFAULT_POLL_JITTER = 0.2
+DEFAULT_POLL_ERRORS = 5
+POLL_SETTINGS = ('initial_interval', 'max_interval', 'backoff_factor', 'jitter', 'max_errors')
+LOCATOR_HEADER = 'Sforce-Locator'
+DEFAULT_QUERY_MAX_RECORDS = 100000
+DEFAULT_DOWNLOAD_WORKERS = 4
+LIST_FILTERS = (
+    ('is_pk_chunking_enabled', 'isPkChunkingEnabled'), ('job_type', 'jobType'), ('concurrency_mode', 'concurrencyMode'))
+
+
+def is_csv_path(csv_file):
+    """
+    Returns whether `csv_file` is the path of a CSV file rather than CSV data: either a path-like object, or a single
+    line string naming an existing file.
+
+    :param: csv_file: CSV data, file path, file object or iterable of rows
+    :type: csv_file: string|os.PathLike|file|iterable
+    :return: is path
+    :rtype: bool
+    """
+    if hasattr(csv_file, '__fspath__'):
+        return True
+    return isinstance(csv_file, str) and '\n' not in csv_file and os.path.isfile(csv_file)
+
+
+def iter_file(f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Reads `f` in chunks of up to `chunk_size` characters or bytes, and yields them as UTF-8 encoded bytes.
+
+    :param: f: File object, opened in text or binary mode
+    :type: f: file
+    :param: chunk_size: Size of the chunks read
+    :type: chunk_size: int
+    :return: generator of bytes
+    :rtype: generator
+    """
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+
+def iter_rows(rows, chunk_size=DEFAULT_CHUNK_SIZE, line_ending='LF'):
+    """
+    Encodes `rows` to CSV incrementally, and yields the encoded data in chunks of about `chunk_size` bytes. Rows are
+    either sequences of values, or dicts whose keys, taken from the first row, make up the header.
+
+    :param: rows: Rows
+    :type: rows: iterable of list|tuple|dict
+    :param: chunk_size: Size of the chunks yielded
+    :type: chunk_size: int
+    :param: line_ending: Line ending of the job, `'LF'` or `'CRLF'`
+    :type: line_ending: string
+    :return: generator of bytes
+    :rtype: generator
+    """
+    buf = io.StringIO()
+    writer = None
+
+    for row in rows:
+        if writer is None:
+            if isinstance(row, dict):
+                writer = csv.DictWriter(buf, fieldnames=list(row), lineterminator=LINE_ENDINGS[line_ending])
+                writer.writeheader()
+            else:
+                writer = csv.writer(buf, lineterminator=LINE_ENDINGS[line_ending])
+        writer.writerow(row)
+
+        if buf.tell() >= chunk_size:
+            yield buf.getvalue().encode('utf-8')
+            buf.seek(0)
+            buf.truncate()
+
+    if buf.tell() > 0:
+        yield buf.getvalue().encode('utf-8')
+
+
+def iter_csv(csv_file, chunk_size=DEFAULT_CHUNK_SIZE, line_ending='LF'):
+    """
+    Yields the CSV data of `csv_file` as UTF-8 encoded chunks of about `chunk_size` bytes, so that it can be uploaded
+    without holding it in memory.
+
+    :param: csv_file: CSV data, file path, file object or iterable of rows
+    :type: csv_file: string|bytes|os.PathLike|file|iterable
+    :param: chunk_size: Size of the chunks yielded
+    :type: chunk_size: int
+    :param: line_ending: Line ending of the job, `'LF'` or `'CRLF'`, used to encode rows
+    :type: line_ending: string
+    :return: generator of bytes
+    :rtype: generator
+    """
+    if is_csv_path(csv_file):
+        with open(csv_file, 'rb') as f:
+            for chunk in iter_file(f, chunk_size):
+                yield chunk
+    elif isinstance(csv_file, (str, bytes)):
+        data = csv_file.encode('utf-8') if isinstance(csv_file, str) else csv_file
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+    elif hasattr(csv_file, 'read'):
+        for chunk in iter_file(csv_file, chunk_size):
+            yield chunk
+    else:
+        for chunk in iter_rows(csv_file, chunk_size, line_ending):
+            yield chunk
+
+
+def split_rows(rows, max_bytes=MAX_UPLOAD_BYTES, line_ending='LF'):
+    """
+    Encodes `rows` to CSV incrementally and spools them to temporary files of at most `max_bytes` bytes, each starting
+    with the header row. Each file is yielded, rewound, as soon as the next row would not fit in it. Rows are either
+    sequences of values, the first of which is the header, or dicts whose keys, taken from the first row, make up the
+    header.
+
+    :param: rows: Rows
+    :type: rows: iterable of list|tuple|dict
+    :param: max_bytes: Maximum size of a file. A single row larger than this gets a file of its own.
+    :type: max_bytes: int
+    :param: line_ending: Line ending of the job, `'LF'` or `'CRLF'`
+    :type: line_ending: string
+    :return: generator of temporary files, opened in binary mode, which the caller closes
+    :rtype: generator
+    """
+    buf = io.StringIO()
+    (writer, header, part, size) = (None, None, None, 0)
+
+    for row in rows:
+        if writer is None:
+            if isinstance(row, dict):
+                writer = csv.DictWriter(buf, fieldnames=list(row), lineterminator=LINE_ENDINGS[line_ending])
+                writer.writeheader()
+            else:
+                writer = csv.writer(buf, lineterminator=LINE_ENDINGS[line_ending])
+                writer.writerow(row)
+                header = buf.getvalue().encode('utf-8')
+                buf.seek(0)
+                buf.truncate()
+                continue
+            header = buf.getvalue().encode('utf-8')
+            buf.seek(0)
+            buf.truncate()
+
+        writer.writerow(row)
+        line = buf.getvalue().encode('utf-8')
+        buf.seek(0)
+        buf.truncate()
+
+        if part is not None and size + len(line) > max_bytes:
+            part.seek(0)
+            yield part
+            part = None
+        if part is None:
+            part = tempfile.TemporaryFile()
+            part.write(header)
+            size = len(header)
+        part.write(line)
+        size += len(line)
+
+    if part is not None:
+        part.seek(0)
+        yield part
+
+
+def gzip_chunks(chunks, level=6):
+    """
+    Compresses `chunks` on the fly into a gzip stream.
+
+    :param: chunks: Chunks to compress
+    :type: chunks: iterable of bytes
+    :param: level: Compression level, from `1` (fastest) to `9` (smallest)
+    :type: level: int
+    :return: generator of bytes
+    :rtype: generator
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
 
 
 class Batches(commons.BaseRequest):
@@ -26,15 +240,73 @@ class Batches(commons.BaseRequest):
     """
 
     def __init__(self, session_id, instance_url, api_version, job_id, csv_file, **kwargs):
+        """ Constructor. Calls `super`, then sets the `service` and headers for uploading `csv_file`.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: csv_file: CSV data, file path, file object or iterable of rows
+          :type: csv_file: string|bytes|os.PathLike|file|iterable
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *gzip* (`bool`) --
+                Whether to compress the upload on the fly, sent with `Content-Encoding: gzip`. Default: `False`
+            * *chunk_size* (`int`) --
+                Size in bytes of the chunks read and sent. Default: `1048576`
+            * *line_ending* (`string`) --
+                Line ending of the job, `'LF'` or `'CRLF'`, used to encode rows. Default: `'LF'`
+
+        .. versionchanged:: 2.3.0
+            Accepts file paths, file objects and iterables of rows, which are streamed rather than read into memory.
+        """
         super(Batches, self).__init__(session_id, instance_url, **kwargs)
 
         self.request_body = csv_file
         self.http_method = 'PUT'
         self.service = BATCHES_URI % (api_version, job_id)
+        self.gzip = kwargs.get('gzip', False)
+        self.chunk_size = kwargs.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        self.line_ending = kwargs.get('line_ending', 'LF')
         self.headers = {
             'Content-Type': 'text/csv',
             'Authorization': 'OAuth %s' % self.session_id}
 
+        if self.gzip:
+            self.headers['Content-Encoding'] = 'gzip'
+
+    def parse_response(self, request_object):
+        """ Returns `None` for a `201` status code, which comes with an empty body, or the deserialised body otherwise.
+
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
+          :return: response
+          :rtype: list|dict|None
+        """
+        if request_object.status_code == 201:
+            return None
+        return super(Batches, self).parse_response(request_object)
+
+    def get_body_kwargs(self):
+        """ Returns the kwargs with which the CSV data is sent. Strings and bytes are sent as they are, and anything
+        else as a generator of chunks, which is streamed with chunked transfer encoding. With `gzip`, the data is always
+        compressed chunk by chunk.
+
+          :return: body kwargs
+          :rtype: dict
+        """
+        csv_file = self.request_body
+        if not self.gzip and isinstance(csv_file, (str, bytes)) and not is_csv_path(csv_file):
+            return {'data': csv_file}
+
+        chunks = iter_csv(csv_file, self.chunk_size, self.line_ending)
+        return {'data': gzip_chunks(chunks) if self.gzip else chunks}
+
 
 class CreateJob(commons.BaseRequest):
     """ Performs a POST request to `'/services/data/vX.XX/jobs/ingest'`
@@ -130,19 +402,904 @@ class GetJob(commons.BaseRequest):
             self.service = GET_ALL_URI % api_version
 
 
-class Ingest(commons.ApiNamespace):
+class JobResults(commons.BaseRequest):
+    """ Performs streamed GET requests to `'/services/data/vX.XX/jobs/ingest/<job_id>/successfulResults'`,
+    `'failedResults'` or `'unprocessedrecords'`, following `Sforce-Locator` from page to page.
+
+    Unlike `GetJob`, the CSV body is never read into memory as a whole: it is either parsed row by row, or copied chunk
+    by chunk to a file.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, session_id, instance_url, api_version, job_id, **kwargs):
+        """ Constructor. Calls `super`, then sets the `service` for the results requested.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *successes* (`bool`) --
+                Request successful results. This is the default.
+            * *failures* (`bool`) --
+                Request failed results
+            * *unprocessed* (`bool`) --
+                Request unprocessed records
+            * *max_records* (`int`) --
+                Maximum number of records per page, sent as `maxRecords`. Default: chosen by Salesforce
+            * *chunk_size* (`int`) --
+                Size in bytes of the chunks read from the network. Default: `1048576`
+        """
+        super(JobResults, self).__init__(session_id, instance_url, **kwargs)
+
+        if kwargs.get('failures', False):
+            self.service = GET_FAILURES_URI % (api_version, job_id)
+        elif kwargs.get('unprocessed', False):
+            self.service = GET_UNPROCESSED_URI % (api_version, job_id)
+        else:
+            self.service = GET_SUCCESSES_URI % (api_version, job_id)
+
+        self.max_records = kwargs.get('max_records')
+        self.chunk_size = kwargs.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        self.locator = None
+        self.pages = 0
+
+    def get_headers(self):
+        headers = super(JobResults, self).get_headers()
+        headers['Accept'] = 'text/csv'
+        headers.pop('Accept-Encoding', None)
+        return headers
+
+    def get_params(self, locator):
+        """ Returns the query parameters requesting the page at `locator`.
+
+          :param: locator: Locator of the page, or `None` for the first page
+          :type: locator: string|None
+          :return: params
+          :rtype: dict
+        """
+        params = {}
+        if locator is not None:
+            params['locator'] = locator
+        if self.max_records is not None:
+            params['maxRecords'] = self.max_records
+        return params
+
+    def get_next_locator(self, request_object):
+        """ Returns the locator of the page following `request_object`, or `None` if it was the last page.
+
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
+          :return: locator
+          :rtype: string|None
+        """
+        locator = request_object.headers.get(LOCATOR_HEADER)
+        return None if locator in (None, '', 'null') else locator
+
+    def iter_responses(self):
+        """ Requests each page in turn, yielding its streamed HTTP response and closing it once consumed. Stops when a
+        response has no `Sforce-Locator`, or when a request fails, in which case the exception is appended to
+        `self.exceptions`.
+
+          :return: A generator of streamed HTTP responses
+          :rtype: generator
+        """
+        (headers, logger, request_object, response, service) = self.get_request_vars()
+
+        while True:
+            params = self.get_params(self.locator)
+            logger.info('GET %s %s' % (service, params))
+
+            try:
+                request_object = self.session.get(
+                    service, headers=headers, params=params, proxies=self.proxies, timeout=self.timeout, stream=True)
+                self.status = request_object.status_code
+                if request_object.status_code != 200:
+                    request_object.close()
+                    raise commons.SFDCRequestException(
+                        'Results request failed. Received %s status code' % request_object.status_code)
+            except Exception as e:
+                self.exceptions.append(e)
+                logger.error('GET %s %s' % (service, self.status))
+                return
+
+            try:
+                self.pages += 1
+                yield request_object
+            finally:
+                request_object.close()
+
+            self.locator = self.get_next_locator(request_object)
+            if self.locator is None:
+                return
+
+    def iter_lines(self, request_object):
+        """ Decodes the body of `request_object` incrementally into lines.
+
+          :param: request_object: Streamed HTTP response
+          :type: request_object: requests.Response
+          :return: A generator of lines, line endings included
+          :rtype: generator
+        """
+        pending = ''
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in request_object.iter_content(self.chunk_size):
+            lines = (pending + decoder.decode(chunk)).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line + '\n'
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            yield pending
+
+    def iter_rows(self):
+        """ Yields every result as a dict keyed by the CSV header, holding no more than a network chunk in memory, eg.
+        `{'sf__Id': ..., 'sf__Created': ..., 'Name': ...}`.
+
+          :return: A generator of rows
+          :rtype: generator
+        """
+        for request_object in self.iter_responses():
+            for row in csv.DictReader(self.iter_lines(request_object)):
+                yield row
+
+    def write_to(self, f):
+        """ Copies the CSV data of every page to `f` without decoding it, writing the header row of the first page only.
+
+          :param: f: File path, or file object opened in binary mode
+          :type: f: string|os.PathLike|file
+          :return: Number of bytes written
+          :rtype: int
+        """
+        if not hasattr(f, 'write'):
+            with open(f, 'wb') as fp:
+                return self.write_to(fp)
+
+        written = 0
+        for request_object in self.iter_responses():
+            skip_header = self.pages > 1
+            for chunk in request_object.iter_content(self.chunk_size):
+                if skip_header:
+                    (header, newline, chunk) = chunk.partition(b'\n')
+                    skip_header = newline == b''
+                if chunk:
+                    f.write(chunk)
+                    written += len(chunk)
+        return written
+
+    def request(self):
+        """ Requests every page and parses every result.
+
+          :return: Rows, or `None` if any request failed
+          :rtype: [dict]|None
+        """
+        rows = list(self.iter_rows())
+
+        if len(self.exceptions) > 0:
+            return None
+        return rows
+
+
+class CreateQueryJob(commons.BaseRequest):
+    """ Performs a POST request to `'/services/data/vX.XX/jobs/query'`
+
+        .. versionadded:: 2.3.0
+    """
+
+    def __init__(self, session_id, instance_url, api_version, request_body, **kwargs):
+        """ Constructor.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: request_body: Request body, eg. `{'operation': 'query', 'query': 'SELECT Id FROM Account'}`
+          :type: request_body: dict
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+        """
+        super(CreateQueryJob, self).__init__(session_id, instance_url, **kwargs)
+
+        self.http_method = 'POST'
+        self.request_body = request_body
+        self.service = QUERY_URI % api_version
+
+
+class GetQueryJob(commons.BaseRequest):
+    """ Performs a GET request to `'/services/data/vX.XX/jobs/query/<job_id>'`, or to
+    `'/services/data/vX.XX/jobs/query'` if no `job_id` is given.
+
+        .. versionadded:: 2.3.0
+    """
+
+    def __init__(self, session_id, instance_url, api_version, job_id=None, **kwargs):
+        """ Constructor.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+        """
+        super(GetQueryJob, self).__init__(session_id, instance_url, **kwargs)
+
+        self.http_method = 'GET'
+        self.service = QUERY_JOB_URI % (api_version, job_id) if job_id is not None else QUERY_URI % api_version
+
+
+class UpdateQueryJob(commons.BaseRequest):
+    """ Performs a PATCH request to `'/services/data/vX.XX/jobs/query/<job_id>'`
+
+        .. versionadded:: 2.3.0
+    """
+
+    def __init__(self, session_id, instance_url, api_version, job_id, request_body, **kwargs):
+        """ Constructor.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: request_body: Request body, eg. `{'state': 'Aborted'}`
+          :type: request_body: dict
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+        """
+        super(UpdateQueryJob, self).__init__(session_id, instance_url, **kwargs)
+
+        self.http_method = 'PATCH'
+        self.request_body = request_body
+        self.service = QUERY_JOB_URI % (api_version, job_id)
+
+
+class DeleteQueryJob(commons.BaseRequest):
+    """ Performs a DELETE request to `'/services/data/vX.XX/jobs/query/<job_id>'`
+
+        .. versionadded:: 2.3.0
+    """
+
+    def __init__(self, session_id, instance_url, api_version, job_id, **kwargs):
+        """ Constructor.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+        """
+        super(DeleteQueryJob, self).__init__(session_id, instance_url, **kwargs)
+
+        self.http_method = 'DELETE'
+        self.service = QUERY_JOB_URI % (api_version, job_id)
+
+
+class QueryResults(JobResults):
+    """ Downloads the results of a query job from `'/services/data/vX.XX/jobs/query/<job_id>/results'` in chunks of
+    `max_records` records, several chunks at a time.
+
+    The locator of each chunk is only known once the response headers of the previous chunk have been received, so the
+    request for the next chunk is sent as soon as they are, while the bodies of up to `max_workers` chunks download
+    concurrently to temporary files. Chunks are then emitted in order.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, session_id, instance_url, api_version, job_id, **kwargs):
+        """ Constructor. Calls `super`, then sets the `service` for the results of the query job.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *max_records* (`int`) --
+                Number of records per chunk, sent as `maxRecords`. Default: `100000`
+            * *max_workers* (`int`) --
+                Maximum number of chunks downloaded concurrently. Default: `4`
+            * *chunk_size* (`int`) --
+                Size in bytes of the chunks read from the network. Default: `1048576`
+            * *column_delimiter* (`string`) --
+                `columnDelimiter` of the job: `'BACKQUOTE'`, `'CARET'`, `'COMMA'`, `'PIPE'`, `'SEMICOLON'` or `'TAB'`.
+                Default: `'COMMA'`
+        """
+        super(QueryResults, self).__init__(session_id, instance_url, api_version, job_id, **kwargs)
+
+        self.service = QUERY_RESULTS_URI % (api_version, job_id)
+        self.max_records = kwargs.get('max_records', DEFAULT_QUERY_MAX_RECORDS)
+        self.max_workers = kwargs.get('max_workers', DEFAULT_DOWNLOAD_WORKERS)
+        self.delimiter = COLUMN_DELIMITERS[kwargs.get('column_delimiter') or 'COMMA']
+        self.lock = threading.Lock()
+
+    def fetch(self, locator, next_locator):
+        """ Requests the chunk at `locator`, resolves `next_locator` as soon as the response headers are received, then
+        downloads the body to a temporary file. The exception of a failed request is appended to `self.exceptions`.
+
+          :param: locator: Locator of the chunk, or `None` for the first chunk
+          :type: locator: string|None
+          :param: next_locator: Future resolved with the locator of the following chunk, or `None` if there is none
+          :type: next_locator: concurrent.futures.Future
+          :return: Temporary file holding the CSV data of the chunk, rewound, or `None` if the request failed
+          :rtype: file|None
+        """
+        (headers, logger, request_object, response, service) = self.get_request_vars()
+        params = self.get_params(locator)
+        logger.info('GET %s %s' % (service, params))
+
+        try:
+            request_object = self.session.get(
+                service, headers=headers, params=params, proxies=self.proxies, timeout=self.timeout, stream=True)
+            self.status = request_object.status_code
+            if request_object.status_code != 200:
+                raise commons.SFDCRequestException(
+                    'Results request failed. Received %s status code' % request_object.status_code)
+            next_locator.set_result(self.get_next_locator(request_object))
+
+            f = tempfile.TemporaryFile()
+            for chunk in request_object.iter_content(self.chunk_size):
+                f.write(chunk)
+            f.seek(0)
+            with self.lock:
+                self.pages += 1
+            return f
+        except Exception as e:
+            with self.lock:
+                self.exceptions.append(e)
+            logger.error('GET %s %s' % (service, self.status))
+        finally:
+            if not next_locator.done():
+                next_locator.set_result(None)
+            if request_object is not None:
+                request_object.close()
+
+    def iter_files(self):
+        """ Downloads every chunk, up to `max_workers` at a time, and yields their temporary files in order. Each file
+        is closed once the next one is requested. Stops at the first failed chunk.
+
+          :return: A generator of temporary files opened in binary mode
+          :rtype: generator
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = collections.deque()
+        next_locator = concurrent.futures.Future()
+        pending.append(executor.submit(self.fetch, None, next_locator))
+
+        try:
+            while len(pending) > 0:
+                while next_locator is not None and len(pending) < self.max_workers:
+                    locator = next_locator.result()
+                    if locator is None:
+                        next_locator = None
+                        break
+                    next_locator = concurrent.futures.Future()
+                    pending.append(executor.submit(self.fetch, locator, next_locator))
+
+                f = pending.popleft().result()
+                if f is None:
+                    return
+                try:
+                    yield f
+                finally:
+                    f.close()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for future in pending:
+                if not future.cancelled() and future.result() is not None:
+                    future.result().close()
+
+    def iter_rows(self):
+        """ Yields every record as a dict keyed by the CSV header, in order.
+
+          :return: A generator of rows
+          :rtype: generator
+        """
+        for f in self.iter_files():
+            for row in csv.DictReader(io.TextIOWrapper(f, encoding='utf-8', newline=''), delimiter=self.delimiter):
+                yield row
+
+    def write_to(self, f):
+        """ Copies the CSV data of every chunk to `f` in order, without decoding it, writing the header row of the first
+        chunk only.
+
+          :param: f: File path, or file object opened in binary mode
+          :type: f: string|os.PathLike|file
+          :return: Number of bytes written
+          :rtype: int
+        """
+        if not hasattr(f, 'write'):
+            with open(f, 'wb') as fp:
+                return self.write_to(fp)
+
+        written = 0
+        for (index, part) in enumerate(self.iter_files()):
+            if index > 0:
+                part.readline()
+            for chunk in iter_file(part, self.chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+
+class ListJobs(commons.BaseRequest):
+    """ Performs GET requests to `'/services/data/vX.XX/jobs/ingest'`, following `nextRecordsUrl` until every page of
+    jobs has been read.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, session_id, instance_url, api_version, **kwargs):
+        """ Constructor. Calls `super`, then encodes the filters provided into the `service`.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: api_version: API version
+          :type: api_version: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *is_pk_chunking_enabled* (`bool`) --
+                Only list jobs with or without PK chunking
+            * *job_type* (`string`) --
+                Only list jobs of this type: `'BigObjectIngest'`, `'Classic'` or `'V2Ingest'`
+            * *concurrency_mode* (`string`) --
+                Only list jobs with this concurrency mode, eg. `'parallel'`
+        """
+        super(ListJobs, self).__init__(session_id, instance_url, **kwargs)
+
+        params = []
+        for (kwarg, param) in LIST_FILTERS:
+            value = kwargs.get(kwarg)
+            if value is not None:
+                params.append((param, str(value).lower() if isinstance(value, bool) else value))
+
+        self.http_method = 'GET'
+        self.service = GET_ALL_URI % api_version
+        if len(params) > 0:
+            self.service = '%s?%s' % (self.service, urlencode(params))
+
+    def iter_pages(self):
+        """ Requests each page in turn, lazily. Stops after the page whose `done` is not `False`, or when a request
+        fails, in which case the exception is appended to `self.exceptions`.
+
+          :return: A generator of pages, each a dict with `records`
+          :rtype: generator
+        """
+        while True:
+            page = self.request()
+            if not isinstance(page, dict):
+                return
+            yield page
+            if page.get('done') is not False or not page.get('nextRecordsUrl'):
+                return
+            self.service = page['nextRecordsUrl']
+            self.request_url = None
+
+    def iter_records(self):
+        """ Yields every job of every page.
+
+          :return: A generator of job info dicts
+          :rtype: generator
+        """
+        for page in self.iter_pages():
+            for record in page.get('records', []):
+                yield record
+
+
+class JobPoller(object):
+    """ Lists ingest jobs incrementally: each call to `poll()` returns only the jobs created or changed, according to
+    their `systemModstamp`, since the previous call.
+
+    The listing of jobs can't be filtered by modification time, so each poll reads every page of jobs again, and the
+    comparison happens client side. Pass the filters of `ListJobs`, eg. `job_type`, to list fewer jobs. Only the jobs
+    still running are remembered between polls: those in a final state or no longer listed are forgotten, and are told
+    apart from new jobs by being modified no later than the latest `systemModstamp` listed.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, ingest, since=None, **kwargs):
+        """ Constructor.
+
+          :param: ingest: Ingest namespace through which jobs are listed
+          :type: ingest: Ingest
+          :param: since: Only return jobs modified after this time on the first poll,
+            eg. `'2018-12-05T10:56:43.000+0000'`
+          :type: since: string
+          :param: **kwargs: kwargs passed on to `Ingest.list()`, eg. filters
+          :type: **kwargs: dict
+        """
+        self.ingest = ingest
+        self.since = since
+        self.kwargs = kwargs
+        self.seen = {}
+        self.requests = []
+
+    def poll(self):
+        """ Lists every job, and returns those new or changed since the previous poll.
+
+          :return: Job info dicts
+          :rtype: [dict]
+        """
+        (records, list_jobs) = self.ingest.list(**self.kwargs)
+        (since, seen) = (self.since, {})
+        changed = []
+
+        for job in records:
+            (job_id, modstamp) = (job.get('id'), job.get('systemModstamp') or '')
+            if self.seen.get(job_id) != modstamp and (job_id in self.seen or since is None or modstamp > since):
+                changed.append(job)
+            if job.get('state') not in TERMINAL_STATES:
+                seen[job_id] = modstamp
+            self.since = max(self.since or '', modstamp)
+
+        if len(list_jobs.exceptions) == 0:
+            self.seen = seen
+        else:
+            self.seen.update(seen)
+        self.requests.append(list_jobs)
+        return changed
+
+
+class Load(object):
+    """ Loads rows through as many Bulk API 2.0 ingest jobs as needed to keep each upload under the size limit of a job.
+    Rows are encoded to CSV and spooled to temporary files by `split_rows()`, and the create, upload and
+    `UploadComplete` steps of the jobs run concurrently on a pool of worker threads while the next files are encoded.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, ingest, job_resource, **kwargs):
+        """ Constructor.
+
+          :param: ingest: Ingest namespace through which the jobs are made
+          :type: ingest: Ingest
+          :param: job_resource: Body with which each job is created
+          :type: job_resource: dict
+          :param: **kwargs: kwargs, also passed on to each request
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *max_bytes* (`int`) --
+                Maximum size in bytes of the CSV data uploaded to a job. Default: `104857600`, which stays below the
+                150 MB limit once base64 encoded by Salesforce
+            * *max_workers* (`int`) --
+                Maximum number of jobs created and uploaded concurrently. Default: `4`
+        """
+        self.ingest = ingest
+        self.job_resource = job_resource
+        self.kwargs = kwargs
+        self.max_bytes = kwargs.get('max_bytes', MAX_UPLOAD_BYTES)
+        self.max_workers = kwargs.get('max_workers', DEFAULT_LOAD_WORKERS)
+        self.line_ending = job_resource.get('lineEnding', 'LF')
+        self.jobs = []
+        self.requests = []
+        self.exceptions = []
+        self.lock = threading.Lock()
+
+    @property
+    def job_ids(self):
+        """ IDs of the jobs created, in the order of the rows they were given. """
+        return [job.get('id') for job in self.jobs if isinstance(job, dict)]
+
+    def watch(self, callback=None):
+        """ Watches every job created until it reaches a final state, see `Ingest.watch()`.
+
+          :param: callback: Function called with the job info of each job once it reaches a final state
+          :type: callback: function
+          :return: One future per job, in the order of `job_ids`
+          :rtype: [concurrent.futures.Future]
+        """
+        kwargs = {k: v for (k, v) in self.kwargs.items() if k not in ('max_bytes', 'max_workers')}
+        return [self.ingest.watch(job_id, callback, **kwargs)[0] for job_id in self.job_ids]
+
+    def load_part(self, index, part):
+        """ Submits `part` as a new job with `Ingest.submit()`. The requests made are stored at `index` in
+        `self.requests`, and their exceptions appended to `self.exceptions`.
+
+          :param: index: Position of the part
+          :type: index: int
+          :param: part: CSV data
+          :type: part: file
+          :return: Job info, or `None` if the job could not be created
+          :rtype: dict|None
+        """
+        try:
+            (job, requests) = self.ingest.submit(self.job_resource, part, **self.kwargs)
+        finally:
+            part.close()
+        with self.lock:
+            self.requests[index] = requests
+            for request in requests:
+                self.exceptions.extend(request.exceptions)
+        return job
+
+    def request(self, rows):
+        """ Loads `rows`. At most `max_workers` files are pending upload at any time, so that encoding doesn't get ahead
+        of the uploads.
+
+          :param: rows: Rows, see `split_rows()`
+          :type: rows: iterable of list|tuple|dict
+          :return: Job info of each job, in the order of the rows they were given
+          :rtype: [dict|None]
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        try:
+            for (index, part) in enumerate(split_rows(rows, self.max_bytes, self.line_ending)):
+                self.requests.append(None)
+                futures.append(executor.submit(self.load_part, index, part))
+                pending = [f for f in futures if not f.done()]
+                if len(pending) >= self.max_workers:
+                    concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            self.jobs = [f.result() for f in futures]
+        finally:
+            executor.shutdown(wait=True)
+
+        return self.jobs
+
+
+class JobMonitor(object):
+    """ Watches any number of jobs from a single scheduler thread until they reach `JobComplete`, `Failed` or `Aborted`.
+
+    Each job is polled after an interval which grows exponentially from `initial_interval` up to `max_interval`, less a
+    random jitter so that jobs watched together don't get polled in lockstep. Jobs are polled in order of due time, and
+    the scheduler thread exits once no job is left to watch. The kwargs of the constructor are defaults, which each
+    call to `watch()` may override for its job.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, namespace, **kwargs):
+        """ Constructor.
+
+          :param: namespace: Namespace through which jobs are polled with `get(job_id=...)`
+          :type: namespace: Ingest|BulkQuery
+          :param: **kwargs: kwargs, also passed on to each request of jobs watched without kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *initial_interval* (`float`) --
+                Seconds before the first poll of a job. Default: `1.0`
+            * *max_interval* (`float`) --
+                Maximum number of seconds between two polls of a job. Default: `30.0`
+            * *backoff_factor* (`float`) --
+                Factor by which the interval grows after each poll. Default: `2.0`
+            * *jitter* (`float`) --
+                Fraction of the interval which may randomly be taken off. Default: `0.2`
+            * *max_errors* (`int`) --
+                Number of polls in a row which may fail before the job's future gets an exception. Default: `5`
+        """
+        self.namespace = namespace
+        self.kwargs = kwargs
+        self.initial_interval = kwargs.get('initial_interval', DEFAULT_POLL_INTERVAL)
+        self.max_interval = kwargs.get('max_interval', DEFAULT_MAX_POLL_INTERVAL)
+        self.backoff_factor = kwargs.get('backoff_factor', DEFAULT_POLL_BACKOFF)
+        self.jitter = kwargs.get('jitter', DEFAULT_POLL_JITTER)
+        self.max_errors = kwargs.get('max_errors', DEFAULT_POLL_ERRORS)
+        self.schedule = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.closed = False
+        self.polls = 0
+
+    def get_settings(self, kwargs):
+        """ Returns the polling settings of a job watched with `kwargs`, defaulting to the monitor's.
+
+          :param: kwargs: kwargs, see the constructor
+          :type: kwargs: dict
+          :return: settings
+          :rtype: dict
+        """
+        return {name: kwargs.get(name, getattr(self, name)) for name in POLL_SETTINGS}
+
+    def get_interval(self, attempt, settings=None):
+        """ Returns the number of seconds to wait before the poll following `attempt` polls of a job.
+
+          :param: attempt: Number of polls made so far
+          :type: attempt: int
+          :param: settings: Polling settings of the job, see `get_settings()`. Default: the monitor's
+          :type: settings: dict
+          :return: seconds
+          :rtype: float
+        """
+        settings = settings or self.get_settings({})
+        interval = min(settings['max_interval'], settings['initial_interval'] * settings['backoff_factor'] ** attempt)
+        return interval * (1 - random.random() * settings['jitter'])
+
+    def schedule_poll(self, watch):
+        with self.condition:
+            due = time.time() + self.get_interval(watch['attempt'], watch['settings'])
+            heapq.heappush(self.schedule, (due, next(self.sequence), watch))
+            self.start()
+            self.condition.notify()
+
+    def start(self):
+        """ Starts the scheduler thread, unless it is running or no job is left. Call with `condition` held. """
+        if self.thread is None and len(self.schedule) > 0 and not self.closed:
+            self.thread = threading.Thread(target=self.run, name='sfdc_py-job-monitor')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def resolve(self, watch, result=None, exception=None):
+        """ Resolves the future of a watched job with `result` or `exception`, unless it was cancelled meanwhile.
+
+          :param: watch: Job being watched
+          :type: watch: dict
+          :param: result: Job info
+          :type: result: dict
+          :param: exception: Exception
+          :type: exception: Exception
+          :return: Whether the future was resolved
+          :rtype: bool
+        """
+        future = watch['future']
+        if future.done():
+            return False
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            return False
+        return True
+
+    def watch(self, job_id, callback=None, **kwargs):
+        """ Starts watching a job.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: callback: Function called with the job info once the job reaches a final state
+          :type: callback: function
+          :param: **kwargs: kwargs of the job's polls, see the constructor. Default: the monitor's
+          :type: **kwargs: dict
+          :return: Future resolved with the job info once the job reaches a final state
+          :rtype: concurrent.futures.Future
+        """
+        if self.closed:
+            raise RuntimeError('JobMonitor is closed')
+        future = concurrent.futures.Future()
+        self.schedule_poll({
+            'job_id': job_id, 'future': future, 'callback': callback, 'attempt': 0, 'errors': 0,
+            'settings': self.get_settings(kwargs), 'kwargs': kwargs or self.kwargs})
+        return future
+
+    def poll(self, watch):
+        """ Polls a job once, resolving its future if it reached a final state and scheduling the next poll otherwise.
+
+          :param: watch: Job being watched
+          :type: watch: dict
+        """
+        if watch['future'].cancelled():
+            return
+        (job, get_job) = self.namespace.get(job_id=watch['job_id'], **watch['kwargs'])
+        self.polls += 1
+
+        if isinstance(job, dict) and job.get('state') in TERMINAL_STATES:
+            if self.resolve(watch, job) and watch['callback'] is not None:
+                try:
+                    watch['callback'](job)
+                except Exception as e:
+                    logging.getLogger('sfdc_py').error('Callback for job %s failed: %s' % (watch['job_id'], e))
+            return
+
+        watch['errors'] = 0 if isinstance(job, dict) else watch['errors'] + 1
+        if watch['errors'] > watch['settings']['max_errors']:
+            self.resolve(watch, exception=commons.SFDCRequestException(
+                'Polling job %s failed %s times in a row. Received %s status code' % (
+                    watch['job_id'], watch['errors'], get_job.status)))
+            return
+
+        watch['attempt'] += 1
+        self.schedule_poll(watch)
+
+    def run(self):
+        """ Scheduler loop: waits for the next job to be due, polls it, and exits once no job is left to watch. """
+        try:
+            while True:
+                with self.condition:
+                    while True:
+                        if self.closed or len(self.schedule) == 0:
+                            self.thread = None
+                            return
+                        delay = self.schedule[0][0] - time.time()
+                        if delay <= 0:
+                            (due, sequence, watch) = heapq.heappop(self.schedule)
+                            break
+                        self.condition.wait(delay)
+                try:
+                    self.poll(watch)
+                except Exception as e:
+                    self.resolve(watch, exception=e)
+        finally:
+            with self.condition:
+                if self.thread is threading.current_thread():
+                    self.thread = None
+                    self.start()
+
+    def close(self):
+        """ Stops watching, and cancels the futures of every job still watched. """
+        with self.condition:
+            self.closed = True
+            (watches, self.schedule) = ([watch for (due, sequence, watch) in self.schedule], [])
+            self.condition.notify()
+        for watch in watches:
+            watch['future'].cancel()
+
+
+class JobNamespace(commons.ApiNamespace):
+    """ Base class for the Bulk API 2.0 job namespaces, whose jobs can be watched by a shared `JobMonitor`.
+
+        .. versionadded:: 2.3.0
+    """
+    def get_monitor(self):
+        """ Returns the `JobMonitor` shared by every job watched through this namespace, building it on first use. The
+        polling settings of each job are those it was watched with.
+
+          :return: monitor
+          :rtype: JobMonitor
+        """
+        if getattr(self, 'monitor', None) is None or self.monitor.closed:
+            self.monitor = JobMonitor(self)
+        return self.monitor
+
+    @commons.kwarg_adder
+    def watch(self, job_id, callback=None, **kwargs):
+        """ Watches a job until it reaches `JobComplete`, `Failed` or `Aborted`. Every job watched through this
+        namespace is polled by the same `JobMonitor`, see its kwargs for polling intervals.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: callback: Function called with the job info once the job reaches a final state
+          :type: callback: function
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Future resolved with the final job info, and the monitor
+          :rtype: (concurrent.futures.Future, JobMonitor)
+        """
+        monitor = self.get_monitor()
+        return monitor.watch(job_id, callback, **kwargs), monitor
+
+
+class Ingest(JobNamespace):
     """ The Ingest namespace class from which all Bulk API calls to a Salesforce organisation are made.
 
         .. versionadded:: 1.1.0
     """
     @commons.kwarg_adder
     def batches(self, job_id, csv_file, **kwargs):
-        """ Upload data to Bulk API batch job
+        """ Upload data to Bulk API batch job. File paths, file objects and iterables of rows are streamed in chunks,
+        so that large files are never held in memory. See `Batches` for the kwargs controlling streaming and gzip.
 
           :param: job_id: Job ID
           :type: job_id: string
-          :param: csv_file: CSV data
-          :type: csv_file: string
+          :param: csv_file: CSV data, file path, file object or iterable of rows
+          :type: csv_file: string|bytes|os.PathLike|file|iterable
           :return: Query response
           :rtype: (response, batches)
         """
@@ -209,6 +1366,173 @@ class Ingest(commons.ApiNamespace):
 
         return response, delete_job
 
+    @commons.kwarg_adder
+    def submit(self, job_resource, csv_file, **kwargs):
+        """ Creates a job, uploads `csv_file` to it and marks it `UploadComplete`. A job whose upload fails is aborted.
+
+        .. versionadded:: 2.3.0
+
+          :param: job_resource: Request body
+          :type: job_resource: dict
+          :param: csv_file: CSV data, file path, file object or iterable of rows
+          :type: csv_file: string|bytes|os.PathLike|file|iterable
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Job info, or `None` if the job could not be created, and the requests made
+          :rtype: (dict|None, [commons.BaseRequest])
+        """
+        (job, create_job) = self.create(job_resource, **kwargs)
+        if not isinstance(job, dict) or 'id' not in job:
+            return None, [create_job]
+
+        (response, batches) = self.batches(job['id'], csv_file, **kwargs)
+        state = 'UploadComplete' if batches.status == 201 else 'Aborted'
+        if state == 'Aborted':
+            logging.getLogger('sfdc_py').error('Upload to job %s failed, aborting it' % job['id'])
+
+        (update_response, update_job) = self.update(job['id'], state, **kwargs)
+        return (update_response if isinstance(update_response, dict) else job), [create_job, batches, update_job]
+
+    @commons.kwarg_adder
+    def run(self, job_resource, csv_file, callback=None, **kwargs):
+        """ Creates a job, uploads `csv_file`, marks it `UploadComplete` and watches it until it reaches a final state.
+
+        .. versionadded:: 2.3.0
+
+          :param: job_resource: Request body
+          :type: job_resource: dict
+          :param: csv_file: CSV data, file path, file object or iterable of rows
+          :type: csv_file: string|bytes|os.PathLike|file|iterable
+          :param: callback: Function called with the job info once the job reaches a final state
+          :type: callback: function
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Future resolved with the final job info, and the monitor
+          :rtype: (concurrent.futures.Future, JobMonitor)
+        """
+        (job, requests) = self.submit(job_resource, csv_file, **kwargs)
+        monitor = self.get_monitor()
+
+        if job is None:
+            future = concurrent.futures.Future()
+            future.set_exception(commons.SFDCRequestException(
+                'Job creation failed. Received %s status code' % requests[0].status))
+            return future, monitor
+        if job.get('state') in TERMINAL_STATES:
+            future = concurrent.futures.Future()
+            future.set_result(job)
+            if callback is not None:
+                callback(job)
+            return future, monitor
+        return monitor.watch(job['id'], callback, **kwargs), monitor
+
+    @commons.kwarg_adder
+    def results(self, job_id, **kwargs):
+        """ Streams the results of a job, parsed row by row. Pass `failures=True` or `unprocessed=True` for failed
+        results or unprocessed records, and `max_records` to page through the results. See `JobResults` for more kwargs.
+
+        .. versionadded:: 2.3.0
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: A generator of rows, each a dict keyed by the CSV header, and the request
+          :rtype: (generator, JobResults)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        job_results = JobResults(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+
+        return job_results.iter_rows(), job_results
+
+    @commons.kwarg_adder
+    def download(self, job_id, f, **kwargs):
+        """ Writes the results of a job straight to a file, without decoding them. Takes the same kwargs as `results()`.
+
+        .. versionadded:: 2.3.0
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: f: File path, or file object opened in binary mode
+          :type: f: string|os.PathLike|file
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Number of bytes written, and the request
+          :rtype: (int, JobResults)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        job_results = JobResults(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+        written = job_results.write_to(f)
+
+        return written, job_results
+
+    @commons.kwarg_adder
+    def list(self, **kwargs):
+        """ Lists every ingest job, page by page, following `nextRecordsUrl`. See `ListJobs` for the filters.
+
+        .. versionadded:: 2.3.0
+
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: A generator of job info dicts, and the request
+          :rtype: (generator, ListJobs)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        list_jobs = ListJobs(client.session_id, client.instance_url, api_version, **kwargs)
+
+        return list_jobs.iter_records(), list_jobs
+
+    def poller(self, since=None, **kwargs):
+        """ Returns a `JobPoller`, whose `poll()` lists only the jobs changed since the previous poll.
+
+        .. versionadded:: 2.3.0
+
+          :param: since: Only return jobs modified after this time on the first poll
+          :type: since: string
+          :param: **kwargs: kwargs passed on to `list()`, eg. filters
+          :type: **kwargs: dict
+          :return: poller
+          :rtype: JobPoller
+        """
+        return JobPoller(self, since, **kwargs)
+
+    @commons.kwarg_adder
+    def load(self, object_name, operation, rows, **kwargs):
+        """ Loads any number of rows, split across as many jobs as needed to stay under the upload limit of a job. Each
+        job is created, uploaded and closed with `UploadComplete` concurrently. See `Load` for the kwargs controlling
+        splitting and concurrency.
+
+        .. versionadded:: 2.3.0
+
+          :param: object_name: Object to load, eg. `'Account'`
+          :type: object_name: string
+          :param: operation: `'insert'`, `'update'`, `'upsert'`, `'delete'` or `'hardDelete'`
+          :type: operation: string
+          :param: rows: Rows, either lists of values the first of which is the header, or dicts
+          :type: rows: iterable of list|tuple|dict
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *external_id* (`string`) --
+                External ID field, required to upsert
+            * *job_resource* (`dict`) --
+                Additional properties of each job, eg. `{'lineEnding': 'CRLF'}`
+          :return: Job info of each job, in the order of the rows they were given, and the load
+          :rtype: ([dict], Load)
+        """
+        job_resource = {'object': object_name, 'operation': operation, 'contentType': 'CSV'}
+        if kwargs.get('external_id') is not None:
+            job_resource['externalIdFieldName'] = kwargs.get('external_id')
+        job_resource.update(kwargs.get('job_resource') or {})
+
+        load = Load(self, job_resource, **{k: v for (k, v) in kwargs.items() if k != 'job_resource'})
+        response = load.request(rows)
+
+        return response, load
+
     @commons.kwarg_adder
     def update(self, job_id, state, **kwargs):
         """ Close or abort a Bulk API batch job
@@ -234,6 +1558,132 @@ class Ingest(commons.ApiNamespace):
         return response, update_job
 
 
+class BulkQuery(JobNamespace):
+    """ The namespace class from which all Bulk API 2.0 query job calls are made.
+
+        .. versionadded:: 2.3.0
+    """
+    @commons.kwarg_adder
+    def create(self, query_string, operation='query', **kwargs):
+        """ Creates a query job.
+
+          :param: query_string: Query string, eg. `'SELECT Id, Name FROM Account'`
+          :type: query_string: string
+          :param: operation: `'query'`, or `'queryAll'` to include deleted and archived records
+          :type: operation: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *job_resource* (`dict`) --
+                Additional properties of the job, eg. `{'columnDelimiter': 'TAB'}`
+          :return: Job info, and the request
+          :rtype: (dict, CreateQueryJob)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        request_body = {'operation': operation, 'query': query_string}
+        request_body.update(kwargs.get('job_resource') or {})
+        create_job = CreateQueryJob(client.session_id, client.instance_url, api_version, request_body, **kwargs)
+        response = create_job.request()
+
+        return response, create_job
+
+    @commons.kwarg_adder
+    def get(self, job_id=None, **kwargs):
+        """ Gets the info of a query job, or of every query job if no `job_id` is given.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Job info, and the request
+          :rtype: (dict, GetQueryJob)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        get_job = GetQueryJob(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+        response = get_job.request()
+
+        return response, get_job
+
+    @commons.kwarg_adder
+    def abort(self, job_id, **kwargs):
+        """ Aborts a query job.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Job info, and the request
+          :rtype: (dict, UpdateQueryJob)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        update_job = UpdateQueryJob(
+            client.session_id, client.instance_url, api_version, job_id, {'state': 'Aborted'}, **kwargs)
+        response = update_job.request()
+
+        return response, update_job
+
+    @commons.kwarg_adder
+    def delete(self, job_id, **kwargs):
+        """ Deletes a query job.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Query response
+          :rtype: (None, DeleteQueryJob)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        delete_job = DeleteQueryJob(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+        response = delete_job.request()
+
+        return response, delete_job
+
+    @commons.kwarg_adder
+    def results(self, job_id, **kwargs):
+        """ Streams the results of a completed query job in order, parsed row by row, while downloading several chunks
+        concurrently. See `QueryResults` for the kwargs controlling chunking and concurrency. Pass the job's
+        `columnDelimiter` as `column_delimiter` if it was created with one.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: A generator of rows, each a dict keyed by the CSV header, and the request
+          :rtype: (generator, QueryResults)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        query_results = QueryResults(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+
+        return query_results.iter_rows(), query_results
+
+    @commons.kwarg_adder
+    def download(self, job_id, f, **kwargs):
+        """ Writes the results of a completed query job straight to a file in order, while downloading several chunks
+        concurrently. Takes the same kwargs as `results()`.
+
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: f: File path, or file object opened in binary mode
+          :type: f: string|os.PathLike|file
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Number of bytes written, and the request
+          :rtype: (int, QueryResults)
+        """
+        client = self.client
+        api_version = self.client_kwargs.get('version')
+        query_results = QueryResults(client.session_id, client.instance_url, api_version, job_id, **kwargs)
+        written = query_results.write_to(f)
+
+        return written, query_results
+
+
 class UpdateJob(commons.BaseRequest):
     """ Performs a PATCH request to `'/services/data/vX.XX/jobs/ingest/<job_id>'`
 
@@ -268,3 +1718,4 @@ class Jobs(commons.ApiNamespace):
         super(Jobs, self).__init__(client)
 
         self.ingest = Ingest(client)
+        self.query = BulkQuery(client)
@@ -0,0 +1,222 @@
+"""
+.. module:: jsonstream
+   :synopsis: Incremental parsing of query and search responses, record by record.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import codecs
+import json
+import re
+
+DEFAULT_STREAM_CHUNK_SIZE = 65536
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+SCALAR = re.compile(r'[^,:\]}\s]+')
+STRUCTURE = re.compile(r'["{}\[\]]')
+DELIMITERS = frozenset(' \t\n\r,:]}')
+
+
+class IncompleteValue(Exception):
+    """ Raised internally when the buffer ends before the value being scanned. """
+    pass
+
+
+class RecordStream(object):
+    """ Parses a JSON response incrementally from chunks of bytes, yielding each element of its records array as soon
+    as the element is complete: the `key` array of the top-level object, eg. `records` for query results, or the
+    top-level array itself. The other top-level values, eg. `done` and `nextRecordsUrl`, are collected in `page`.
+
+    Only the record being parsed and the current network chunk are held in memory. With `fields`, the other fields of
+    each record are skipped over without being built.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, key='records', fields=None):
+        """ Constructor.
+
+          :param: key: Key of the records array in the top-level object
+          :type: key: string
+          :param: fields: Names of the fields to keep in each record, besides `attributes`. Default: every field
+          :type: fields: iterable of string
+        """
+        self.key = key
+        self.fields = None if fields is None else frozenset(fields) | {'attributes'}
+        self.page = {}
+        self.decoder = json.JSONDecoder()
+        self.chunks = None
+        self.text_decoder = None
+        self.buffer = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self):
+        """ Appends the next chunk to the buffer, dropping what has been parsed. Returns `False` once the chunks are
+        exhausted.
+
+          :return: Whether more data was read
+          :rtype: bool
+        """
+        if self.exhausted:
+            return False
+        text = ''
+        while not text:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                text = self.text_decoder.decode(b'', final=True)
+                break
+            text = self.text_decoder.decode(chunk)
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return len(text) > 0
+
+    def peek(self):
+        """ Skips whitespace and returns the next character, without consuming it. """
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            elif not self.fill():
+                raise ValueError('Unexpected end of JSON document')
+
+    def expect(self, chars):
+        """ Consumes the next character, which must be one of `chars`, and returns it. """
+        char = self.peek()
+        if char not in chars:
+            raise ValueError('Expecting one of %r at position %d, found %r' % (chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def scan(self, fn):
+        """ Calls `fn(start)` on the buffer from the next value, reading more data while the value is incomplete.
+        `fn` returns `(result, end)`, and raises `IncompleteValue` or `ValueError` if the value doesn't end within
+        the buffer. A number or literal not followed by a delimiter might be truncated, eg. `12` of `12.5`, so it is
+        only accepted once the delimiter has been read or the chunks are exhausted.
+        """
+        self.peek()
+        while True:
+            try:
+                (result, end) = fn(self.pos)
+            except (IncompleteValue, ValueError):
+                if self.exhausted:
+                    raise
+                self.fill()
+                continue
+            if self.exhausted or self.buffer[end - 1] in '}]"' or self.buffer[end:end + 1] in DELIMITERS:
+                self.pos = end
+                return result
+            self.fill()
+
+    def decode_value(self):
+        """ Consumes and returns the next value. """
+        return self.scan(lambda start: self.decoder.raw_decode(self.buffer, start))
+
+    def skip_value(self):
+        """ Consumes the next value without building it. """
+        return self.scan(lambda start: (None, self.get_value_end(start)))
+
+    def get_string_end(self, start):
+        """ Returns the position following the string starting at `start`. Raises `IncompleteValue` if the string
+        doesn't end within the buffer.
+        """
+        pos = start + 1
+        while True:
+            end = self.buffer.find('"', pos)
+            if end < 0:
+                raise IncompleteValue()
+            escape = end - 1
+            while self.buffer[escape] == '\\':
+                escape -= 1
+            if (end - escape) % 2 == 1:
+                return end + 1
+            pos = end + 1
+
+    def get_value_end(self, start):
+        """ Returns the position following the value starting at `start`. Raises `IncompleteValue` if the value
+        doesn't end within the buffer.
+        """
+        char = self.buffer[start]
+        if char == '"':
+            return self.get_string_end(start)
+        elif char not in '{[':
+            return SCALAR.match(self.buffer, start).end()
+
+        depth = 0
+        pos = start
+        while True:
+            match = STRUCTURE.search(self.buffer, pos)
+            if match is None:
+                raise IncompleteValue()
+            elif match.group() == '"':
+                pos = self.get_string_end(match.start())
+                continue
+            depth += 1 if match.group() in '{[' else -1
+            pos = match.end()
+            if depth == 0:
+                return pos
+
+    def parse_record(self):
+        """ Consumes and returns the next record, keeping only `fields` if set. """
+        if self.fields is None or self.peek() != '{':
+            return self.decode_value()
+
+        self.expect('{')
+        record = {}
+        if self.peek() == '}':
+            self.pos += 1
+            return record
+        while True:
+            key = self.decode_value()
+            self.expect(':')
+            if key in self.fields:
+                record[key] = self.decode_value()
+            else:
+                self.skip_value()
+            if self.expect(',}') == '}':
+                return record
+
+    def iter_array(self):
+        """ Consumes an array, yielding each of its records. """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.parse_record()
+            if self.expect(',]') == ']':
+                return
+
+    def parse(self, chunks):
+        """ Parses the JSON document made of `chunks`, yielding each record as soon as it is complete. `page` holds
+        the other top-level values once the generator is exhausted.
+
+          :param: chunks: Chunks of the UTF-8 encoded document, eg. `response.iter_content(65536)`
+          :type: chunks: iterable of bytes
+          :return: A generator of records
+          :rtype: generator
+          :raises: ValueError if the document is malformed
+        """
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+        if self.peek() == '[':
+            for record in self.iter_array():
+                yield record
+            return
+
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.decode_value()
+            self.expect(':')
+            if key == self.key and self.peek() == '[':
+                for record in self.iter_array():
+                    yield record
+            else:
+                self.page[key] = self.decode_value()
+            if self.expect(',}') == '}':
+                return
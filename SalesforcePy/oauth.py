@@ -0,0 +1,193 @@
+"""
+.. module:: oauth
+   :synopsis: OAuth refresh token and JWT bearer grants, and pre-emptive renewal of a client's session.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import logging
+import threading
+import time
+
+from .commons import OAuthRequest
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+TOKEN_SERVICE = '/services/oauth2/token'
+JWT_BEARER_GRANT = 'urn:ietf:params:oauth:grant-type:jwt-bearer'
+DEFAULT_JWT_LIFETIME = 180
+DEFAULT_REFRESH_INTERVAL = 3600
+DEFAULT_RETRY_INTERVAL = 60
+
+
+def get_jwt_assertion(client_id, username, private_key, login_url='login.salesforce.com',
+                      lifetime=DEFAULT_JWT_LIFETIME):
+    """
+    Returns a JWT signed with RS256, with which to request a session through the JWT bearer flow.
+
+    :param: client_id: Consumer key of the connected app, ie. the issuer
+    :type: client_id: string
+    :param: username: Salesforce username, ie. the subject
+    :type: username: string
+    :param: private_key: PEM encoded private key whose certificate is uploaded to the connected app
+    :type: private_key: string|bytes
+    :param: login_url: Salesforce login URL, from which the audience is derived. Default: `'login.salesforce.com'`
+    :type: login_url: string
+    :param: lifetime: Seconds for which the assertion is valid. Default: `180`
+    :type: lifetime: int
+    :return: assertion
+    :rtype: string
+    :raises: ImportError if PyJWT isn't installed
+    """
+    if jwt is None:
+        raise ImportError('JWT bearer flow requires PyJWT. Install it with `pip install SalesforcePy[jwt]`')
+    claims = {'iss': client_id, 'sub': username, 'aud': 'https://%s' % login_url, 'exp': int(time.time()) + lifetime}
+    assertion = jwt.encode(claims, private_key, algorithm='RS256')
+    return assertion.decode('utf-8') if isinstance(assertion, bytes) else assertion
+
+
+class TokenRequest(OAuthRequest):
+    """ Base class for requests to `'/services/oauth2/token'` which grant a session.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, **kwargs):
+        super(TokenRequest, self).__init__(None, None, **kwargs)
+        self.login_url = kwargs.get('login_url', 'login.salesforce.com')
+        self.http_method = 'POST'
+        self.service = TOKEN_SERVICE
+
+    def parse_response(self, request_object):
+        response = super(TokenRequest, self).parse_response(request_object)
+        if 'access_token' in response:
+            self.session_id = response['access_token']
+        return response
+
+    def get_session_id(self):
+        """ Returns the session ID obtained if the request was successful
+
+          :return: Session ID
+          :rtype: string
+        """
+        return self.session_id
+
+
+class RefreshTokenRequest(TokenRequest):
+    """ Requests a session with a refresh token obtained earlier, eg. through the web server or device flow.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, client_id, client_secret, refresh_token, **kwargs):
+        """ Constructor.
+
+          :param: client_id: Salesforce client ID
+          :type: client_id: string
+          :param: client_secret: Salesforce client secret, if the connected app requires it
+          :type: client_secret: string|None
+          :param: refresh_token: Refresh token
+          :type: refresh_token: string
+        """
+        super(RefreshTokenRequest, self).__init__(**kwargs)
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.payload = self.get_payload()
+
+    def get_payload(self):
+        payload = {'grant_type': 'refresh_token', 'client_id': self.client_id, 'refresh_token': self.refresh_token}
+        if self.client_secret is not None:
+            payload['client_secret'] = self.client_secret
+        return payload
+
+
+class JwtBearerRequest(TokenRequest):
+    """ Requests a session with a JWT signed by the private key of the connected app's certificate, without any
+    password or user interaction.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, assertion, **kwargs):
+        """ Constructor.
+
+          :param: assertion: Signed JWT, see `get_jwt_assertion()`
+          :type: assertion: string
+        """
+        super(JwtBearerRequest, self).__init__(**kwargs)
+        self.assertion = assertion
+        self.payload = self.get_payload()
+
+    def get_payload(self):
+        return {'grant_type': JWT_BEARER_GRANT, 'assertion': self.assertion}
+
+
+class TokenRefresher(object):
+    """ Renews a client's session in a background thread every `interval` seconds, before it expires, so that request
+    threads never wait for a login. The client logs in again the way it last did. Set `interval` below the session
+    timeout of the org, 2 hours by default. A failed renewal is retried after `retry_interval` seconds, and requests
+    failing with an expired session meanwhile are still renewed by `commons.SessionAuth`.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, client, interval=DEFAULT_REFRESH_INTERVAL, retry_interval=DEFAULT_RETRY_INTERVAL):
+        """ Constructor.
+
+          :param: client: Client whose session is renewed
+          :type: client: sfdc.Client
+          :param: interval: Seconds between renewals. Default: `3600`
+          :type: interval: int|float
+          :param: retry_interval: Seconds after which a failed renewal is retried. Default: `60`
+          :type: retry_interval: int|float
+        """
+        self.client = client
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.stopped = threading.Event()
+        self.thread = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def start(self):
+        """ Starts the background thread, unless it is running.
+
+          :return: self
+          :rtype: TokenRefresher
+        """
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name='sfdc_py-token-refresher', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        """ Stops the background thread, waiting for a renewal in progress to complete. """
+        self.stopped.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def refresh(self):
+        """ Renews the session now.
+
+          :return: Whether the session was renewed
+          :rtype: bool
+        """
+        try:
+            renewed = self.client.auth.rotate()
+        except Exception as e:
+            logging.getLogger('sfdc_py').warning('Unable to renew session. Reason: {}'.format(e))
+            renewed = False
+
+        if renewed:
+            self.refreshes += 1
+        else:
+            self.failures += 1
+        return renewed
+
+    def run(self):
+        wait = self.interval
+        while not self.stopped.wait(wait):
+            wait = self.interval if self.refresh() else self.retry_interval
@@ -0,0 +1,190 @@
+"""
+.. module:: reconcile
+   :synopsis: Joins Bulk API 2.0 ingest results back to the rows submitted, through an on-disk index.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import os
+import sqlite3
+import tempfile
+
+KEY_SEPARATOR = '\x1f'
+INSERT_BATCH_SIZE = 10000
+SUCCESS = 'success'
+FAILURE = 'failure'
+UNPROCESSED = 'unprocessed'
+MISSING = 'missing'
+
+
+def get_key(row, key_columns):
+    """
+    Returns the text key of `row`, made of the values of `key_columns` as they appear in CSV.
+
+    :param: row: Row
+    :type: row: dict
+    :param: key_columns: Columns identifying a row
+    :type: key_columns: [string]
+    :return: key
+    :rtype: string
+    """
+    return KEY_SEPARATOR.join('' if row.get(c) is None else str(row.get(c)) for c in key_columns)
+
+
+class ReconciliationIndex(object):
+    """ Records the position and key columns of each row submitted to ingest jobs in a SQLite database on disk, then
+    matches the successful, failed and unprocessed results of the jobs back to those rows.
+
+    Results don't carry the position of the row they stem from, so they are matched on the key columns: each result
+    is assigned to the first row with the same key not matched yet. Choose key columns which identify rows, eg.
+    `['External_Id__c']`, or `['Id']` for updates and deletes. By default every column is used.
+
+    Only keys and outcomes are kept, on disk, so memory use does not grow with the number of rows.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, path=None, key_columns=None):
+        """ Constructor.
+
+          :param: path: Path of the database. Default: a temporary file, deleted on `close()`
+          :type: path: string
+          :param: key_columns: Columns identifying a row. Default: every column
+          :type: key_columns: [string]
+        """
+        self.owns_path = path is None
+        if self.owns_path:
+            (fd, path) = tempfile.mkstemp(prefix='sfdc_py-', suffix='.sqlite3')
+            os.close(fd)
+        self.path = path
+        self.key_columns = list(key_columns) if key_columns is not None else None
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS rows ('
+            'position INTEGER PRIMARY KEY, key TEXT NOT NULL, status TEXT, sf_id TEXT, error TEXT)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS rows_key ON rows (key, status, position)')
+        self.connection.commit()
+        self.count = self.connection.execute('SELECT COUNT(*) FROM rows').fetchone()[0]
+
+    def record(self, rows):
+        """ Passes `rows` through unchanged while recording the key of each one, so that it can wrap the rows being
+        uploaded, eg. `ingest.batches(job_id, index.record(rows))`. Rows are dicts, or lists of values the first of
+        which is the header, as accepted by `jobs.iter_rows()`. Positions continue from previous calls.
+
+          :param: rows: Rows
+          :type: rows: iterable of list|tuple|dict
+          :return: generator of the same rows
+          :rtype: generator
+        """
+        header = None
+        batch = []
+
+        for row in rows:
+            if isinstance(row, dict):
+                record = row
+            elif header is None:
+                header = list(row)
+                yield row
+                continue
+            else:
+                record = dict(zip(header, row))
+
+            if self.key_columns is None:
+                self.key_columns = list(record)
+            batch.append((self.count, get_key(record, self.key_columns)))
+            self.count += 1
+            if len(batch) >= INSERT_BATCH_SIZE:
+                self.insert(batch)
+                batch = []
+            yield row
+
+        self.insert(batch)
+
+    def insert(self, batch):
+        self.connection.executemany('INSERT INTO rows (position, key) VALUES (?, ?)', batch)
+        self.connection.commit()
+
+    def match(self, results, status):
+        """ Assigns `status` to the row matching each of `results`.
+
+          :param: results: Result rows, eg. from `Ingest.results()`
+          :type: results: iterable of dict
+          :param: status: `'success'`, `'failure'` or `'unprocessed'`
+          :type: status: string
+          :return: Number of results which matched no row
+          :rtype: int
+        """
+        unmatched = 0
+        cursor = self.connection.cursor()
+
+        for (i, result) in enumerate(results):
+            cursor.execute(
+                'UPDATE rows SET status = ?, sf_id = ?, error = ? WHERE position = '
+                '(SELECT position FROM rows WHERE key = ? AND status IS NULL ORDER BY position LIMIT 1)',
+                (status, result.get('sf__Id') or None, result.get('sf__Error'), get_key(result, self.key_columns)))
+            unmatched += 1 if cursor.rowcount == 0 else 0
+            if i % INSERT_BATCH_SIZE == INSERT_BATCH_SIZE - 1:
+                self.connection.commit()
+
+        self.connection.commit()
+        return unmatched
+
+    def join(self, ingest, job_id, **kwargs):
+        """ Streams the successful, failed and unprocessed results of a completed job and matches them to the rows
+        recorded.
+
+          :param: ingest: Ingest namespace, eg. `client.jobs.ingest`
+          :type: ingest: jobs.Ingest
+          :param: job_id: Job ID
+          :type: job_id: string
+          :param: **kwargs: kwargs passed on to `Ingest.results()`
+          :type: **kwargs: dict
+          :return: Number of results which matched no row, and the requests made
+          :rtype: (int, [jobs.JobResults])
+        """
+        (unmatched, requests) = (0, [])
+        for (status, flag) in ((SUCCESS, 'successes'), (FAILURE, 'failures'), (UNPROCESSED, 'unprocessed')):
+            k = dict(kwargs)
+            k[flag] = True
+            (rows, job_results) = ingest.results(job_id, **k)
+            unmatched += self.match(rows, status)
+            requests.append(job_results)
+        return unmatched, requests
+
+    def iter_outcomes(self):
+        """ Yields the outcome of every row recorded, in the order submitted. Rows matched by no result have the
+        `'missing'` status.
+
+          :return: A generator of dicts with `position`, `key` (dict of key columns), `status`, `id` and `error`
+          :rtype: generator
+        """
+        cursor = self.connection.execute('SELECT position, key, status, sf_id, error FROM rows ORDER BY position')
+        for (position, key, status, sf_id, error) in cursor:
+            yield {
+                'position': position,
+                'key': dict(zip(self.key_columns, key.split(KEY_SEPARATOR))),
+                'status': status or MISSING,
+                'id': sf_id,
+                'error': error}
+
+    def get_counts(self):
+        """ Returns the number of rows per status.
+
+          :return: counts, eg. `{'success': 980, 'failure': 20}`
+          :rtype: dict
+        """
+        cursor = self.connection.execute('SELECT status, COUNT(*) FROM rows GROUP BY status')
+        return {(status or MISSING): count for (status, count) in cursor}
+
+    def close(self):
+        """ Closes the database, deleting it if it is a temporary file. """
+        self.connection.close()
+        if self.owns_path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,185 @@
+"""
+.. module:: records
+   :synopsis: A compact, read-only representation of query result records.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class RecordSchema(object):
+    """ Field names and attributes shared by every record of the same type with the same fields.
+
+        .. versionadded:: 2.3.0
+    """
+    __slots__ = ('sobject_type', 'fields', 'index', 'url_prefix')
+
+    def __init__(self, sobject_type, fields, url_prefix):
+        """ Constructor.
+
+          :param: sobject_type: Type of the records, eg. `'Account'`
+          :type: sobject_type: string
+          :param: fields: Field names, in the order returned
+          :type: fields: tuple
+          :param: url_prefix: `attributes.url` of the records without their ID, eg. `'/services/data/v45.0/sobjects/'`
+          :type: url_prefix: string|None
+        """
+        self.sobject_type = sobject_type
+        self.fields = fields
+        self.index = {field: i for (i, field) in enumerate(fields)}
+        self.url_prefix = url_prefix
+
+
+class SchemaCache(dict):
+    """ Hands out one `RecordSchema` per record type, field names and URL prefix, so that records share them.
+
+        .. versionadded:: 2.3.0
+    """
+    def get_schema(self, sobject_type, fields, url_prefix):
+        """ Returns the schema for the type, field names and URL prefix given, building it on first use.
+
+          :param: sobject_type: Type of the records
+          :type: sobject_type: string
+          :param: fields: Field names
+          :type: fields: tuple
+          :param: url_prefix: URL prefix of the records
+          :type: url_prefix: string|None
+          :return: schema
+          :rtype: RecordSchema
+        """
+        key = (sobject_type, fields, url_prefix)
+        schema = self.get(key)
+        if schema is None:
+            schema = self[key] = RecordSchema(sobject_type, fields, url_prefix)
+        return schema
+
+
+class Record(Mapping):
+    """ A read-only query result record which stores its values in a tuple and its field names in a shared
+    `RecordSchema`. It behaves like the dict it replaces: `record['Name']`, `record.get('Name')`, `record.keys()` and
+    `record['attributes']` all work, and it compares equal to that dict. `attributes` is rebuilt on access, from the
+    schema and the record's `Id`.
+
+        .. versionadded:: 2.3.0
+    """
+    __slots__ = ('_schema', '_values', '_url')
+
+    def __init__(self, schema, values, url=None):
+        """ Constructor.
+
+          :param: schema: Schema shared by records of the same shape
+          :type: schema: RecordSchema
+          :param: values: Field values, in the order of `schema.fields`
+          :type: values: tuple
+          :param: url: `attributes.url`, only when it can't be derived from the schema and the record's `Id`
+          :type: url: string|None
+        """
+        self._schema = schema
+        self._values = values
+        self._url = url
+
+    @property
+    def attributes(self):
+        """ The `attributes` dict of the record, eg. `{'type': 'Account', 'url': '/services/data/v45.0/...'}` """
+        attributes = {'type': self._schema.sobject_type}
+        if self._url is not None:
+            attributes['url'] = self._url
+        elif self._schema.url_prefix is not None:
+            attributes['url'] = self._schema.url_prefix + self._values[self._schema.index['Id']]
+        return attributes
+
+    def __getitem__(self, key):
+        if key == 'attributes':
+            return self.attributes
+        return self._values[self._schema.index[key]]
+
+    def __iter__(self):
+        yield 'attributes'
+        for field in self._schema.fields:
+            yield field
+
+    def __len__(self):
+        return len(self._schema.fields) + 1
+
+    def __repr__(self):
+        return 'Record(%s)' % ', '.join('%s=%r' % (f, v) for (f, v) in zip(self._schema.fields, self._values))
+
+    def to_dict(self):
+        """ Returns the record as a plain dict, converting related records and subquery results too.
+
+          :return: record
+          :rtype: dict
+        """
+        record = {'attributes': self.attributes}
+        for (field, value) in zip(self._schema.fields, self._values):
+            record[field] = to_dict(value)
+        return record
+
+
+def compact(value, cache):
+    """
+    Returns `value` with every record it holds converted to a `Record`, related records and subquery results included.
+
+    :param: value: Field value or record, as deserialised from JSON
+    :type: value: any
+    :param: cache: Schemas to share between records
+    :type: cache: SchemaCache
+    :return: value
+    :rtype: any
+    """
+    if not isinstance(value, dict):
+        return value
+    elif isinstance(value.get('records'), list):
+        return dict(value, records=[compact(r, cache) for r in value['records']])
+
+    attributes = value.get('attributes')
+    if not isinstance(attributes, dict):
+        return value
+
+    fields = tuple(k for k in value if k != 'attributes')
+    values = tuple(compact(value[k], cache) for k in fields)
+    (url, url_prefix) = (attributes.get('url'), None)
+    record_id = value.get('Id')
+
+    if url is not None and isinstance(record_id, str) and url.endswith('/' + record_id):
+        (url, url_prefix) = (None, url[:-len(record_id)])
+
+    return Record(cache.get_schema(attributes.get('type'), fields, url_prefix), values, url)
+
+
+def compact_page(page, cache):
+    """
+    Converts the records of a query result page to `Record` objects, in place.
+
+    :param: page: Query result page
+    :type: page: dict
+    :param: cache: Schemas to share between records
+    :type: cache: SchemaCache
+    :return: page
+    :rtype: dict
+    """
+    if isinstance(page, dict) and isinstance(page.get('records'), list):
+        page['records'] = [compact(r, cache) for r in page['records']]
+    return page
+
+
+def to_dict(value):
+    """
+    Returns `value` with every `Record` it holds converted back to a plain dict.
+
+    :param: value: Field value, record or page
+    :type: value: any
+    :return: value
+    :rtype: any
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    elif isinstance(value, dict) and isinstance(value.get('records'), list):
+        return dict(value, records=[to_dict(r) for r in value['records']])
+    return value
@@ -0,0 +1,260 @@
+"""
+.. module:: retry
+   :synopsis: Retries with backoff of requests failing on transient Salesforce and network errors.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import contextlib
+import email.utils
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    from urllib3.exceptions import NewConnectionError
+except ImportError:
+    NewConnectionError = None
+
+DEFAULT_RETRIES = 3
+DEFAULT_NON_IDEMPOTENT_RETRIES = 0
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 30
+DEFAULT_RETRY_DEADLINE = 60
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+RETRY_STATUSES = frozenset((502, 503, 504))
+RETRY_ERRORS = ('UNABLE_TO_LOCK_ROW', 'SERVER_UNAVAILABLE')
+ID_SEGMENT = re.compile(r'^(?=[a-zA-Z]*\d)[a-zA-Z0-9]{15}(?:[a-zA-Z0-9]{3})?$')
+THREAD_STATE = threading.local()
+
+
+def get_endpoint(method, url):
+    """
+    Returns the endpoint under which retries of a request are counted: its method and path, with record IDs replaced
+    by `{id}`, eg. `'PATCH /services/data/v45.0/sobjects/Account/{id}'`.
+
+    :param: method: HTTP method
+    :type: method: string
+    :param: url: URL
+    :type: url: string
+    :return: endpoint
+    :rtype: string
+    """
+    segments = urlsplit(url).path.split('/')
+    return '%s %s' % (method, '/'.join(ID_SEGMENT.sub('{id}', s) for s in segments))
+
+
+@contextlib.contextmanager
+def disabled():
+    """
+    Disables the retries of `RetryAdapter` for the requests sent by the current thread within the block, eg. by
+    callers which retry throttled requests themselves.
+    """
+    previous = getattr(THREAD_STATE, 'disabled', False)
+    THREAD_STATE.disabled = True
+    try:
+        yield
+    finally:
+        THREAD_STATE.disabled = previous
+
+
+def get_retry_policy(retry=None):
+    """
+    Returns the retry policy selected by the `retry` kwarg of a client.
+
+    :param: retry: A policy, `True` for the default policy, or `False` or `None` for none
+    :type: retry: RetryPolicy|bool|None
+    :return: policy
+    :rtype: RetryPolicy|None
+    """
+    if retry is True:
+        return RetryPolicy()
+    elif retry is None or retry is False:
+        return None
+    return retry
+
+
+class RetryPolicy(object):
+    """ Decides which failed requests are sent again and when, and counts retries per endpoint.
+
+    Connection errors, timeouts, `502`, `503` and `504` responses, and error responses carrying one of `error_codes`,
+    eg. `UNABLE_TO_LOCK_ROW`, are retried with exponential backoff and full jitter, or after the delay of their
+    `Retry-After` header. Idempotent methods are retried up to `retries` times. `POST` and `PATCH` are retried up to
+    `non_idempotent_retries` times, and only if they can't have been applied: on a connection that couldn't be
+    established, or a response rejecting them. No retry starts past `deadline` seconds after the first attempt.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, retries=DEFAULT_RETRIES, non_idempotent_retries=DEFAULT_NON_IDEMPOTENT_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR, max_backoff=DEFAULT_MAX_BACKOFF,
+                 deadline=DEFAULT_RETRY_DEADLINE, statuses=RETRY_STATUSES, error_codes=RETRY_ERRORS):
+        """ Constructor.
+
+          :param: retries: Retries of `GET`, `HEAD`, `OPTIONS`, `PUT` and `DELETE` requests. Default: `3`
+          :type: retries: int
+          :param: non_idempotent_retries: Retries of `POST` and `PATCH` requests. Default: `0`
+          :type: non_idempotent_retries: int
+          :param: backoff_factor: Upper bound in seconds of the first backoff, doubled for every retry. Default: `0.5`
+          :type: backoff_factor: float
+          :param: max_backoff: Upper bound in seconds of any backoff. Default: `30`
+          :type: max_backoff: float
+          :param: deadline: Seconds after the first attempt past which no retry starts. Default: `60`
+          :type: deadline: float
+          :param: statuses: Status codes retried. Default: `502`, `503` and `504`
+          :type: statuses: iterable of int
+          :param: error_codes: Salesforce error codes retried. Default: `UNABLE_TO_LOCK_ROW` and `SERVER_UNAVAILABLE`
+          :type: error_codes: iterable of string
+        """
+        self.retries = retries
+        self.non_idempotent_retries = non_idempotent_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.error_codes = tuple(e.encode('utf-8') for e in error_codes)
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def get_budget(self, method, replayable=True):
+        """ Returns the number of retries allowed for a request.
+
+          :param: method: HTTP method
+          :type: method: string
+          :param: replayable: Whether the body can be sent again, ie. isn't streamed
+          :type: replayable: bool
+          :return: retries
+          :rtype: int
+        """
+        if not replayable:
+            return 0
+        return self.retries if method in IDEMPOTENT_METHODS else self.non_idempotent_retries
+
+    def is_retryable_response(self, status, content):
+        """ Returns whether a response rejected its request for a transient reason.
+
+          :param: status: Status code
+          :type: status: int
+          :param: content: Body
+          :type: content: bytes
+          :return: whether to retry
+          :rtype: bool
+        """
+        if status in self.statuses:
+            return True
+        return status >= 400 and any(e in (content or b'') for e in self.error_codes)
+
+    def is_retryable_error(self, method, connected):
+        """ Returns whether a request failing with a connection error or timeout can be retried.
+
+          :param: method: HTTP method
+          :type: method: string
+          :param: connected: Whether the connection was established, so that the request may have been applied
+          :type: connected: bool
+          :return: whether to retry
+          :rtype: bool
+        """
+        return method in IDEMPOTENT_METHODS or not connected
+
+    def get_retry_after(self, headers):
+        """ Returns the delay in seconds requested by the `Retry-After` header in `headers`, or `None`. """
+        value = (headers or {}).get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get_backoff(self, attempt, headers=None):
+        """ Returns the delay in seconds before retry number `attempt`, starting at `0`: the `Retry-After` delay if
+        any, or else a random delay up to `backoff_factor * 2 ** attempt`, capped by `max_backoff`.
+        """
+        retry_after = self.get_retry_after(headers)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def record(self, endpoint, wait):
+        """ Counts a retry of `endpoint`, after waiting `wait` seconds. """
+        with self.lock:
+            stats = self.stats.setdefault(endpoint, {'retries': 0, 'wait': 0.0})
+            stats['retries'] += 1
+            stats['wait'] += wait
+
+    def get_stats(self):
+        """ Returns the retries and the seconds waited before them, per endpoint.
+
+          :return: stats, eg. `{'GET /services/data/v45.0/query/': {'retries': 2, 'wait': 0.8}}`
+          :rtype: dict
+        """
+        with self.lock:
+            return {endpoint: dict(stats) for (endpoint, stats) in self.stats.items()}
+
+
+class RetryAdapter(requests.adapters.HTTPAdapter):
+    """ A transport adapter which sends requests again according to a `RetryPolicy`. Mounted on the session built by
+    a client, it applies to every request the client sends, whatever its request class, except within `disabled()`.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, policy, **kwargs):
+        """ Constructor.
+
+          :param: policy: Retry policy
+          :type: policy: RetryPolicy
+          :param: **kwargs: kwargs of `requests.adapters.HTTPAdapter`
+          :type: **kwargs: dict
+        """
+        self.policy = policy
+        super(RetryAdapter, self).__init__(**kwargs)
+
+    def is_connected(self, error):
+        """ Returns whether the connection of a request failing with `error` was established. """
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return False
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return NewConnectionError is None or not isinstance(reason, NewConnectionError)
+
+    def send(self, request, **kwargs):
+        policy = self.policy
+        budget = 0 if getattr(THREAD_STATE, 'disabled', False) else policy.get_budget(
+            request.method, request.body is None or isinstance(request.body, (str, bytes)))
+        deadline = time.time() + policy.deadline
+        attempt = 0
+
+        while True:
+            (response, error) = (None, None)
+            try:
+                response = super(RetryAdapter, self).send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            if attempt >= budget:
+                retryable = False
+            elif error is not None:
+                retryable = policy.is_retryable_error(request.method, self.is_connected(error))
+            else:
+                retryable = response.status_code >= 400 and policy.is_retryable_response(
+                    response.status_code, response.content)
+
+            wait = policy.get_backoff(attempt, None if response is None else response.headers) if retryable else 0
+            if not retryable or time.time() + wait > deadline:
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            policy.record(get_endpoint(request.method, request.url), wait)
+            time.sleep(wait)
+            attempt += 1
@@ -9,12 +9,23 @@
 from __future__ import absolute_import
 
 from . import chatter
+from . import codec
+from . import columns
 from . import commons
+from . import composite
 from . import device_flow
 from . import einstein
 from . import jobs
+from . import jsonstream
+from . import oauth
+from . import records
+from . import retry
+from . import soql
+from . import tokens
 from . import wave
 
+import concurrent.futures
+import functools
 import json
 import logging
 import re
@@ -34,6 +45,11 @@ QUERY_SERVICE = '/services/data/v%s/query/?%s'
 SEARCH_SERVICE = '/services/data/v%s/search/?%s'
 TOOLING_ANONYMOUS = '/services/data/v%s/tooling/executeAnonymous/?%s'
 APPROVAL_SERVICE = '/services/data/v%s/process/approvals/'
+PARALLEL_CHUNK_FIELDS = ('Id', 'CreatedDate', 'SystemModstamp')
+DEFAULT_PARALLEL_CHUNKS = 4
+DEFAULT_PARALLEL_WORKERS = 4
+DEFAULT_CHUNK_RETRIES = 2
+VERSION_DISCOVERY = concurrent.futures.ThreadPoolExecutor(max_workers=4)
 
 INSERT_BINARY_BODY_TEMPLATE = """--boundary_string
 Content-Disposition: form-data; name="entity_%s";
@@ -110,6 +126,40 @@ class Client(object):
                    SFDC API version to use e.g. '39.0'
                 * *org_id* (`string`) --
                    Organisation ID (required if logging in via SOAP endpoint)
+                * *session* (`requests.Session`) --
+                   Session to send every request through. If not provided, the client builds a pooled keep-alive
+                   session with `commons.new_session` using the pool kwargs below.
+                * *pool_connections* (`int`) --
+                   Number of per-host connection pools to keep. Default: `10`
+                * *pool_maxsize* (`int`) --
+                   Maximum number of connections kept alive per host. Default: `10`
+                * *max_retries* (`int|urllib3.util.Retry`) --
+                   Retry configuration mounted on the session's transport adapter. Default: `0`
+                * *codec* (`string|codec.JsonCodec`) --
+                   JSON codec with which every request and response body is encoded and decoded: `'orjson'`,
+                   `'simdjson'`, `'json'` or a codec object. Default: `'auto'`, the fastest backend installed
+                * *describe_cache* (`cache.DescribeCache`) --
+                   Cache through which `describe()` and `describe_global()` results are returned and revalidated.
+                   Default: `None`, every call is sent
+                * *record_cache* (`cache.RecordCache`) --
+                   Cache through which records queried by ID with `sobjects().query()` are returned, and which writes
+                   through the client invalidate. Default: `None`, every query is sent
+                * *version_cache* (`cache.VersionCache`) --
+                   Cache of the latest API version of each instance, consulted on login when `version` isn't set.
+                   Default: `None`, the version is discovered on every login
+                * *token_store* (`tokens.TokenStore`) --
+                   Store of session tokens, keyed by login URL, username and client ID. `login()` and
+                   `login_via_soap()` resume a stored session without any request unless called with `refresh=True`,
+                   and store new ones. Default: `None`, every login is sent
+                * *reauth* (`bool`) --
+                   Whether to log in again once, for every thread, when a request fails with `INVALID_SESSION_ID`, and
+                   replay the failed request if it is idempotent. Only applies to the session built by the client; set
+                   `session.auth = client.auth` to apply it to your own. Default: `True`
+                * *retry* (`bool|retry.RetryPolicy`) --
+                   Policy with which requests failing with a connection error, timeout, `502`, `503`, `504`,
+                   `UNABLE_TO_LOCK_ROW` or `SERVER_UNAVAILABLE` are sent again, with backoff. `True` selects a default
+                   `retry.RetryPolicy`. Only applies to the session built by the client; mount a `retry.RetryAdapter`
+                   on your own. Default: `False`, no retries
         """
 
         self.username = args[0]
@@ -124,9 +174,20 @@ class Client(object):
         self.logger.setLevel(logging.FATAL)
         self.logger.addHandler(logging.StreamHandler())
         self.client_api_version = None
+        self.owns_session = 'session' not in kwargs
+        self.retry_policy = kwargs['retry'] = retry.get_retry_policy(kwargs.get('retry'))
+        self.session = kwargs['session'] if not self.owns_session else commons.new_session(**kwargs)
+        kwargs['session'] = self.session
+        self.codec = kwargs['codec'] = codec.get_codec(kwargs.get('codec'))
         self.client_kwargs = kwargs
         self.session_id = None
+        self.relogin = None
+        self.token_refresher = None
+        self.auth = commons.SessionAuth(self)
+        if self.owns_session and kwargs.get('reauth', True):
+            self.session.auth = self.auth
         self.chatter = chatter.Chatter(self)
+        self.composite = composite.Composite(self)
         self.jobs = jobs.Jobs(self)
         self.wave = wave.Wave(self)
         self.einstein = einstein.Einstein(self)
@@ -160,15 +221,113 @@ class Client(object):
             self.client_secret,
             **kwargs
         )
+        return self.send_login(login_response, self.login, kwargs)
+
+    @commons.kwarg_adder
+    def login_via_refresh_token(self, refresh_token, **kwargs):
+        """ Performs a login request with a refresh token obtained earlier, eg. through the web server or device flow.
+        If Salesforce rotates the refresh token, the new one is used to log in again.
+
+        .. versionadded:: 2.3.0
+
+          :param: refresh_token: Refresh token
+          :type: refresh_token: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Login response
+          :rtype: (dict, oauth.RefreshTokenRequest)
+        """
+        login_response = oauth.RefreshTokenRequest(self.client_id, self.client_secret, refresh_token, **kwargs)
+        (req, login_response) = self.send_login(
+            login_response, functools.partial(self.login_via_refresh_token, refresh_token), kwargs)
+
+        if isinstance(req, dict) and req.get('refresh_token') not in (None, refresh_token):
+            self.relogin = functools.partial(self.login_via_refresh_token, req['refresh_token'])
+        return req, login_response
+
+    @commons.kwarg_adder
+    def login_via_jwt(self, private_key=None, **kwargs):
+        """ Performs a login request through the JWT bearer flow, with an assertion signed by the private key of the
+        connected app's certificate, for the client's username. Requires PyJWT to sign assertions.
+
+        .. versionadded:: 2.3.0
+
+          :param: private_key: PEM encoded private key
+          :type: private_key: string|bytes
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *assertion* (`string|callable`) --
+                Assertion signed elsewhere, eg. by a key management service, in place of `private_key`, or a callable
+                returning a new one, with which the session can also be renewed.
+          :return: Login response
+          :rtype: (dict, oauth.JwtBearerRequest)
+        """
+        assertion = kwargs.get('assertion')
+        if assertion is None:
+            assertion = oauth.get_jwt_assertion(
+                self.client_id, self.username, private_key, kwargs.get('login_url', 'login.salesforce.com'))
+        elif callable(assertion):
+            assertion = assertion()
+
+        login_response = oauth.JwtBearerRequest(assertion, **{k: v for (k, v) in kwargs.items() if k != 'assertion'})
+        relogin = functools.partial(self.login_via_jwt, private_key, assertion=kwargs.get('assertion'))
+        return self.send_login(login_response, relogin, kwargs)
+
+    def send_login(self, login_response, relogin, kwargs):
+        """ Sends an OAuth login request, unless the `token_store` kwarg holds a session to resume, and sets the
+        client's session accordingly.
+
+        .. versionadded:: 2.3.0
+
+          :param: login_response: Login request
+          :type: login_response: commons.OAuthRequest
+          :param: relogin: Login method with which to log in again, called with `refresh=True`
+          :type: relogin: callable
+          :param: kwargs: kwargs
+          :type: kwargs: dict
+          :return: Login response
+          :rtype: (dict, commons.OAuthRequest)
+        """
+        token = self.load_token(kwargs)
+        if token is not None:
+            login_response.session_id = self.session_id
+            login_response.instance_url = self.instance_url
+            login_response.from_cache = True
+            self.relogin = relogin
+            return tokens.get_token_response(token), login_response
+
         req = login_response.request()
+        login_response.from_cache = False
 
         if req is not None:
             self.session_id = login_response.get_session_id()
             self.set_instance_url(req.get('instance_url', str()))
             self.set_api_version()
+            self.save_token()
+            self.relogin = relogin
 
         return req, login_response
-    
+
+    def start_token_refresher(
+            self, interval=oauth.DEFAULT_REFRESH_INTERVAL, retry_interval=oauth.DEFAULT_RETRY_INTERVAL):
+        """ Starts renewing the client's session in a background thread every `interval` seconds, so that request
+        threads never wait for a login. The refresher is stopped by `close()`.
+
+        .. versionadded:: 2.3.0
+
+          :param: interval: Seconds between renewals, below the session timeout of the org. Default: `3600`
+          :type: interval: int|float
+          :param: retry_interval: Seconds after which a failed renewal is retried. Default: `60`
+          :type: retry_interval: int|float
+          :return: refresher
+          :rtype: oauth.TokenRefresher
+        """
+        if self.token_refresher is not None:
+            self.token_refresher.stop()
+        self.token_refresher = oauth.TokenRefresher(self, interval, retry_interval).start()
+        return self.token_refresher
+
     @commons.kwarg_adder
     def login_via_soap(self, **kwargs):
         """ Performs a clientless login request using the Soap API.
@@ -183,13 +342,23 @@ class Client(object):
             self.password,
             **kwargs
         )
+        token = self.load_token(kwargs)
+        if token is not None:
+            login_response.session_id = self.session_id
+            login_response.instance_url = self.instance_url
+            login_response.from_cache = True
+            self.relogin = self.login_via_soap
+            return tokens.get_token_response(token), login_response
 
         req = login_response.request()
+        login_response.from_cache = False
 
         if login_response.status == 200:
             self.session_id = login_response.session_id
             self.instance_url = login_response.instance_url
             self.set_api_version()
+            self.save_token()
+            self.relogin = self.login_via_soap
 
         return req, login_response
 
@@ -246,25 +415,127 @@ class Client(object):
 
             return self
 
+    def get_token_key(self):
+        """
+        Returns the key under which the client's session token is stored in the `token_store` kwarg.
+
+        .. versionadded:: 2.3.0
+
+        :return: key
+        :rtype: string
+        """
+        return tokens.get_token_key(self.client_kwargs.get('login_url'), self.username, self.client_id)
+
+    def load_token(self, kwargs):
+        """
+        Resumes the session stored in the `token_store` kwarg, if any and unless the `refresh` kwarg is set, setting
+        the session ID, instance URL and, unless pinned, the API version of the client.
+
+        .. versionadded:: 2.3.0
+
+        :param: kwargs: kwargs
+        :type: kwargs: dict
+        :return: token
+        :rtype: dict|None
+        """
+        token_store = kwargs.get('token_store')
+        if token_store is None or kwargs.get('refresh', False):
+            return None
+
+        token = token_store.get(self.get_token_key())
+        if token is None:
+            return None
+
+        self.session_id = token['session_id']
+        self.instance_url = token['instance_url']
+        if 'version' not in self.client_kwargs and token.get('version') is not None:
+            self.client_kwargs['version'] = token['version']
+        self.set_api_version()
+        return token
+
+    def save_token(self):
+        """
+        Stores the client's session in the `token_store` kwarg, if any, once its API version is known.
+
+        .. versionadded:: 2.3.0
+        """
+        token_store = self.client_kwargs.get('token_store')
+        if token_store is None:
+            return
+
+        key = self.get_token_key()
+        token = tokens.new_token(self.session_id, self.instance_url)
+        version = self.client_kwargs.get('version')
+
+        def put(future):
+            if future.exception() is None:
+                token['version'] = future.result()
+                token_store.put(key, token)
+
+        if isinstance(version, concurrent.futures.Future):
+            version.add_done_callback(put)
+        else:
+            token['version'] = version
+            token_store.put(key, token)
+
+    def delete_token(self):
+        """
+        Removes the client's session from the `token_store` kwarg, if any.
+
+        .. versionadded:: 2.3.0
+        """
+        token_store = self.client_kwargs.get('token_store')
+        if token_store is not None:
+            token_store.delete(self.get_token_key())
+
     @commons.kwarg_adder
     def set_api_version(self, **kwargs):
         """
         Sets the api version to be used by the client. If not provided, it will get the latest version
         available
 
+        The latest version is taken from the `version_cache` kwarg if it holds the instance's. Otherwise it is
+        discovered in the background, so that the login returns at once, and the first call needing it waits for it.
+
         :return: set version kwarg on client if not defined
         """
         # If 'version' was already in the client kwargs, then 'commons.kwarg_adder' decorator will take care of
         # passing it around between functions. Therefore, an else statement is not needed here.
         if 'version' not in self.client_kwargs:
-            service = 'https://' + self.instance_url + VERSIONS_SERVICE
-            headers = {'Content-Type': 'application/json'}
-            r = requests.get(service, headers=headers, proxies=self.proxies)
-            if r.status_code == 200:
-                self.client_kwargs.update({'version': max(i['version'] for i in r.json())})
-            else:
-                # return a known recent api version
-                self.client_kwargs.update({'version': DEFAULT_API_VERSION})
+            version_cache = self.client_kwargs.get('version_cache')
+            version = None if version_cache is None else version_cache.get(self.instance_url)
+            if version is None:
+                version = VERSION_DISCOVERY.submit(self.get_api_version, self.instance_url, version_cache)
+            self.client_kwargs.update({'version': version})
+
+    def get_api_version(self, instance_url, version_cache=None):
+        """
+        Returns the latest api version available on `instance_url`, storing it in `version_cache` if provided.
+
+        .. versionadded:: 2.3.0
+
+        :param: instance_url: Instance URL (eg. `'eu11.salesforce.com'`)
+        :type: instance_url: string
+        :param: version_cache: Cache of API versions
+        :type: version_cache: cache.VersionCache
+        :return: api version, or a known recent one if it can't be discovered
+        :rtype: string
+        """
+        service = 'https://' + instance_url + VERSIONS_SERVICE
+        headers = {'Content-Type': 'application/json'}
+        try:
+            r = self.session.get(service, headers=headers, proxies=self.proxies)
+        except requests.exceptions.RequestException as e:
+            self.logger.error('Unable to discover the API version of %s: %s' % (instance_url, e))
+            return DEFAULT_API_VERSION
+        if r.status_code != 200:
+            # return a known recent api version
+            return DEFAULT_API_VERSION
+
+        version = max(i['version'] for i in self.codec.loads(r.content))
+        if version_cache is not None:
+            version_cache.put(instance_url, version)
+        return version
 
     @commons.kwarg_adder
     def logout(self, **kwargs):
@@ -278,6 +549,7 @@ class Client(object):
 
         logout_response = Logout(self.session_id, self.instance_url, **kwargs)
         req = logout_response.request()
+        self.delete_token()
         return req, logout_response
 
     @commons.kwarg_adder
@@ -312,6 +584,103 @@ class Client(object):
         req = qm.request()
         return req, qm
 
+    @commons.kwarg_adder
+    def query_iter(self, qs, pages=False, **kwargs):
+        """ Performs a query more request lazily: each `nextRecordsUrl` is only requested once the previous batch has
+        been consumed, so memory use is independent of the size of the result set.
+
+        With the `prefetch` kwarg, the following batches are instead requested in a background thread while the
+        current one is consumed, keeping at most `prefetch` batches buffered.
+
+        If a request fails, iteration stops and the exception can be found in the `exceptions` of the `QueryMore`
+        returned.
+
+        .. versionadded:: 2.3.0
+
+          :param: qs: Query string. eg `'SELECT Id FROM Lead'`
+          :type: qs: string
+          :param: pages: Yield whole batches rather than records. Default: `False`
+          :type: pages: bool
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *prefetch* (`int`) --
+                Number of batches to request ahead of the consumer. Default: `0`
+            * *stream* (`bool`) --
+                Parse each batch incrementally as it arrives, yielding records before the batch is complete. Can be
+                combined with `fields`, see `QueryMore`, but not with `pages` or `prefetch`. Default: `False`
+          :return: Records, or batches, generator
+          :rtype: (generator, QueryMore)
+        """
+
+        qm = QueryMore(self.session_id, self.instance_url, qs, **kwargs)
+        if kwargs.get('stream', False):
+            return qm.iter_records(), qm
+        batches = qm.iter_pages()
+        if kwargs.get('prefetch', 0) > 0:
+            batches = commons.prefetch(batches, kwargs['prefetch'])
+        if pages:
+            return batches, qm
+        return (record for batch in batches for record in batch.get('records', [])), qm
+
+    @commons.kwarg_adder
+    def query_parallel(self, qs, stream=False, **kwargs):
+        """ Splits a query into disjoint slices by `Id`, `CreatedDate` or `SystemModstamp` ranges and queries the slices
+        concurrently. See `ParallelQuery` for the supported kwargs.
+
+        Keep `max_workers` within the org's concurrent request limits and the session's `pool_maxsize`.
+
+        .. versionadded:: 2.3.0
+
+          :param: qs: Query string, without `GROUP BY`, `LIMIT` or `OFFSET` clauses
+          :type: qs: string
+          :param: stream: Yield records as each slice completes rather than returning them all. Default: `False`
+          :type: stream: bool
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Records, merged in slice order, or a generator of records
+          :rtype: ([dict], ParallelQuery)|(generator, ParallelQuery)
+        """
+
+        pq = ParallelQuery(self.session_id, self.instance_url, qs, **kwargs)
+        if stream:
+            return pq.iter_records(), pq
+        req = pq.request()
+        return req, pq
+
+    @commons.kwarg_adder
+    def query_columns(self, qs, types=None, **kwargs):
+        """ Performs a query more request, appending the records of each batch to a `columns.ColumnTable` as it
+        arrives, so that results are held as one typed column per field rather than one dict per record. Relationship
+        fields are flattened into dotted names, eg. `Account.Owner.Name`.
+
+        If a request fails, the table holds the records of the batches received so far and the exception can be found
+        in the `exceptions` of the `QueryMore` returned.
+
+        .. versionadded:: 2.3.0
+
+          :param: qs: Query string. eg `'SELECT Id, Amount, CloseDate FROM Opportunity'`
+          :type: qs: string
+          :param: types: Kind of each column by name, eg. `{'Amount': 'double'}`. Default: inferred from the values
+          :type: types: dict
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *prefetch* (`int`) --
+                Number of batches to request ahead of the one being appended. Default: `0`
+          :return: Column table
+          :rtype: (columns.ColumnTable, QueryMore)
+        """
+
+        qm = QueryMore(self.session_id, self.instance_url, qs, **kwargs)
+        batches = qm.iter_pages()
+        if kwargs.get('prefetch', 0) > 0:
+            batches = commons.prefetch(batches, kwargs['prefetch'])
+        table = columns.ColumnTable(types)
+        for batch in batches:
+            table.add_records(batch.get('records', []))
+        return table, qm
+
     @commons.kwarg_adder
     def sobjects(self, **kwargs):
         """ Prepares an SObject controller with which make various API requests.
@@ -345,6 +714,24 @@ class Client(object):
         req = s.request()
         return req, s
 
+    @commons.kwarg_adder
+    def search_iter(self, ss, **kwargs):
+        """ Performs a search request, streaming the response so that each record is yielded as soon as it has been
+        received and parsed. See `Search` for the supported kwargs.
+
+        .. versionadded:: 2.3.0
+
+          :param: ss: Search string. eg `'FIND {sfdc_py} RETURNING Account(Id, Name) LIMIT 5'`
+          :type: ss: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Records generator
+          :rtype: (generator, Search)
+        """
+
+        s = Search(self.session_id, self.instance_url, ss, **kwargs)
+        return s.iter_records(), s
+
     @commons.kwarg_adder
     def execute_anonymous(self, ab, **kwargs):
         """ Performs an anonymous Apex execution request.
@@ -431,6 +818,18 @@ class Client(object):
         level = kwargs.get('level', logging.INFO)
         logger.setLevel(level)
 
+    def close(self):
+        """
+        Closes the pooled connections held by the client's session, and stops its token refresher if any. Sessions
+        passed in through the `session` kwarg are left open for their owner to close.
+
+        .. versionadded:: 2.3.0
+        """
+        if self.token_refresher is not None:
+            self.token_refresher.stop()
+        if self.owns_session:
+            self.session.close()
+
     def __enter__(self):
         """
         Invoked on entry to this class, handle login automatically for context managers
@@ -454,6 +853,8 @@ class Client(object):
         except Exception as e:
             self.logger.warning('Unable to logout. Reason: {}'.format(e.args[0]))
             self.logger.info('__exit__ params: (%s, %s, %s)' % (_type, value, traceback))
+        finally:
+            self.close()
 
 
 class ExecuteAnonymous(commons.BaseRequest):
@@ -540,18 +941,19 @@ class Login(commons.OAuthRequest):
             'password': self.password
         }
 
-    def request(self):
+    def parse_response(self, request_object):
         """ Gets the result of `super` for this method, then assigns the `access_token` to `session_id`.
         Returns request response.
 
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
           :return: Response dict
           :rtype: dict
         """
-        response = super(Login, self).request()
-        if response is not None:
-            if 'access_token' in response:
-                self.session_id = response['access_token']
-            return response
+        response = super(Login, self).parse_response(request_object)
+        if 'access_token' in response:
+            self.session_id = response['access_token']
+        return response
 
     def get_session_id(self):
         """ Returns the session ID obtained if the login request was successful
@@ -609,14 +1011,33 @@ class Query(commons.BaseRequest):
           :type: query_string: string
           :param: **kwargs: kwargs
           :type: **kwargs: dict
+          :Keyword Arguments:
+            * *compact* (`bool`) --
+                Return records as compact `records.Record` objects rather than dicts. Default: `False`
         """
         super(Query, self).__init__(session_id, instance_url, **kwargs)
         qry = urlencode({'q': query_string.encode('utf-8')})
         self.service = QUERY_SERVICE % (self.api_version, qry)
+        self.compact = kwargs.get('compact', False)
+        schemas = kwargs.get('schemas')
+        self.schemas = records.SchemaCache() if schemas is None else schemas
+
+    def parse_response(self, request_object):
+        """ Returns the deserialised query result, with compact records if `compact` is set.
+
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
+          :return: response
+          :rtype: dict
+        """
+        response = super(Query, self).parse_response(request_object)
+        if self.compact:
+            records.compact_page(response, self.schemas)
+        return response
 
 
 class QueryMore(commons.BaseRequest):
-    """ Performs recursive requests to `'/services/data/vX.XX/query/'` when there are multiple batches to process.
+    """ Performs successive requests to `'/services/data/vX.XX/query/'` when there are multiple batches to process.
 
         .. versionadded:: 1.0.0
     """
@@ -631,61 +1052,284 @@ class QueryMore(commons.BaseRequest):
           :type: query_string: string
           :param: **kwargs: kwargs
           :type: **kwargs: dict
+          :Keyword Arguments:
+            * *compact* (`bool`) --
+                Return records as compact `records.Record` objects rather than dicts, sharing their schemas across
+                batches. Default: `False`
+            * *fields* (`[string]`) --
+                With `iter_records()`, names of the fields to keep in each record, the others being skipped while
+                parsing. Default: every field
+            * *chunk_size* (`int`) --
+                With `iter_records()`, size in bytes of the chunks read from the network. Default: `65536`
         """
         super(QueryMore, self).__init__(session_id, instance_url, **kwargs)
         self.query_string = query_string
+        self.compact = kwargs.get('compact', False)
+        schemas = kwargs.get('schemas')
+        self.schemas = records.SchemaCache() if schemas is None else schemas
+        self.fields = kwargs.get('fields')
+        self.chunk_size = kwargs.get('chunk_size', jsonstream.DEFAULT_STREAM_CHUNK_SIZE)
+
+    def parse_response(self, request_object):
+        response = super(QueryMore, self).parse_response(request_object)
+        if self.compact:
+            records.compact_page(response, self.schemas)
+        return response
+
+    def request_next(self, next_records_url):
+        """ Requests the batch at `next_records_url`. Catches any exceptions and appends them to `self.exceptions`.
+
+          :param: next_records_url: The `nextRecordsUrl` of the previous batch
+          :type: next_records_url: string
+          :return: Query result batch, if available
+          :rtype: dict|None
+        """
+
+        (headers, logger, request_object, response, service) = self.get_request_vars()
+        service = 'https://%s%s' % (self.instance_url, next_records_url)
+        logger.info('%s %s' % (self.http_method, service))
+        try:
+            request_object = self.session.get(
+                service, headers=headers, proxies=self.proxies)
+            self.status = request_object.status_code
+            response = self.parse_response(request_object)
+        except Exception as e:
+            self.exceptions.append(e)
+            logger.error('%s %s %s' % (self.http_method, service, self.status))
+            logger.error(e.args[0])
+            return
+        finally:
+            return response
 
-    def request(self, *args):
-        """ Makes a `Query` request for the initial query string, then calls itself recursively to request all remaining
-        batches, if there are any.  This method will break the recursion and return all when the last batch processed
+    def iter_pages(self):
+        """ Makes a `Query` request for the initial query string, then lazily requests each remaining batch as the
+        previous one is consumed, so that only one batch is held in memory at a time. Stops when a batch contains a
+        `done` value equal to `True`, or when a request fails, in which case the exception is appended to
+        `self.exceptions`.
+
+        .. versionadded:: 2.3.0
+
+          :return: A generator of dicts where each dict is a batch of query results
+          :rtype: generator
+        """
+
+        q = Query(self.session_id, self.instance_url, self.query_string, proxies=self.proxies,
+                  version=self.api_version, session=self.session, codec=self.codec, compact=self.compact,
+                  schemas=self.schemas)
+        last = q.request()
+        self.status = q.status
+        self.exceptions.extend(q.exceptions)
+
+        while last is not None:
+            yield last
+            if not isinstance(last, dict) or last.get('done') is not False:
+                break
+            last = self.request_next(last.get('nextRecordsUrl'))
+
+    def iter_records(self):
+        """ Streams every batch for the query string, yielding each record as soon as it has been received and
+        parsed, rather than once its whole batch has arrived. Only the record being parsed and a network chunk are
+        held in memory. Stops when a batch contains a `done` value equal to `True`, or when a request fails, in which
+        case the exception is appended to `self.exceptions`.
+
+        .. versionadded:: 2.3.0
+
+          :return: A generator of records
+          :rtype: generator
+        """
+
+        qry = urlencode({'q': self.query_string.encode('utf-8')})
+        service = 'https://%s%s' % (self.instance_url, QUERY_SERVICE % (self.api_version, qry))
+
+        while service is not None:
+            failures = len(self.exceptions)
+            stream = jsonstream.RecordStream('records', self.fields)
+            for record in self.stream_records(service, stream, self.chunk_size):
+                yield records.compact(record, self.schemas) if self.compact else record
+
+            service = None
+            if len(self.exceptions) == failures and stream.page.get('done') is False:
+                service = 'https://%s%s' % (self.instance_url, stream.page.get('nextRecordsUrl'))
+
+    def request(self):
+        """ Requests every batch for the query string, following `nextRecordsUrl` until the last batch processed
         contains a `done` value equal to `True`.
 
-          :param: results: All queried batch results obtained in prior recursions of this method.
-          :type: results: [dict]
-          :return: A list of dicts where each dict is a batch of query results
-          :rtype: [dict]
+          :return: A list of dicts where each dict is a batch of query results, or `None` if any request failed
+          :rtype: [dict]|None
         """
 
-        (last, results) = (
-            dict(),
-            list() if len(args) == 0 else args[0],
-        )
+        results = list(self.iter_pages())
+
+        if len(self.exceptions) > 0:
+            return None
+        return results
+
+
+class ParallelQuery(commons.BaseRequest):
+    """ Splits a query into disjoint slices by ranges of `Id`, `CreatedDate` or `SystemModstamp`, and runs each slice
+    as a `QueryMore` request on a pool of worker threads.
+
+    Slice boundaries are derived from a cheap boundary query: the lowest and highest `Id` of the queried records, or
+    the `MIN()` and `MAX()` of the date field. The first and last slices are open-ended, so together the slices cover
+    every record matched by the query exactly once.
 
-        len_results = len(results)
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, session_id, instance_url, query_string, **kwargs):
+        """ Constructor. Calls `super`, then checks that `query_string` can be sliced.
+
+          :param: session_id: Session ID used to make request
+          :type: session_id: string
+          :param: instance_url: Instance URL used to make the request (eg. `'eu11.salesforce.com'`)
+          :type: instance_url: string
+          :param: query_string: Query string, without `GROUP BY`, `LIMIT` or `OFFSET` clauses
+          :type: query_string: string
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :Keyword Arguments:
+            * *chunks* (`int`) --
+                Number of slices to split the query into. Default: `4`
+            * *chunk_by* (`string`) --
+                `'Id'`, `'CreatedDate'` or `'SystemModstamp'`. Default: `'Id'`
+            * *max_workers* (`int`) --
+                Maximum number of slices queried concurrently. Default: `4`
+            * *retries* (`int`) --
+                Number of times a failed slice is queried again from the start. Default: `2`
+            * *compact* (`bool`) --
+                Return records as compact `records.Record` objects rather than dicts. Default: `False`
+        """
+        super(ParallelQuery, self).__init__(session_id, instance_url, **kwargs)
+        soql.check_sliceable(query_string)
+        self.query_string = query_string
+        self.chunks = kwargs.get('chunks', DEFAULT_PARALLEL_CHUNKS)
+        self.chunk_by = kwargs.get('chunk_by', 'Id')
+        self.max_workers = kwargs.get('max_workers', DEFAULT_PARALLEL_WORKERS)
+        self.retries = kwargs.get('retries', DEFAULT_CHUNK_RETRIES)
+        self.compact = kwargs.get('compact', False)
+        schemas = kwargs.get('schemas')
+        self.schemas = records.SchemaCache() if schemas is None else schemas
+        self.chunk_queries = None
+
+        if self.chunk_by not in PARALLEL_CHUNK_FIELDS:
+            raise ValueError('chunk_by must be one of %s' % ', '.join(PARALLEL_CHUNK_FIELDS))
+
+    def get_query_kwargs(self):
+        """ Returns the kwargs with which boundary and slice queries are made.
+
+          :return: kwargs
+          :rtype: dict
+        """
+        k = {'proxies': self.proxies, 'version': self.api_version, 'session': self.session, 'codec': self.codec,
+             'compact': self.compact, 'schemas': self.schemas}
+        if self.timeout is not None:
+            k['timeout'] = self.timeout
+        return k
+
+    def get_boundaries(self):
+        """ Runs the boundary query and returns the values splitting the queried records into `chunks` slices. Returns
+        an empty list, ie. a single slice, if there are no records or the boundary query fails.
+
+          :return: Boundary values, in ascending order
+          :rtype: [string]
+        """
+        object_name = soql.get_object_name(self.query_string)
+        condition = soql.get_condition(self.query_string)
 
-        if len_results == 0:
-            q = Query(self.session_id, self.instance_url, self.query_string,
-                      proxies=self.proxies, version=self.api_version)
+        def boundary_query(qs):
+            if condition is not None:
+                qs = soql.add_condition(qs, condition)
+            q = Query(self.session_id, self.instance_url, qs, **self.get_query_kwargs())
             response = q.request()
-            results.append(response)
-            last = response
-        elif len_results > 0:
-            last = results[len_results - 1]
-            if last.get('done') is False:
-                (headers, logger, request_object, response, service) = self.get_request_vars()
-                service = 'https://%s%s' % (self.instance_url, last.get('nextRecordsUrl'))
-                logging.getLogger('sfdc_py').info('%s %s' %
-                                                  (self.http_method, service))
-                try:
-                    request_object = requests.get(
-                        service, headers=headers, proxies=self.proxies)
-                    self.status = request_object.status_code
-                    if request_object.content.decode('utf-8') == 'null':
-                        raise commons.SFDCRequestException('Request body is null')
-                    else:
-                        last = request_object.json()
-                except Exception as e:
-                    self.exceptions.append(e)
-                    logger.error('%s %s %s' % (self.http_method, service, self.status))
-                    logger.error(e.args[0])
-                    return
-                else:
-                    results.append(last)
+            if isinstance(response, dict) and len(response.get('records', [])) > 0:
+                return response['records'][0]
+            logging.getLogger('sfdc_py').warning('Boundary query failed or matched no records: %s' % qs)
+
+        if self.chunk_by == 'Id':
+            lowest = boundary_query('SELECT Id FROM %s ORDER BY Id ASC LIMIT 1' % object_name)
+            highest = boundary_query('SELECT Id FROM %s ORDER BY Id DESC LIMIT 1' % object_name)
+            if lowest is not None and highest is not None:
+                return soql.id_boundaries(lowest['Id'], highest['Id'], self.chunks)
+        else:
+            window = boundary_query('SELECT MIN(%s) minValue, MAX(%s) maxValue FROM %s' % (
+                self.chunk_by, self.chunk_by, object_name))
+            if window is not None and window.get('minValue') is not None:
+                return soql.datetime_boundaries(window['minValue'], window['maxValue'], self.chunks)
+        return []
+
+    def get_chunk_queries(self):
+        """ Returns one query string per slice.
+
+          :return: Query strings
+          :rtype: [string]
+        """
+        if self.chunk_queries is None:
+            boundaries = self.get_boundaries() if self.chunks > 1 else []
+            conditions = soql.range_conditions(self.chunk_by, boundaries, quote=self.chunk_by == 'Id')
+            self.chunk_queries = [
+                self.query_string if c is None else soql.add_condition(self.query_string, c) for c in conditions]
+        return self.chunk_queries
+
+    def request_chunk(self, query_string):
+        """ Queries every record of a slice, querying it again from the start up to `retries` times if a request fails.
+        The exceptions of the last attempt are appended to `self.exceptions` if all attempts fail.
+
+          :param: query_string: Query string of the slice
+          :type: query_string: string
+          :return: Records, or `None` if all attempts failed
+          :rtype: [dict]|None
+        """
+        for attempt in range(self.retries + 1):
+            qm = QueryMore(self.session_id, self.instance_url, query_string, **self.get_query_kwargs())
+            rows = [record for batch in qm.iter_pages() for record in batch.get('records', [])]
+            self.status = qm.status
+            if len(qm.exceptions) == 0:
+                return rows
+            logging.getLogger('sfdc_py').warning(
+                'Slice failed (attempt %s of %s): %s' % (attempt + 1, self.retries + 1, query_string))
+        self.exceptions.extend(qm.exceptions)
+
+    def iter_chunks(self):
+        """ Queries every slice concurrently and yields the records of each slice as soon as it completes. Failed
+        slices are skipped and their exceptions appended to `self.exceptions`.
+
+          :return: A generator of (slice index, records) tuples, in order of completion
+          :rtype: generator
+        """
+        queries = self.get_chunk_queries()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries)))
+        futures = {executor.submit(self.request_chunk, qs): i for (i, qs) in enumerate(queries)}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                rows = future.result()
+                if rows is not None:
+                    yield futures[future], rows
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def iter_records(self):
+        """ Yields records slice by slice, in order of completion.
 
-        if last.get('done') is True:
-            return results
-        elif last.get('done') is False:
-            return self.request(results)
+          :return: A generator of records
+          :rtype: generator
+        """
+        for (index, rows) in self.iter_chunks():
+            for record in rows:
+                yield record
+
+    def request(self):
+        """ Queries every slice concurrently and merges their records in slice order.
+
+          :return: Records, or `None` if any slice failed
+          :rtype: [dict]|None
+        """
+        chunks = dict(self.iter_chunks())
+
+        if len(self.exceptions) > 0:
+            return None
+        return [record for index in sorted(chunks) for record in chunks[index]]
 
 
 class Search(commons.BaseRequest):
@@ -704,10 +1348,29 @@ class Search(commons.BaseRequest):
           :type: search_string: string
           :param: **kwargs: kwargs
           :type: **kwargs: dict
+          :Keyword Arguments:
+            * *fields* (`[string]`) --
+                With `iter_records()`, names of the fields to keep in each record. Default: every field
+            * *chunk_size* (`int`) --
+                With `iter_records()`, size in bytes of the chunks read from the network. Default: `65536`
         """
         super(Search, self).__init__(session_id, instance_url, **kwargs)
         s = urlencode({'q': search_string.encode('utf-8')})
         self.service = SEARCH_SERVICE % (self.api_version, s)
+        self.fields = kwargs.get('fields')
+        self.chunk_size = kwargs.get('chunk_size', jsonstream.DEFAULT_STREAM_CHUNK_SIZE)
+
+    def iter_records(self):
+        """ Streams the search results, yielding each record of `searchRecords` as soon as it has been received and
+        parsed. If the request fails, the exception is appended to `self.exceptions`.
+
+        .. versionadded:: 2.3.0
+
+          :return: A generator of records
+          :rtype: generator
+        """
+        return self.stream_records(self.get_request_url(), jsonstream.RecordStream('searchRecords', self.fields),
+                                   self.chunk_size)
 
 
 class SObjectBlob(commons.BaseRequest):
@@ -756,6 +1419,39 @@ class SObjectBlob(commons.BaseRequest):
                 kwargs['filename'],
                 content)
 
+    def get_headers(self):
+        """ Returns headers dict for the request, with the `Content-Type` suited to the `http_method`.
+
+          :return: headers
+          :rtype: dict
+        """
+        headers = super(SObjectBlob, self).get_headers()
+        if self.http_method == 'GET':
+            headers['Content-Type'] = 'application/octet-stream'
+        elif self.http_method == 'POST':
+            headers['Content-Type'] = 'multipart/form-data;boundary="boundary_string"'
+        return headers
+
+    def get_body_kwargs(self):
+        if self.http_method == 'POST':
+            return {'data': self.request_body}
+        return {}
+
+    def parse_response(self, request_object):
+        """ Returns the HTTP response itself for `'GET'`, so that the binary content can be read from it, or the
+        deserialised body for `'POST'`.
+
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
+          :return: response
+          :rtype: requests.Response|dict
+        """
+        if request_object.content == b'null':
+            raise commons.SFDCRequestException('Request body is null')
+        elif self.http_method == 'GET':
+            return request_object
+        return self.codec.loads(request_object.content)
+
     def request(self):
         """ Returns the request response.
 
@@ -766,38 +1462,17 @@ class SObjectBlob(commons.BaseRequest):
         (headers, logger, request_object, response, service) = self.get_request_vars()
         logging.getLogger('sfdc_py').info('%s %s' %
                                           (self.http_method, service))
-        if self.http_method == 'GET':
-            headers['Content-Type'] = 'application/octet-stream'
+        if self.http_method in ('GET', 'POST'):
             try:
-                request_object = requests.get(
-                    service, headers=headers, proxies=self.proxies, stream=True)
-                self.status = request_object.status_code
-                if request_object.content.decode('utf-8') == 'null':
-                    raise commons.SFDCRequestException('Request body is null')
-                else:
-                    self.response = response = request_object
-            except Exception as e:
-                self.exceptions.append(e)
-                logger.error('%s %s %s' %
-                             (self.http_method, service, self.status))
-
-                logger.error(e.args[0])
-                return
-            finally:
-                return response
-        elif self.http_method == 'POST':
-            headers['Content-Type'] = 'multipart/form-data;boundary="boundary_string"'
-            try:
-                request_object = requests.post(
+                request_object = self.session.request(
+                    self.http_method,
                     service,
                     headers=headers,
                     proxies=self.proxies,
-                    data=self.request_body)
+                    stream=self.http_method == 'GET',
+                    **self.get_body_kwargs())
                 self.status = request_object.status_code
-                if request_object.content.decode('utf-8') == 'null':
-                    raise commons.SFDCRequestException('Request body is null')
-                else:
-                    self.response = response = request_object.json()
+                self.response = response = self.parse_response(request_object)
             except Exception as e:
                 self.exceptions.append(e)
                 logger.error('%s %s %s' %
@@ -853,36 +1528,51 @@ class SObjectController(object):
             return ''
         return '/%s' % self.object_type
 
-    @commons.kwarg_adder
-    def insert(self, body, **kwargs):
-        """ Creates an SObject in Salesforce.
+    def get_sobjects_request(self, http_method, kwargs, body=None, resource_suffix=''):
+        """ Builds the `SObjects` request used by the controller methods. `kwargs` supersede the defaults derived from
+        the controller.
 
-        Note: if `binary_field` is defined in kwargs, an `SObjectBlob` request will be made and returned, otherwise an
-        `SObject` request will be made.
+          :param: http_method: HTTP method, eg. `'PATCH'`
+          :type: http_method: string
+          :param: kwargs: kwargs
+          :type: kwargs: dict
+          :param: body: Body of SObject request, if any.
+          :type: body: dict
+          :param: resource_suffix: Appended to the controller's service, eg. `'/describe'`
+          :type: resource_suffix: string
+          :return: SObjects request
+          :rtype: SObjects
+        """
+
+        k = {
+            'http_method': http_method,
+            'resource_id': self.get_service() + resource_suffix
+        }
+        if body is not None:
+            k['request_body'] = body
+        k.update(kwargs)
+        return SObjects(self.__client__, **k)
+
+    def get_insert_request(self, body, kwargs):
+        """ Builds the request used by `insert()`: an `SObjectBlob` if `binary_field` is defined and a `binary` kwarg
+        is provided, an `SObjects` request if `binary_field` is not defined, and `None` otherwise.
 
           :param: body: Body of SObject request.
           :type: body: dict
-          :param: **kwargs: kwargs
-          :type: **kwargs: dict
-          :return: Insert result from Salesforce
-          :rtype: (dict, SObject|SObjectBlob)
+          :param: kwargs: kwargs
+          :type: kwargs: dict
+          :return: Insert request
+          :rtype: SObjects|SObjectBlob|None
         """
 
         sobj = None
         _client = self.__client__
-        resource_id = self.get_service()
         if self.binary_field is None:
-            k = {
-                'http_method': 'POST',
-                'request_body': body,
-                'resource_id': resource_id
-            }
-            k.update(kwargs)
-            sobj = SObjects(_client, **k)
-        elif self.binary_field is not None and 'binary' in kwargs:
+            sobj = self.get_sobjects_request('POST', kwargs, body=body)
+        elif 'binary' in kwargs:
             sobj = SObjectBlob(
                 _client,
-                resource_id,
+                self.get_service(),
                 'POST')
 
             # Prep request body properties
@@ -901,6 +1591,41 @@ class SObjectController(object):
                 filename=filename,
                 content=content,
                 file_content_type=file_content_type)
+        return sobj
+
+    def get_blob_request(self, response):
+        """ Builds the `SObjectBlob` request used by `query()` to fetch binary content, if `binary_field` is defined and
+        present in `response`.
+
+          :param: response: SObject query response
+          :type: response: dict|None
+          :return: Binary content request
+          :rtype: SObjectBlob|None
+        """
+
+        if self.binary_field is not None and isinstance(
+                response, dict) and self.binary_field in response:
+            return SObjectBlob(
+                self.__client__,
+                response[self.binary_field],
+                'GET')
+
+    @commons.kwarg_adder
+    def insert(self, body, **kwargs):
+        """ Creates an SObject in Salesforce.
+
+        Note: if `binary_field` is defined in kwargs, an `SObjectBlob` request will be made and returned, otherwise an
+        `SObject` request will be made.
+
+          :param: body: Body of SObject request.
+          :type: body: dict
+          :param: **kwargs: kwargs
+          :type: **kwargs: dict
+          :return: Insert result from Salesforce
+          :rtype: (dict, SObject|SObjectBlob)
+        """
+
+        sobj = self.get_insert_request(body, kwargs)
         req = sobj.request()
         return req, sobj
 
@@ -914,16 +1639,9 @@ class SObjectController(object):
           :rtype: (None, SObject)
         """
 
-        _client = self.__client__
-        resource_id = self.get_service()
-        k = {
-            'http_method': 'PATCH',
-            'request_body': body,
-            'resource_id': resource_id
-        }
-        k.update(kwargs)
-        sobj = SObjects(_client, **k)
+        sobj = self.get_sobjects_request('PATCH', kwargs, body=body)
         req = sobj.request()
+        self.invalidate_records(kwargs)
         return req, sobj
 
     @commons.kwarg_adder
@@ -936,16 +1654,9 @@ class SObjectController(object):
           :rtype: (None, SObject)
         """
 
-        _client = self.__client__
-        resource_id = self.get_service()
-        k = {
-            'http_method': 'PATCH',
-            'request_body': body,
-            'resource_id': resource_id
-        }
-        k.update(kwargs)
-        sobj = SObjects(_client, **k)
+        sobj = self.get_sobjects_request('PATCH', kwargs, body=body)
         req = sobj.request()
+        self.invalidate_records(kwargs)
         return req, sobj
 
     @commons.kwarg_adder
@@ -956,47 +1667,182 @@ class SObjectController(object):
           :rtype: (None, SObject)
         """
 
-        _client = self.__client__
-        resource_id = self.get_service()
-        k = {
-            'http_method': 'DELETE',
-            'resource_id': resource_id
-        }
-        k.update(kwargs)
-        sobj = SObjects(_client, **k)
+        sobj = self.get_sobjects_request('DELETE', kwargs)
         req = sobj.request()
+        self.invalidate_records(kwargs)
         return req, sobj
 
+    def get_record_key(self, kwargs):
+        """ Returns the key under which the `record_cache` kwarg holds the record queried by the controller, or `None`
+        if there is no cache or the controller doesn't query a single record by ID or external ID, or queries binary
+        content.
+
+        .. versionadded:: 2.3.0
+
+          :param: kwargs: kwargs
+          :type: kwargs: dict
+          :return: key
+          :rtype: tuple|None
+        """
+
+        record_cache = kwargs.get('record_cache')
+        if record_cache is None or self.id is None or self.object_type is None or self.binary_field is not None:
+            return None
+        return record_cache.get_key(self.__client__.instance_url, self.object_type, self.id, self.external_id)
+
+    def invalidate_records(self, kwargs, ids=None):
+        """ Invalidates the records written by the controller in the `record_cache` kwarg, if any: those with `ids`,
+        or the controller's record if it has an ID, or else every record of the controller's object.
+
+        .. versionadded:: 2.3.0
+
+          :param: kwargs: kwargs
+          :type: kwargs: dict
+          :param: ids: IDs of the records written
+          :type: ids: [string]
+        """
+
+        record_cache = kwargs.get('record_cache')
+        if record_cache is None:
+            return
+        elif ids is None and self.id is not None and self.external_id is None:
+            ids = [self.id]
+
+        instance_url = self.__client__.instance_url
+        if ids is None:
+            record_cache.invalidate(instance_url, self.object_type)
+        for record_id in ids or []:
+            record_cache.invalidate(instance_url, self.object_type, record_id)
+
+    def get_collection_records(self, records):
+        """ Returns `records`, adding `attributes.type` with the controller's `object_type` where it is missing.
+
+          :param: records: Records
+          :type: records: [dict]
+          :return: Records
+          :rtype: [dict]
+        """
+
+        return [r if 'attributes' in r else dict(r, attributes={'type': self.object_type}) for r in records]
+
+    def get_collection_kwargs(self, kwargs):
+        k = dict(kwargs)
+        k.update({'object_type': self.object_type, 'external_id': self.external_id})
+        return k
+
+    @commons.kwarg_adder
+    def insert_many(self, records, all_or_none=False, **kwargs):
+        """ Creates any number of SObjects in Salesforce, 200 per request, using the sObject Collections API. Requests
+        are sent concurrently, see `composite.ConcurrentExecutor` for the kwargs controlling concurrency.
+
+        .. versionadded:: 2.3.0
+
+          :param: records: Bodies of the SObjects to create.
+          :type: records: [dict]
+          :param: all_or_none: Whether to roll back every record of a request if one fails.
+          :type: all_or_none: bool
+          :return: One result per record, in the order provided, and the executor
+          :rtype: ([dict], composite.CollectionExecutor)
+        """
+
+        return self.__client__.composite.collections(
+            'POST', self.get_collection_records(records), all_or_none, **self.get_collection_kwargs(kwargs))
+
+    @commons.kwarg_adder
+    def update_many(self, records, all_or_none=False, **kwargs):
+        """ Updates any number of SObjects in Salesforce, 200 per request, using the sObject Collections API. Each
+        record must include its `Id`.
+
+        .. versionadded:: 2.3.0
+
+          :param: records: Bodies of the SObjects to update.
+          :type: records: [dict]
+          :param: all_or_none: Whether to roll back every record of a request if one fails.
+          :type: all_or_none: bool
+          :return: One result per record, in the order provided, and the executor
+          :rtype: ([dict], composite.CollectionExecutor)
+        """
+
+        k = self.get_collection_kwargs(kwargs)
+        k['external_id'] = None
+        results = self.__client__.composite.collections(
+            'PATCH', self.get_collection_records(records), all_or_none, **k)
+        self.invalidate_records(kwargs, [r['Id'] for r in records if r.get('Id') is not None])
+        return results
+
+    @commons.kwarg_adder
+    def upsert_many(self, records, all_or_none=False, **kwargs):
+        """ Upserts any number of SObjects in Salesforce, 200 per request, using the sObject Collections API. Records
+        are matched on the controller's `external_id` field, which each record must include.
+
+        .. versionadded:: 2.3.0
+
+          :param: records: Bodies of the SObjects to upsert.
+          :type: records: [dict]
+          :param: all_or_none: Whether to roll back every record of a request if one fails.
+          :type: all_or_none: bool
+          :return: One result per record, in the order provided, and the executor
+          :rtype: ([dict], composite.CollectionExecutor)
+        """
+
+        if self.external_id is None:
+            raise ValueError('upsert_many requires the external_id kwarg of sobjects()')
+        results = self.__client__.composite.collections(
+            'PATCH', self.get_collection_records(records), all_or_none, **self.get_collection_kwargs(kwargs))
+        self.invalidate_records(kwargs)
+        return results
+
+    @commons.kwarg_adder
+    def delete_many(self, ids, all_or_none=False, **kwargs):
+        """ Deletes any number of SObjects in Salesforce, 200 per request, using the sObject Collections API.
+
+        .. versionadded:: 2.3.0
+
+          :param: ids: IDs of the SObjects to delete.
+          :type: ids: [string]
+          :param: all_or_none: Whether to roll back every record of a request if one fails.
+          :type: all_or_none: bool
+          :return: One result per ID, in the order provided, and the executor
+          :rtype: ([dict], composite.CollectionExecutor)
+        """
+
+        results = self.__client__.composite.collections(
+            'DELETE', ids, all_or_none, **self.get_collection_kwargs(kwargs))
+        self.invalidate_records(kwargs, list(ids))
+        return results
+
     @commons.kwarg_adder
     def query(self, **kwargs):
         """ Queries an SObject in Salesforce. If a `binary_field` instance variable is defined, this method will further
         query the binary field content and return it accordingly.
 
+        With the `record_cache` kwarg, a record queried by ID or external ID is returned from the cache if present,
+        in which case `from_cache` is set on the `SObject` returned and no request is made, and is stored in the cache
+        otherwise. Pass `refresh=True` to bypass the cached record.
+
           :return: Query result from Salesforce
           :rtype: (dict, SObject)|(dict, SObject, SObjectBlob)
         """
-        (_client, resource_id) = (self.__client__, self.get_service())
-        k = {
-            'http_method': 'GET',
-            'resource_id': resource_id
-        }
-        k.update(kwargs)
-        sobj = SObjects(_client, **k)
+        sobj = self.get_sobjects_request('GET', kwargs)
+        key = self.get_record_key(kwargs)
+        if key is not None and not kwargs.get('refresh', False):
+            cached = kwargs['record_cache'].get(key)
+            if cached is not None:
+                sobj.from_cache = True
+                return cached, sobj
+
         req = sobj.request()
-        if self.binary_field is not None and isinstance(
-                req, dict) and self.binary_field in req:
-            bin_service = req[self.binary_field]
-            sob_blob = SObjectBlob(
-                _client,
-                bin_service,
-                'GET')
+        if key is not None and sobj.status == requests.codes.ok and isinstance(req, dict):
+            kwargs['record_cache'].put(key, req)
+        sob_blob = self.get_blob_request(req)
+        if sob_blob is not None:
             sob_blob.request()
             return req, sobj, sob_blob
         return req, sobj
 
     @commons.kwarg_adder
     def describe(self, **kwargs):
-        """ Describes the metadata for an SObject in Salesforce.
+        """ Describes the metadata for an SObject in Salesforce. With a `describe_cache`, see `request_describe()`.
 
         .. versionadded:: 1.0.0
 
@@ -1004,20 +1850,13 @@ class SObjectController(object):
           :rtype: (dict, SObject)
         """
 
-        _client = self.__client__
-        resource_id = self.get_service()
-        k = {
-            'http_method': 'GET',
-            'resource_id': resource_id + '/describe'
-        }
-        k.update(kwargs)
-        sobj = SObjects(_client, **k)
-        req = sobj.request()
-        return req, sobj
+        sobj = self.get_sobjects_request('GET', kwargs, resource_suffix='/describe')
+        return self.request_describe(sobj, kwargs, '/describe')
 
     @commons.kwarg_adder
     def describe_global(self, **kwargs):
-        """ Lists the available objects and their metadata for the organizations data.
+        """ Lists the available objects and their metadata for the organizations data. With a `describe_cache`, see
+        `request_describe()`.
 
         .. versionadded:: 1.0.0
 
@@ -1025,16 +1864,36 @@ class SObjectController(object):
           :rtype: (dict, SObject)
         """
 
-        _client = self.__client__
-        resource_id = self.get_service()
-        k = {
-            'http_method': 'GET',
-            'resource_id': resource_id
-        }
-        k.update(kwargs)
-        sobj = SObjects(_client, **k)
-        req = sobj.request()
-        return req, sobj
+        sobj = self.get_sobjects_request('GET', kwargs)
+        return self.request_describe(sobj, kwargs)
+
+    def request_describe(self, sobj, kwargs, resource=''):
+        """ Sends the describe request `sobj`, through the `describe_cache` kwarg if provided: a fresh cached result is
+        returned without any request, and a stale one is revalidated, the cached result being returned if the response
+        is `304 Not Modified`. `sobj.from_cache` tells whether the result came from the cache. Pass `refresh=True` to
+        revalidate a fresh result.
+
+        .. versionadded:: 2.3.0
+
+          :param: sobj: Describe request
+          :type: sobj: SObjects
+          :param: kwargs: kwargs
+          :type: kwargs: dict
+          :param: resource: Resource suffix of `sobj`, eg. `'/describe'`, cached apart from the object itself
+          :type: resource: string
+          :return: Describe result
+          :rtype: (dict, SObjects)
+        """
+
+        describe_cache = kwargs.get('describe_cache')
+        if describe_cache is None:
+            return sobj.request(), sobj
+
+        key = describe_cache.get_key(sobj.instance_url, sobj.api_version, self.object_type, resource)
+        cached = describe_cache.prepare(key, sobj, kwargs.get('refresh', False))
+        if cached is not None:
+            return cached, sobj
+        return describe_cache.store(key, sobj, sobj.request()), sobj
 
 
 class SObjects(commons.BaseRequest):
@@ -1056,6 +1915,37 @@ class SObjects(commons.BaseRequest):
         super(SObjects, self).__init__(_client.session_id, _client.instance_url, **kwargs)
         resource_id = kwargs.get('resource_id')
         self.service = SOBJ_SERVICE % (self.api_version, resource_id)
+        self.from_cache = False
+
+    def get_headers(self):
+        """ Returns headers dict for the request, with auto-assignment rules disabled.
+
+          :return: headers
+          :rtype: dict
+        """
+        if self.headers is None:
+            self.headers = {
+                'Content-Type': 'application/json',
+                'Accept-Encoding': 'application/json',
+                'Sforce-Auto-Assign': 'FALSE',
+                'Authorization': 'OAuth %s' % self.session_id
+            }
+        return self.headers
+
+    def parse_response(self, request_object):
+        """ Returns `None` for a successful `'PATCH'` or `'DELETE'`, as they respond with `NO CONTENT`, and for a
+        `NOT MODIFIED` response to a conditional `'GET'`, otherwise returns the result of `super` for this method.
+
+          :param: request_object: HTTP response
+          :type: request_object: requests.Response
+          :return: response dict
+          :rtype: dict|None
+        """
+        if self.http_method in ('PATCH', 'DELETE') and request_object.status_code == requests.codes.no_content:
+            return None
+        elif request_object.status_code == requests.codes.not_modified:
+            return None
+        return super(SObjects, self).parse_response(request_object)
 
     def request(self):
         """ Makes the appropriate request depending on the `http_method`.  Supported now are: `'GET'`, `'POST'`,
@@ -1068,55 +1958,34 @@ class SObjects(commons.BaseRequest):
           :return: response dict
           :rtype: dict|None
         """
-        sobjects_headers = {
-            'Content-Type': 'application/json',
-            'Accept-Encoding': 'application/json',
-            'Sforce-Auto-Assign': 'FALSE'
-        }
-
-        (headers, logger, request_object, response, service) = (
-            sobjects_headers,
-            logging.getLogger('sfdc_py'),
-            None,
-            None,
-            'https://%s%s' % (self.instance_url, self.service)
-        )
-        headers['Authorization'] = 'OAuth %s' % self.session_id
+        (headers, logger, request_object, response, service) = self.get_request_vars()
 
         logger.info('%s %s' % (self.http_method, service))
 
         if self.http_method == 'POST':
-            request_object = requests.post(
+            request_object = self.session.post(
                 service,
                 headers=headers,
-                json=self.request_body,
-                proxies=self.proxies)
+                proxies=self.proxies,
+                **self.get_body_kwargs())
         elif self.http_method == 'PATCH':
-            request_object = requests.patch(
+            request_object = self.session.patch(
                 service,
                 headers=headers,
-                json=self.request_body,
-                proxies=self.proxies)
-            self.status = request_object.status_code
-            if request_object.status_code == requests.codes.no_content:
-                return None
+                proxies=self.proxies,
+                **self.get_body_kwargs())
         elif self.http_method == 'DELETE':
-            request_object = requests.delete(
+            request_object = self.session.delete(
                 service, headers=headers, proxies=self.proxies)
-            self.status = request_object.status_code
-            if request_object.status_code == requests.codes.no_content:
-                return None
         elif self.http_method == 'GET':
-            request_object = requests.get(
+            request_object = self.session.get(
                 service, headers=headers, proxies=self.proxies)
 
         self.status = request_object.status_code
+        self.response_headers = request_object.headers
 
         try:
-            if request_object.content.decode('utf-8') == 'null':
-                raise commons.SFDCRequestException('Request body is null')
-            else:
-                response = request_object.json()
+            response = self.parse_response(request_object)
         except Exception as e:
             self.exceptions.append(e)
             logger.error('%s %s %s' % (self.http_method, service, self.status))
@@ -0,0 +1,238 @@
+"""
+.. module:: soql
+   :synopsis: Helpers to rewrite SOQL query strings, eg. to split a query into disjoint slices.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import datetime
+import re
+
+BASE62_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+CLAUSE_KEYWORDS = ('WHERE', 'WITH', 'GROUP BY', 'ORDER BY', 'LIMIT', 'OFFSET', 'FOR')
+UNSLICEABLE_CLAUSES = ('GROUP BY', 'LIMIT', 'OFFSET')
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def find_clauses(qs):
+    """
+    Returns the position of each top-level clause keyword in `qs`, ignoring keywords that appear within quotes or
+    parentheses (eg. in relationship subqueries).
+
+    :param: qs: Query string. eg `'SELECT Id FROM Account WHERE Name = \\'A\\' LIMIT 10'`
+    :type: qs: string
+    :return: (keyword, start, end) for each clause, in order of appearance, `FROM` included
+    :rtype: [(string, int, int)]
+    """
+    clauses = []
+    depth = 0
+    quoted = False
+    i = 0
+
+    while i < len(qs):
+        char = qs[i]
+        if quoted:
+            if char == '\\':
+                i += 1
+            elif char == "'":
+                quoted = False
+        elif char == "'":
+            quoted = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0 and (i == 0 or qs[i - 1].isspace()):
+            for keyword in ('FROM',) + CLAUSE_KEYWORDS:
+                match = re.match(r'%s\b' % keyword.replace(' ', r'\s+'), qs[i:], re.IGNORECASE)
+                if match is not None:
+                    clauses.append((keyword, i, i + match.end()))
+                    i += match.end() - 1
+                    break
+        i += 1
+
+    return clauses
+
+
+def get_object_name(qs):
+    """
+    Returns the name of the object queried by `qs`.
+
+    :param: qs: Query string
+    :type: qs: string
+    :return: Object name, eg. `'Account'`
+    :rtype: string
+    :raises: ValueError if `qs` has no top-level `FROM` clause
+    """
+    for (keyword, start, end) in find_clauses(qs):
+        if keyword == 'FROM':
+            return qs[end:].split()[0]
+    raise ValueError('Query has no FROM clause: %s' % qs)
+
+
+def get_condition(qs):
+    """
+    Returns the top-level `WHERE` condition of `qs`, if any.
+
+    :param: qs: Query string
+    :type: qs: string
+    :return: Condition
+    :rtype: string|None
+    """
+    clauses = find_clauses(qs)
+    for (keyword, start, end) in clauses:
+        if keyword == 'WHERE':
+            following = [s for (k, s, e) in clauses if s > start]
+            stop = following[0] if len(following) > 0 else len(qs)
+            return qs[end:stop].strip()
+
+
+def add_condition(qs, condition):
+    """
+    Returns `qs` with `condition` added to its `WHERE` clause, combined with any existing condition by `AND`.
+
+    :param: qs: Query string
+    :type: qs: string
+    :param: condition: SOQL condition, eg. `"Id >= '001000000000000'"`
+    :type: condition: string
+    :return: Query string
+    :rtype: string
+    """
+    clauses = find_clauses(qs)
+    keywords = [keyword for (keyword, start, end) in clauses]
+    keyword = 'WHERE' if 'WHERE' in keywords else 'FROM'
+    (keyword, start, end) = clauses[keywords.index(keyword)]
+    following = [s for (k, s, e) in clauses if s > start]
+    stop = following[0] if len(following) > 0 else len(qs)
+
+    if keyword == 'WHERE':
+        head = '%s (%s) AND (%s)' % (qs[:end], qs[end:stop].strip(), condition)
+    else:
+        head = '%s WHERE %s' % (qs[:stop].rstrip(), condition)
+    return ('%s %s' % (head, qs[stop:].strip())).strip()
+
+
+def check_sliceable(qs):
+    """
+    Raises `ValueError` if `qs` contains a clause that can't be evaluated independently on disjoint slices of the
+    queried records, ie. `GROUP BY`, `LIMIT` or `OFFSET`.
+
+    :param: qs: Query string
+    :type: qs: string
+    """
+    for (keyword, start, end) in find_clauses(qs):
+        if keyword in UNSLICEABLE_CLAUSES:
+            raise ValueError('Queries with a %s clause can\'t be sliced: %s' % (keyword, qs))
+
+
+def id_to_int(_id):
+    """
+    Returns the integer value of the case-sensitive 15 character form of a Salesforce ID, read as a base 62 number whose
+    digits sort in the same order as the ID characters.
+
+    :param: _id: Salesforce ID, 15 or 18 characters
+    :type: _id: string
+    :return: value
+    :rtype: int
+    """
+    value = 0
+    for char in _id[:15]:
+        value = value * 62 + BASE62_ALPHABET.index(char)
+    return value
+
+
+def int_to_id(value):
+    """
+    Returns the 15 character Salesforce ID whose base 62 value is `value`.
+
+    :param: value: value
+    :type: value: int
+    :return: Salesforce ID
+    :rtype: string
+    """
+    chars = []
+    for _ in range(15):
+        (value, digit) = divmod(value, 62)
+        chars.append(BASE62_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def id_boundaries(min_id, max_id, chunks):
+    """
+    Returns up to `chunks - 1` IDs splitting the range from `min_id` to `max_id` into evenly sized slices.
+
+    :param: min_id: Lowest ID in the range
+    :type: min_id: string
+    :param: max_id: Highest ID in the range
+    :type: max_id: string
+    :param: chunks: Number of slices
+    :type: chunks: int
+    :return: Boundary IDs, in ascending order
+    :rtype: [string]
+    """
+    (low, high) = (id_to_int(min_id), id_to_int(max_id))
+    boundaries = [low + (high - low) * i // chunks for i in range(1, chunks)]
+    return [int_to_id(b) for b in sorted(set(boundaries)) if low < b <= high]
+
+
+def parse_datetime(value):
+    """
+    Parses a datetime returned by the API, eg. `'2018-12-05T10:56:43.000+0000'`.
+
+    :param: value: datetime string
+    :type: value: string
+    :return: datetime
+    :rtype: datetime.datetime
+    """
+    return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+
+def datetime_boundaries(start, end, chunks):
+    """
+    Returns up to `chunks - 1` SOQL datetime literals splitting the window from `start` to `end` into evenly sized
+    slices.
+
+    :param: start: Earliest datetime in the window, as returned by the API
+    :type: start: string
+    :param: end: Latest datetime in the window, as returned by the API
+    :type: end: string
+    :param: chunks: Number of slices
+    :type: chunks: int
+    :return: Boundary datetimes, in ascending order
+    :rtype: [string]
+    """
+    (low, high) = (parse_datetime(start), parse_datetime(end))
+    step = (high - low) / chunks
+    boundaries = []
+    for i in range(1, chunks):
+        boundary = (low + step * i).replace(microsecond=0)
+        if low < boundary <= high and boundary not in boundaries:
+            boundaries.append(boundary)
+    return [b.astimezone(datetime.timezone.utc).strftime(DATETIME_FORMAT) for b in boundaries]
+
+
+def range_conditions(field, boundaries, quote=False):
+    """
+    Returns one condition per slice delimited by `boundaries`. The first and last slices are open-ended, so that the
+    conditions cover every possible value of `field` exactly once.
+
+    :param: field: Field to slice by, eg. `'Id'`
+    :type: field: string
+    :param: boundaries: Boundary values, in ascending order
+    :type: boundaries: [string]
+    :param: quote: Whether boundary values are quoted string literals
+    :type: quote: bool
+    :return: Conditions
+    :rtype: [string]
+    """
+    literals = ["'%s'" % b if quote else b for b in boundaries]
+    if len(literals) == 0:
+        return [None]
+
+    conditions = ['%s < %s' % (field, literals[0])]
+    for (lower, upper) in zip(literals, literals[1:]):
+        conditions.append('%s >= %s AND %s < %s' % (field, lower, field, upper))
+    conditions.append('%s >= %s' % (field, literals[-1]))
+    return conditions
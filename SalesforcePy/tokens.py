@@ -0,0 +1,191 @@
+"""
+.. module:: tokens
+   :synopsis: Stores of session tokens, with which logins are skipped while a token is still valid.
+
+.. versionadded:: 2.3.0
+
+"""
+from __future__ import absolute_import
+
+import abc
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_LOGIN_URL = 'login.salesforce.com'
+
+
+def get_token_key(login_url, username, client_id):
+    """
+    Returns the key under which the token of a login is stored.
+
+    :param: login_url: Salesforce login URL, eg. `'login.salesforce.com'`
+    :type: login_url: string|None
+    :param: username: Salesforce username
+    :type: username: string
+    :param: client_id: Salesforce client ID
+    :type: client_id: string|None
+    :return: key
+    :rtype: string
+    """
+    return '%s|%s|%s' % (login_url or DEFAULT_LOGIN_URL, username, client_id or '')
+
+
+def new_token(session_id, instance_url, version=None):
+    """
+    Returns a token, as held by token stores.
+
+    :param: session_id: Session ID
+    :type: session_id: string
+    :param: instance_url: Instance URL (eg. `'eu11.salesforce.com'`)
+    :type: instance_url: string
+    :param: version: API version
+    :type: version: string|None
+    :return: token
+    :rtype: dict
+    """
+    return {'session_id': session_id, 'instance_url': instance_url, 'version': version, 'issued_at': time.time()}
+
+
+def get_token_response(token):
+    """
+    Returns `token` in the shape of an OAuth token response, as returned by `Client.login()` when it resumes a session.
+
+    :param: token: token
+    :type: token: dict
+    :return: OAuth token response
+    :rtype: dict
+    """
+    return {'access_token': token['session_id'], 'instance_url': 'https://%s' % token['instance_url']}
+
+
+class TokenStore(abc.ABC):
+    """ Base class for token stores. A store maps keys, as returned by `get_token_key()`, to tokens, as returned by
+    `new_token()`. Subclasses implement the `get()`, `put()` and `delete()` methods below, and can be passed to a
+    client as its `token_store` kwarg, eg. one backed by Redis or a secrets manager.
+
+        .. versionadded:: 2.3.0
+    """
+    @abc.abstractmethod
+    def get(self, key):
+        """ Returns the token stored under `key`, or `None`.
+
+          :param: key: key
+          :type: key: string
+          :return: token
+          :rtype: dict|None
+        """
+
+    @abc.abstractmethod
+    def put(self, key, token):
+        """ Stores `token` under `key`.
+
+          :param: key: key
+          :type: key: string
+          :param: token: token
+          :type: token: dict
+        """
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """ Removes the token stored under `key`, if any.
+
+          :param: key: key
+          :type: key: string
+        """
+
+
+class MemoryTokenStore(TokenStore):
+    """ Holds tokens in memory, shared by the clients of a process.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self):
+        self.tokens = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.tokens.get(key)
+
+    def put(self, key, token):
+        with self.lock:
+            self.tokens[key] = token
+
+    def delete(self, key):
+        with self.lock:
+            self.tokens.pop(key, None)
+
+
+class FileTokenStore(TokenStore):
+    """ Holds tokens in a JSON file readable by its owner only, shared between processes and runs. Updates take an
+    exclusive lock on `path + '.lock'` where `fcntl` is available, and the file is replaced atomically, so that
+    concurrent processes never read it half written.
+
+        .. versionadded:: 2.3.0
+    """
+    def __init__(self, path):
+        """ Constructor.
+
+          :param: path: Path of the JSON file
+          :type: path: string
+        """
+        self.path = path
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def locked(self):
+        """ Holds the lock of the file, within the process and across processes. """
+        with self.lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self):
+        """ Returns the tokens stored in the file, or an empty dict if it is missing or unreadable. """
+        try:
+            with open(self.path) as f:
+                tokens = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        return tokens if isinstance(tokens, dict) else {}
+
+    def write(self, tokens):
+        """ Replaces the file with `tokens`. """
+        (fd, temp_path) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(tokens, f)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get(self, key):
+        return self.read().get(key)
+
+    def put(self, key, token):
+        with self.locked():
+            tokens = self.read()
+            tokens[key] = token
+            self.write(tokens)
+
+    def delete(self, key):
+        with self.locked():
+            tokens = self.read()
+            if tokens.pop(key, None) is not None:
+                self.write(tokens)
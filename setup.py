@@ -6,6 +6,12 @@ with open('README.md', 'r') as fh:
 
 install_requires = ['requests>=2.20.0,<3', ]
 
+extras_require = {
+    'async': ['httpx>=0.23.0'],
+    'jwt': ['PyJWT[crypto]>=2.0.0'],
+    'orjson': ['orjson>=3.0.0'],
+}
+
 tests_require = [
     'responses==0.10.1',
     'coverage==7.3',
@@ -14,6 +20,7 @@ tests_require = [
     'pytest-flake8==1.0.6',
     'flake8==3.8.2',
     'wheel==0.38.1',
+    'httpx>=0.23.0',
 ]
 
 
@@ -35,6 +42,7 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     zip_safe=False,
     install_requires=install_requires,
+    extras_require=extras_require,
     setup_requires=['pytest-runner'],
     tests_require=tests_require
 )
@@ -0,0 +1,345 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import SalesforcePy as sfdc
+import testutil
+from SalesforcePy import records
+from SalesforcePy import tokens
+
+
+def get_async_client(*res_keys, **kwargs):
+    fixtures = [testutil.load_response(res_key) for res_key in res_keys]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        url = str(request.url).split("?")[0]
+        for res in fixtures:
+            if res["method"] == request.method and res["url"] == url:
+                body = b"" if res["body"] is None else json.dumps(res["body"]).encode("utf-8")
+                return httpx.Response(
+                    res["status_code"], content=body, headers={"Content-Type": res["content_type"]})
+        return httpx.Response(404)
+
+    client = sfdc.async_client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret,
+        http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs
+    )
+    client.requests = requests
+    return client
+
+
+def test_login():
+    client = get_async_client("login_response_200", "api_version_response_200")
+
+    login_result = asyncio.run(client.login())
+
+    assert login_result[0] == testutil.mock_responses["login_response_200"]["body"]
+    assert client.session_id == login_result[0]["access_token"]
+    assert client.instance_url == "eu11.salesforce.com"
+    assert client.client_kwargs["version"] == "37.0"
+
+
+def test_login_resumes_stored_token():
+    token_store = tokens.MemoryTokenStore()
+    first = get_async_client("login_response_200", "api_version_response_200", token_store=token_store)
+    second = get_async_client(token_store=token_store)
+
+    asyncio.run(first.login())
+    login_result = asyncio.run(second.login())
+
+    assert login_result[1].from_cache
+    assert second.requests == []
+    assert second.session_id == first.session_id
+    assert second.client_kwargs["version"] == "37.0"
+
+
+def test_expired_session_is_renewed_once():
+    login_body = testutil.load_response("login_response_200")["body"]
+    query_body = testutil.load_response("query_response_200")["body"]
+    state = {"logins": 0, "valid": None}
+
+    async def handler(request):
+        if request.url.path == "/services/oauth2/token":
+            state["logins"] += 1
+            state["valid"] = "SESSION_%d" % state["logins"]
+            return httpx.Response(200, json=dict(login_body, access_token=state["valid"]))
+        elif request.headers.get("Authorization") == "OAuth %s" % state["valid"]:
+            return httpx.Response(200, json=query_body)
+        await asyncio.sleep(0.01)
+        return httpx.Response(401, json=[{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}])
+
+    async def main():
+        client = sfdc.async_client(
+            username=testutil.username,
+            password=testutil.password,
+            client_id=testutil.client_id,
+            client_secret=testutil.client_secret,
+            http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            version="37.0"
+        )
+        await client.login()
+        state["valid"] = None
+        results = await asyncio.gather(*[client.query("SELECT Id FROM Account") for i in range(5)])
+        return client, results
+
+    (client, results) = asyncio.run(main())
+
+    assert [r[1].status for r in results] == [200] * 5
+    assert state["logins"] == 2
+    assert client.session_id == "SESSION_2"
+    assert client.auth.refreshes == 1
+
+
+def test_query():
+    client = get_async_client("login_response_200", "query_response_200", version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    query_result = asyncio.run(run())
+
+    assert query_result[0] == testutil.mock_responses["query_response_200"]["body"]
+    assert query_result[1].status == 200
+    assert client.requests[-1].headers["Authorization"] == "OAuth %s" % client.session_id
+
+
+def test_query_more_multibatch():
+    client = get_async_client(
+        "login_response_200",
+        "query_more_multibatch_0_200",
+        "query_more_multibatch_1_200",
+        "query_more_multibatch_2_200",
+        version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.query_more("SELECT Id FROM Lead")
+
+    query_result = asyncio.run(run())
+
+    assert query_result[0][0] == testutil.mock_responses["query_more_multibatch_0_200"]["body"]
+    assert query_result[0][1] == testutil.mock_responses["query_more_multibatch_1_200"]["body"]
+    assert query_result[0][2] == testutil.mock_responses["query_more_multibatch_2_200"]["body"]
+
+
+def test_query_more_multibatch_negative():
+    client = get_async_client(
+        "login_response_200",
+        "query_more_multibatch_0_200",
+        "query_more_multibatch_1_no_body",
+        version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.query_more("SELECT Id FROM Lead")
+
+    query_result = asyncio.run(run())
+
+    assert query_result[0] is None
+    assert len(query_result[1].exceptions) == 1
+
+
+def test_query_more_compact():
+    client = get_async_client(
+        "login_response_200",
+        "query_more_multibatch_0_200",
+        "query_more_multibatch_1_200",
+        "query_more_multibatch_2_200",
+        version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.query_more("SELECT Id FROM Lead", compact=True)
+
+    query_result = asyncio.run(run())
+
+    assert all(isinstance(page["records"][0], records.Record) for page in query_result[0])
+    assert len(set(id(page["records"][0]._schema) for page in query_result[0])) == 1
+
+
+def test_query_more_error():
+    errors = [{"message": "unexpected token: FORM", "errorCode": "MALFORMED_QUERY"}]
+
+    def handler(request):
+        return httpx.Response(400, json=errors)
+
+    client = sfdc.async_client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret,
+        http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        version="37.0",
+        retry=False
+    )
+    client.session_id = "SESSION"
+    client.set_instance_url("https://eu11.salesforce.com")
+
+    query_result = asyncio.run(client.query_more("SELECT Id FORM Lead"))
+
+    assert query_result[0] == [errors]
+    assert query_result[1].status == 400
+
+
+def test_api_version_discovery_error():
+    login_body = testutil.load_response("login_response_200")["body"]
+
+    def handler(request):
+        if request.url.path == "/services/data/":
+            raise httpx.ConnectError("Connection reset by peer", request=request)
+        return httpx.Response(200, json=login_body)
+
+    client = sfdc.async_client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret,
+        http=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    login_result = asyncio.run(client.login())
+
+    assert login_result[1].exceptions == []
+    assert client.session_id == login_body["access_token"]
+    assert client.client_kwargs["version"] == "37.0"
+
+
+def test_sobjects_insert_update_delete_concurrently():
+    client = get_async_client(
+        "login_response_200",
+        "insert_response_201",
+        "update_response_204",
+        "delete_response_204",
+        version="37.0")
+
+    async def run():
+        await client.login()
+        return await asyncio.gather(
+            client.sobjects(object_type="Account").insert({"Name": "sfdc_py"}),
+            client.sobjects(id="0010Y0000055YG7QAM", object_type="Account").update({"Name": "sfdc_py 2"}),
+            client.sobjects(id="0010Y0000055YG7QAM", object_type="Account").delete())
+
+    (insert_result, update_result, delete_result) = asyncio.run(run())
+
+    assert insert_result[0] == testutil.mock_responses["insert_response_201"]["body"]
+    assert insert_result[1].status == 201
+    assert update_result[0] is None
+    assert update_result[1].status == 204
+    assert delete_result[0] is None
+    assert delete_result[1].status == 204
+
+
+def test_jobs_ingest_create():
+    client = get_async_client("login_response_200", "jobs_create_200", version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.jobs.ingest.create(
+            job_resource={"object": "Account", "operation": "insert", "lineEnding": "CRLF"})
+
+    create_result = asyncio.run(run())
+
+    assert create_result[0] == testutil.mock_responses["jobs_create_200"]["body"]
+    assert create_result[1].status == 200
+
+
+def test_jobs_ingest_batches_sends_csv_content():
+    client = get_async_client("login_response_200", "jobs_batches_201", version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.jobs.ingest.batches(job_id="7500Y00000BSfbrQAD", csv_file="Name\nsfdc_py\n")
+
+    batches_result = asyncio.run(run())
+
+    assert batches_result[1].status == 201
+    assert client.requests[-1].content == b"Name\nsfdc_py\n"
+    assert client.requests[-1].headers["Content-Type"] == "text/csv"
+
+
+def test_jobs_ingest_batches_streams_rows():
+    client = get_async_client("login_response_200", "jobs_batches_201", version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.jobs.ingest.batches(
+            job_id="7500Y00000BSfbrQAD", csv_file=[["Name"], ["sfdc_py"]], chunk_size=4)
+
+    batches_result = asyncio.run(run())
+
+    assert batches_result[1].status == 201
+    assert client.requests[-1].content == b"Name\nsfdc_py\n"
+
+
+def test_wave_query():
+    client = get_async_client("login_response_200", "wave_query_response_200", version="37.0")
+
+    async def run():
+        await client.login()
+        return await client.wave.query({"query": "q = load \"0Fb0N000000XgqzSAC/0Fc0N000001uxlUSAQ\";"})
+
+    query_result = asyncio.run(run())
+
+    assert query_result[0] == testutil.mock_responses["wave_query_response_200"]["body"]
+    assert query_result[1].status == 200
+
+
+def test_einstein_llm_embeddings():
+    client = get_async_client("login_response_200", "einstein_llm_embeddings_200", version="58.0")
+
+    async def run():
+        await client.login()
+        return await client.einstein.llm.embeddings({"input": ["Hello world"]})
+
+    embeddings_result = asyncio.run(run())
+
+    assert embeddings_result[0] == testutil.mock_responses["einstein_llm_embeddings_200"]["body"]
+    assert embeddings_result[1].status == 200
+
+
+def test_query_retried_after_503():
+    query_body = testutil.load_response("query_response_200")["body"]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=query_body)
+
+    client = sfdc.async_client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret,
+        http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        version="37.0",
+        retry=True
+    )
+    client.session_id = "SESSION"
+    client.set_instance_url("https://eu11.salesforce.com")
+
+    query_result = asyncio.run(client.query("SELECT Id FROM Account"))
+
+    assert query_result[1].status == 200
+    assert len(calls) == 3
+    assert client.retry_policy.get_stats() == {"GET /services/data/v37.0/query/": {"retries": 2, "wait": 0.0}}
+
+
+def test_collections_unsupported():
+    client = get_async_client()
+    controller = client.sobjects(object_type="Account")
+
+    for (method, args) in (("insert_many", [{"Name": "sfdc_py"}]), ("update_many", [{"Id": "0010Y0000055YG7QAM"}]),
+                           ("upsert_many", [{"Name": "sfdc_py"}]), ("delete_many", ["0010Y0000055YG7QAM"])):
+        with pytest.raises(NotImplementedError, match="%s\\(\\) is not supported by AsyncClient" % method):
+            getattr(controller, method)(args)
@@ -1,6 +1,11 @@
+import concurrent.futures
+
 import testutil
+import requests
 import responses
 import SalesforcePy.sfdc as sfdc
+from SalesforcePy import cache
+from SalesforcePy import commons
 
 
 @responses.activate
@@ -84,3 +89,88 @@ def test_non_200_api_version():
     )
     login_obj = client.login()
     assert login_obj[1].api_version == "37.0"  # as specified in config.__default_api_version__
+
+
+@responses.activate
+def test_api_version_discovery_error():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_response_200")
+    responses.add(responses.GET, "https://eu11.salesforce.com/services/data/",
+                  body=requests.exceptions.ConnectionError("Connection reset by peer"))
+    client = sfdc.client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret,
+        retry=False
+    )
+    client.login()
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+    login_obj = client.login()
+
+    assert query_result[1].status == 200
+    assert query_result[1].api_version == "37.0"
+    assert login_obj[1].exceptions == []
+
+
+def test_failed_api_version_discovery_is_dropped():
+    version = concurrent.futures.Future()
+    version.set_exception(requests.exceptions.ConnectionError("Connection reset by peer"))
+
+    client_kwargs = commons.resolve_kwargs({"version": version, "timeout": "30"})
+
+    assert client_kwargs == {"timeout": "30"}
+
+
+@responses.activate
+def test_api_version_discovered_in_background():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("query_response_200")
+    client = sfdc.client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret
+    )
+    client.login()
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    assert client.client_kwargs["version"] == "37.0"
+    assert query_result[1].api_version == "37.0"
+
+
+@responses.activate
+def test_api_version_cache(tmp_path):
+    path = str(tmp_path / "versions.json")
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+
+    for i in range(2):
+        client = sfdc.client(
+            username=testutil.username,
+            password=testutil.password,
+            client_id=testutil.client_id,
+            client_secret=testutil.client_secret,
+            version_cache=cache.VersionCache(path=path)
+        )
+        client.login()
+        commons.resolve_kwargs(client.client_kwargs)
+        assert client.client_kwargs["version"] == "37.0"
+
+    version_calls = [c for c in responses.calls if c.request.url.endswith(sfdc.VERSIONS_SERVICE)]
+    assert len(version_calls) == 1
+    assert cache.VersionCache(ttl=0, path=path).get("eu11.salesforce.com") is None
+
+
+def test_api_version_cache_invalidate(tmp_path):
+    path = str(tmp_path / "versions.json")
+    version_cache = cache.VersionCache(path=path)
+    version_cache.put("eu11.salesforce.com", "45.0")
+    version_cache.put("na1.salesforce.com", "44.0")
+
+    version_cache.invalidate("eu11.salesforce.com")
+
+    assert cache.VersionCache(path=path).get("eu11.salesforce.com") is None
+    assert cache.VersionCache(path=path).get("na1.salesforce.com") == "44.0"
+    assert [p.name for p in tmp_path.iterdir()] == ["versions.json"]
@@ -0,0 +1,138 @@
+import io
+import json
+import re
+import threading
+import time
+
+import responses
+
+import testutil
+
+JOBS_QUERY_URL = "https://eu11.salesforce.com/services/data/v37.0/jobs/query"
+JOB_ID = "7500Y00000BSfbsQAD"
+ROWS = ["0010Y00000%05dAAA" % i for i in range(10)]
+
+
+class SlowBody(io.BufferedReader):
+    """ Response body which takes `delay` seconds to start streaming, and reports when it has been read """
+    def __init__(self, data, delay, on_done):
+        super(SlowBody, self).__init__(io.BytesIO(data))
+        self.delay = delay
+        self.on_done = on_done
+
+    def read(self, *args, **kwargs):
+        time.sleep(self.delay)
+        self.delay = 0
+        data = super(SlowBody, self).read(*args, **kwargs)
+        if not data and self.on_done is not None:
+            (on_done, self.on_done) = (self.on_done, None)
+            on_done()
+        return data
+
+
+def add_results_callback(max_records, delays=None):
+    """ Serves ROWS in chunks of max_records, the body of each chunk taking delays[index] seconds to stream """
+    delays = delays or {}
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def done():
+        with lock:
+            state["active"] -= 1
+
+    def callback(request):
+        offset = int(request.params.get("locator", 0))
+        assert int(request.params["maxRecords"]) == max_records
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        chunk = ROWS[offset:offset + max_records]
+        locator = str(offset + max_records) if offset + max_records < len(ROWS) else "null"
+        body = '"Id"\n' + "".join('"%s"\n' % r for r in chunk)
+        return 200, {"Sforce-Locator": locator}, SlowBody(
+            body.encode("utf-8"), delays.get(offset // max_records, 0), done)
+
+    responses.add_callback(
+        responses.GET, JOBS_QUERY_URL + "/" + JOB_ID + "/results", callback=callback, content_type="text/csv")
+    return state
+
+
+@responses.activate
+def test_create_get_abort_delete():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    job = {"id": JOB_ID, "operation": "query", "object": "Account", "state": "UploadComplete"}
+    responses.add(responses.POST, JOBS_QUERY_URL, json=job)
+    responses.add(responses.GET, JOBS_QUERY_URL + "/" + JOB_ID, json=dict(job, state="JobComplete"))
+    responses.add(responses.PATCH, JOBS_QUERY_URL + "/" + JOB_ID, json=dict(job, state="Aborted"))
+    responses.add(responses.DELETE, JOBS_QUERY_URL + "/" + JOB_ID, status=204)
+
+    client = testutil.get_client()
+    create_result = client.jobs.query.create("SELECT Id FROM Account", operation="queryAll")
+    get_result = client.jobs.query.get(job_id=JOB_ID)
+    abort_result = client.jobs.query.abort(JOB_ID)
+    delete_result = client.jobs.query.delete(JOB_ID)
+
+    assert create_result[0] == job
+    assert json.loads(responses.calls[2].request.body) == {"operation": "queryAll", "query": "SELECT Id FROM Account"}
+    assert get_result[0]["state"] == "JobComplete"
+    assert abort_result[0]["state"] == "Aborted"
+    assert json.loads(responses.calls[4].request.body) == {"state": "Aborted"}
+    assert delete_result[1].status == 204
+
+
+@responses.activate
+def test_results_downloads_chunks_concurrently_in_order():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    state = add_results_callback(3, delays={0: 0.2, 1: 0.1})
+
+    client = testutil.get_client()
+    results = client.jobs.query.results(JOB_ID, max_records=3, max_workers=4)
+
+    assert [row["Id"] for row in results[0]] == ROWS
+    assert results[1].pages == 4
+    assert state["peak"] > 1
+    assert results[1].exceptions == []
+
+
+@responses.activate
+def test_download_writes_chunks_in_order(tmp_path):
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    add_results_callback(4, delays={0: 0.1})
+
+    client = testutil.get_client()
+    path = tmp_path / "accounts.csv"
+    download_result = client.jobs.query.download(JOB_ID, path, max_records=4)
+
+    assert path.read_text() == '"Id"\n' + "".join('"%s"\n' % r for r in ROWS)
+    assert download_result[0] == path.stat().st_size
+
+
+@responses.activate
+def test_results_negative():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add(responses.GET, re.compile(JOBS_QUERY_URL + "/.*/results"), status=400,
+                  json=[{"errorCode": "INVALIDJOBSTATE", "message": "Job is not complete"}])
+
+    client = testutil.get_client()
+    results = client.jobs.query.results(JOB_ID)
+
+    assert list(results[0]) == []
+    assert results[1].status == 400
+    assert len(results[1].exceptions) == 1
+
+
+@responses.activate
+def test_results_column_delimiter():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add(responses.GET, JOBS_QUERY_URL + "/" + JOB_ID + "/results", content_type="text/csv",
+                  headers={"Sforce-Locator": "null"}, body='"Id"\t"Name"\n"%s"\t"Acme, Inc."\n' % ROWS[0])
+
+    client = testutil.get_client()
+    results = client.jobs.query.results(JOB_ID, column_delimiter="TAB")
+
+    assert list(results[0]) == [{"Id": ROWS[0], "Name": "Acme, Inc."}]
@@ -0,0 +1,156 @@
+import json
+
+import responses
+
+import testutil
+from SalesforcePy import cache
+from SalesforcePy import sfdc
+
+DESCRIBE_URL = "https://eu11.salesforce.com/services/data/v37.0/sobjects/Idea/describe"
+RECORD_URL = "https://eu11.salesforce.com/services/data/v37.0/sobjects/Account/0010Y0000056ljcQAA"
+RECORD_ID = "0010Y0000056ljcQAA"
+ETAG = '"3f2a9c"'
+LAST_MODIFIED = "Tue, 08 Jan 2019 10:00:00 GMT"
+
+
+def get_client(describe_cache=None, **kwargs):
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    client = sfdc.client(
+        testutil.username, testutil.password, testutil.client_id, testutil.client_secret,
+        describe_cache=describe_cache, **kwargs)
+    client.login()
+    return client
+
+
+def add_describe_callback():
+    body = testutil.load_response("describe_response_200")["body"]
+    conditional_headers = []
+
+    def callback(request):
+        conditional_headers.append((request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since")))
+        if request.headers.get("If-None-Match") == ETAG:
+            return 304, {"ETag": ETAG}, ""
+        return 200, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED}, json.dumps(body)
+
+    responses.add_callback(responses.GET, DESCRIBE_URL, callback=callback)
+    return body, conditional_headers
+
+
+@responses.activate
+def test_describe_cache_fresh():
+    (body, conditional_headers) = add_describe_callback()
+    client = get_client(cache.DescribeCache(ttl=60))
+
+    first = client.sobjects(object_type="Idea").describe()
+    second = client.sobjects(object_type="Idea").describe()
+
+    assert first[0] == second[0] == body
+    assert (first[1].from_cache, second[1].from_cache) == (False, True)
+    assert conditional_headers == [(None, None)]
+
+
+@responses.activate
+def test_describe_cache_revalidates():
+    (body, conditional_headers) = add_describe_callback()
+    client = get_client(cache.DescribeCache(ttl=0))
+
+    client.sobjects(object_type="Idea").describe()
+    describe_result = client.sobjects(object_type="Idea").describe()
+
+    assert describe_result[0] == body
+    assert describe_result[1].status == 304
+    assert describe_result[1].from_cache
+    assert describe_result[1].exceptions == []
+    assert conditional_headers == [(None, None), (ETAG, LAST_MODIFIED)]
+
+
+@responses.activate
+def test_describe_cache_on_disk(tmp_path):
+    (body, conditional_headers) = add_describe_callback()
+    path = str(tmp_path / "describe.sqlite3")
+    get_client(cache.DescribeCache(path=path)).sobjects(object_type="Idea").describe()
+
+    describe_cache = cache.DescribeCache(path=path)
+    describe_result = get_client(describe_cache).sobjects(object_type="Idea").describe()
+
+    assert describe_result[0] == body
+    assert describe_result[1].from_cache
+    assert len(conditional_headers) == 1
+
+    describe_cache.invalidate("Idea")
+    assert cache.DescribeCache(path=path).get(("eu11.salesforce.com", "37.0", "Idea", "/describe")) is None
+
+
+@responses.activate
+def test_describe_cache_keyed_by_resource():
+    (body, conditional_headers) = add_describe_callback()
+    basic_info = {"objectDescribe": {"name": "Idea"}, "recentItems": []}
+    responses.add(responses.GET, DESCRIBE_URL[:-len("/describe")], json=basic_info)
+    client = get_client(cache.DescribeCache(ttl=60))
+
+    describe_result = client.sobjects(object_type="Idea").describe()
+    basic_info_result = client.sobjects(object_type="Idea").describe_global()
+
+    assert describe_result[0] == body
+    assert basic_info_result[0] == basic_info
+    assert basic_info_result[1].from_cache is False
+
+
+def test_lru_cache():
+    lru = cache.LRUCache(2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    lru.get("a")
+    lru.put("c", 3)
+
+    assert lru.keys() == ["a", "c"]
+    assert lru.pop("a") == 1
+    assert "a" not in lru
+
+
+@responses.activate
+def test_record_cache_hit():
+    testutil.add_response("query_sobj_row_response")
+    record_cache = cache.RecordCache()
+    client = get_client(record_cache=record_cache)
+
+    first = client.sobjects(object_type="Account", id=RECORD_ID).query()
+    second = client.sobjects(object_type="Account", id=RECORD_ID[:15]).query()
+
+    assert first[0] == second[0] == testutil.mock_responses["query_sobj_row_response"]["body"]
+    assert (first[1].from_cache, second[1].from_cache) == (False, True)
+    assert len([c for c in responses.calls if c.request.url == RECORD_URL]) == 1
+    assert record_cache.get_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+@responses.activate
+def test_record_cache_invalidated_by_update():
+    testutil.add_response("query_sobj_row_response")
+    testutil.add_response("query_sobj_row_response")
+    responses.add(responses.PATCH, RECORD_URL, status=204)
+    record_cache = cache.RecordCache()
+    client = get_client(record_cache=record_cache)
+
+    client.sobjects(object_type="Account", id=RECORD_ID).query()
+    client.sobjects(object_type="Account", id=RECORD_ID).update({"Name": "sfdc_py 2"})
+    query_result = client.sobjects(object_type="Account", id=RECORD_ID).query()
+
+    assert not query_result[1].from_cache
+    assert record_cache.get_stats() == {"hits": 0, "misses": 2, "size": 1}
+
+
+def test_record_cache_expiry_and_invalidation():
+    record_cache = cache.RecordCache(ttl=0)
+    key = record_cache.get_key("eu11.salesforce.com", "Account", RECORD_ID)
+    record_cache.put(key, {"Id": RECORD_ID})
+    assert record_cache.get(key) is None
+    assert len(record_cache.entries) == 0
+
+    record_cache = cache.RecordCache()
+    external_key = record_cache.get_key("eu11.salesforce.com", "Account", "A-1", "External_Id__c")
+    record_cache.put(key, {"Id": RECORD_ID})
+    record_cache.put(external_key, {"Id": RECORD_ID})
+    record_cache.invalidate("eu11.salesforce.com", "Account", RECORD_ID[:15])
+    assert record_cache.get(key) is None
+    assert record_cache.get(external_key) is None
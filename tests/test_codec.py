@@ -0,0 +1,68 @@
+import json
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import codec
+from SalesforcePy import sfdc
+
+
+class CountingCodec(codec.JsonCodec):
+    def __init__(self):
+        self.calls = []
+
+    def loads(self, data):
+        self.calls.append(("loads", type(data)))
+        return super(CountingCodec, self).loads(data)
+
+    def dumps(self, value):
+        self.calls.append(("dumps", type(value)))
+        return super(CountingCodec, self).dumps(value)
+
+
+def test_get_codec():
+    assert codec.get_codec("json").loads(b'{"a": [1, 2.5]}') == {"a": [1, 2.5]}
+    assert codec.get_codec("json") is codec.get_codec("json")
+    assert codec.get_codec().name == next(n for n in codec.PREFERRED_CODECS if codec.AVAILABLE[n])
+
+    with pytest.raises(ValueError):
+        codec.get_codec("yaml")
+
+
+def test_orjson_codec():
+    orjson_codec = codec.get_codec("orjson") if codec.AVAILABLE["orjson"] else pytest.skip("orjson is not installed")
+
+    assert orjson_codec.loads(b'{"Name": "\\u00e9"}') == {"Name": "é"}
+    assert json.loads(orjson_codec.dumps({1: 2 ** 70}).decode("utf-8")) == {"1": 2 ** 70}
+
+
+@responses.activate
+def test_client_codec():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("insert_response_201")
+    counting_codec = CountingCodec()
+    client = sfdc.client(
+        testutil.username, testutil.password, testutil.client_id, testutil.client_secret, codec=counting_codec)
+    client.login()
+
+    create_result = client.sobjects(object_type="Account").insert({"Name": "sfdc_py"})
+
+    assert create_result[0] == testutil.mock_responses["insert_response_201"]["body"]
+    assert json.loads(responses.calls[-1].request.body) == {"Name": "sfdc_py"}
+    assert ("dumps", dict) in counting_codec.calls
+    assert all(data_type is bytes for (method, data_type) in counting_codec.calls if method == "loads")
+
+
+@responses.activate
+def test_pre_serialised_body():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("insert_response_201")
+    client = testutil.get_client()
+
+    client.sobjects(object_type="Account").insert(b'{"Name":"sfdc_py"}')
+
+    assert responses.calls[-1].request.body == b'{"Name":"sfdc_py"}'
+    assert responses.calls[-1].request.headers["Content-Type"] == "application/json"
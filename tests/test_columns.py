@@ -0,0 +1,87 @@
+import json
+import math
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import columns
+
+QUERY_URL = "https://eu11.salesforce.com/services/data/v37.0/query/"
+
+
+def get_opportunity(i, owner=True):
+    return {
+        "attributes": {"type": "Opportunity", "url": "/services/data/v37.0/sobjects/Opportunity/006%015d" % i},
+        "Id": "006%015d" % i,
+        "Amount": None if i == 1 else 1000 * i,
+        "Probability": 0.5 if i % 2 else 1,
+        "IsWon": i % 2 == 0,
+        "CloseDate": "2019-01-%02d" % (i + 1),
+        "CreatedDate": "2019-01-%02dT10:00:00.000+0000" % (i + 1),
+        "Account": None if not owner else {
+            "attributes": {"type": "Account"},
+            "Name": "Account %d" % i,
+            "Owner": {"attributes": {"type": "User"}, "Name": "Owner %d" % i}}}
+
+
+def test_column_table():
+    table = columns.ColumnTable().add_records([get_opportunity(0, owner=False)] + [get_opportunity(i) for i in (1, 2)])
+
+    assert list(table.keys()) == [
+        "Id", "Amount", "Probability", "IsWon", "CloseDate", "CreatedDate", "Account.Name", "Account.Owner.Name"]
+    assert len(table) == 3
+    assert table["Amount"].kind == "int"
+    assert table["Amount"].to_list() == [0, None, 2000]
+    assert table["Probability"].kind == "double"
+    assert table["Probability"].to_list() == [1.0, 0.5, 1.0]
+    assert table["IsWon"].to_list() == [True, False, True]
+    assert table["CloseDate"].kind == "date"
+    assert table["CloseDate"].values.tolist() == [17897, 17898, 17899]
+    assert table["CreatedDate"].to_list(raw=True)[2] == "2019-01-03T10:00:00.000+0000"
+    assert table["Account.Owner.Name"].to_list() == [None, "Owner 1", "Owner 2"]
+
+
+def test_column_falls_back_to_object():
+    column = columns.Column()
+    for value in ("2019-01-01", None, "not a date"):
+        column.append(value)
+
+    assert column.kind == "object"
+    assert column.to_list() == ["2019-01-01", None, "not a date"]
+    assert math.isnan(columns.Column("double", 1).values[0])
+
+
+def test_parse_datetime():
+    assert columns.parse_datetime("1970-01-01T01:00:00.250+0100") == 250
+    assert columns.parse_datetime("1970-01-02T00:00:00Z") == 86400000
+    assert columns.parse_datetime("Acme") is None
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    table = columns.ColumnTable().add_records([get_opportunity(i) for i in (1, 2, 3)])
+    arrays = table.to_numpy()
+
+    assert numpy.shares_memory(arrays["Probability"], numpy.frombuffer(table["Probability"].values))
+    assert numpy.isnan(arrays["Amount"][0])
+    assert str(arrays["CloseDate"].dtype) == "datetime64[D]"
+    assert arrays["Account.Name"].tolist() == ["Account 1", "Account 2", "Account 3"]
+
+
+@responses.activate
+def test_query_columns():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    next_url = "/services/data/v37.0/query/01gD0000002HU6KIAW-2000"
+    responses.add(responses.GET, QUERY_URL, status=200, body=json.dumps({
+        "totalSize": 3, "done": False, "nextRecordsUrl": next_url, "records": [get_opportunity(1)]}))
+    responses.add(responses.GET, "https://eu11.salesforce.com" + next_url, status=200, body=json.dumps({
+        "totalSize": 3, "done": True, "records": [get_opportunity(2), get_opportunity(3)]}))
+    client = testutil.get_client()
+
+    table, query_more = client.query_columns("SELECT Id, Amount FROM Opportunity", types={"Amount": "double"})
+
+    assert query_more.exceptions == []
+    assert table["Amount"].kind == "double"
+    assert table.to_dict()["Account.Name"] == ["Account 1", "Account 2", "Account 3"]
@@ -0,0 +1,217 @@
+import json
+import threading
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import composite
+
+COLLECTIONS_URL = "https://eu11.salesforce.com/services/data/v37.0/composite/sobjects"
+BATCH_URL = "https://eu11.salesforce.com/services/data/v37.0/composite/batch"
+
+
+def echo_collection_callback(request):
+    records = json.loads(request.body)["records"]
+    body = [{"id": "001%012d" % int(r["Name"]), "success": True, "errors": []} for r in records]
+    return 200, {}, json.dumps(body)
+
+
+@responses.activate
+def test_insert_many():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("composite_sobjects_insert_200")
+
+    client = testutil.get_client()
+    insert_result = client.sobjects(object_type="Account").insert_many([{"Name": "sfdc_py"}, {}], all_or_none=False)
+
+    assert insert_result[0] == testutil.mock_responses["composite_sobjects_insert_200"]["body"]
+    assert insert_result[1].requests[0].status == 200
+    assert json.loads(responses.calls[-1].request.body) == {
+        "allOrNone": False,
+        "records": [
+            {"attributes": {"type": "Account"}, "Name": "sfdc_py"},
+            {"attributes": {"type": "Account"}}]}
+
+
+@responses.activate
+def test_insert_many_splits_into_collections_of_200():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add_callback(responses.POST, COLLECTIONS_URL, callback=echo_collection_callback)
+
+    client = testutil.get_client()
+    records = [{"Name": str(i)} for i in range(450)]
+    insert_result = client.sobjects(object_type="Account").insert_many(records)
+
+    assert len(insert_result[1].requests) == 3
+    assert sorted(len(json.loads(c.request.body)["records"]) for c in responses.calls[-3:]) == [50, 200, 200]
+    assert [r["id"] for r in insert_result[0]] == ["001%012d" % i for i in range(450)]
+
+
+@responses.activate
+def test_update_many_negative():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("composite_sobjects_401")
+
+    client = testutil.get_client()
+    update_result = client.sobjects(object_type="Account").update_many(
+        [{"Id": "0010Y0000055YG7QAM", "Name": "a"}, {"Id": "0010Y0000055YG8QAM", "Name": "b"}])
+
+    assert [r["success"] for r in update_result[0]] == [False, False]
+    assert update_result[0][0]["errors"][0]["errorCode"] == "INVALID_SESSION_ID"
+    assert update_result[1].requests[0].status == 401
+
+
+@responses.activate
+def test_upsert_many_uses_external_id():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add_callback(responses.PATCH, COLLECTIONS_URL + "/Account/External_Id__c",
+                           callback=echo_collection_callback)
+
+    client = testutil.get_client()
+    upsert_result = client.sobjects(object_type="Account", external_id="External_Id__c").upsert_many(
+        [{"Name": "1", "External_Id__c": "A-1"}])
+
+    assert upsert_result[0] == [{"id": "001000000000001", "success": True, "errors": []}]
+
+
+@responses.activate
+def test_delete_many():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("composite_sobjects_delete_200")
+
+    client = testutil.get_client()
+    delete_result = client.sobjects(object_type="Account").delete_many(
+        ["0010Y0000055YG7QAM", "0010Y0000055YG8QAM"], all_or_none=True)
+
+    assert delete_result[0] == testutil.mock_responses["composite_sobjects_delete_200"]["body"]
+    assert responses.calls[-1].request.params == {
+        "ids": "0010Y0000055YG7QAM,0010Y0000055YG8QAM", "allOrNone": "true"}
+
+
+@responses.activate
+def test_batch():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("composite_batch_200")
+
+    client = testutil.get_client()
+    batch_result = client.composite.batch([
+        {"method": "PATCH", "url": "v37.0/sobjects/Account/0010Y0000055YG7QAM", "richInput": {"Name": "sfdc_py"}},
+        {"method": "GET", "url": "v37.0/sobjects/Account/0010Y0000055YG7QAM?fields=Name"}])
+
+    assert batch_result[0] == testutil.mock_responses["composite_batch_200"]["body"]["results"]
+    assert json.loads(responses.calls[-1].request.body)["haltOnError"] is False
+
+
+@responses.activate
+def test_batch_splits_into_batches_of_25():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+
+    def callback(request):
+        batch_requests = json.loads(request.body)["batchRequests"]
+        body = {"hasErrors": False, "results": [{"statusCode": 200, "result": r["url"]} for r in batch_requests]}
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(responses.POST, BATCH_URL, callback=callback)
+
+    client = testutil.get_client()
+    urls = ["v37.0/sobjects/Account/001%012d" % i for i in range(60)]
+    batch_result = client.composite.batch([{"method": "GET", "url": url} for url in urls])
+
+    assert len(batch_result[1].requests) == 3
+    assert [r["result"] for r in batch_result[0]] == urls
+
+
+@responses.activate
+def test_insert_many_adapts_concurrency_to_request_limits():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "throttled": 0}
+
+    def callback(request):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            throttle = state["active"] > 2
+            state["throttled"] += 1 if throttle else 0
+        try:
+            if throttle:
+                body = [{"message": "ConcurrentPerOrgLongTxn Limit exceeded", "errorCode": "REQUEST_LIMIT_EXCEEDED"}]
+                return 403, {}, json.dumps(body)
+            threading.Event().wait(0.01)
+            return echo_collection_callback(request)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    responses.add_callback(responses.POST, COLLECTIONS_URL, callback=callback)
+
+    client = testutil.get_client()
+    records = [{"Name": str(i)} for i in range(2000)]
+    insert_result = client.sobjects(object_type="Account").insert_many(records, max_workers=8, backoff=0, retries=10)
+    executor = insert_result[1]
+
+    assert [r["id"] for r in insert_result[0]] == ["001%012d" % i for i in range(2000)]
+    assert executor.throttled == state["throttled"]
+    assert executor.limit.limit <= 8
+    assert len(executor.latencies) == 10 + executor.throttled
+    assert executor.throughput > 0
+    assert executor.exceptions == []
+
+
+@responses.activate
+def test_insert_many_gives_up_on_throttled_chunk():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add(responses.POST, COLLECTIONS_URL, status=503, body="")
+
+    client = testutil.get_client()
+    insert_result = client.sobjects(object_type="Account").insert_many([{"Name": "sfdc_py"}], backoff=0, retries=2)
+
+    assert insert_result[0][0]["success"] is False
+    assert insert_result[1].throttled == 3
+    assert insert_result[1].limit.limit == 1
+
+
+@responses.activate
+def test_delete_many_throttled_chunk_retried_once_per_executor_retry():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add(responses.DELETE, COLLECTIONS_URL, status=503, body="", headers={"Retry-After": "0"})
+
+    client = testutil.get_client(retry=True)
+    delete_result = client.sobjects(object_type="Account").delete_many(["0010Y0000055YG7QAM"], backoff=0, retries=2)
+
+    assert len([c for c in responses.calls if c.request.method == "DELETE"]) == 3
+    assert delete_result[1].throttled == 3
+    assert client.retry_policy.get_stats() == {}
+
+
+def test_concurrency_limit():
+    limit = composite.ConcurrencyLimit(4, initial=2)
+
+    limit.acquire()
+    limit.release(throttled=False)
+    limit.acquire()
+    limit.release(throttled=False)
+    assert limit.limit == 3
+    limit.acquire()
+    limit.release(throttled=True)
+    assert limit.limit == 1
+
+
+def test_executor_requires_hooks():
+    class Executor(composite.ConcurrentExecutor):
+        def get_request(self, chunk):
+            return None
+
+    with pytest.raises(TypeError):
+        Executor(None, [])
@@ -1,12 +1,28 @@
+import gzip
+import io
+import json
 import os
+import re
+import threading
 import testutil
 import responses
+from SalesforcePy import jobs
 
 tests_dir = os.path.dirname(os.path.realpath(__file__))
 
 ACCOUNTS_INSERT_BULK_CSV = os.path.join(tests_dir, "fixtures/accounts_insert_bulk.csv")
 ACCOUNTS_INSERT_JOB = {"object": "Account", "operation": "insert", "lineEnding": "CRLF"}
 UPLOAD_COMPLETED = "UploadComplete"
+BATCHES_URL = "https://eu11.salesforce.com/services/data/v37.0/jobs/ingest/7500Y00000BSfbrQAD/batches"
+
+
+def add_batches_callback(uploads):
+    def callback(request):
+        body = request.body if isinstance(request.body, (str, bytes)) else b"".join(request.body)
+        uploads.append((request.headers, body))
+        return 201, {}, ""
+
+    responses.add_callback(responses.PUT, BATCHES_URL, callback=callback)
 
 
 @responses.activate
@@ -180,3 +196,356 @@ def test_delete_job():
 
     assert delete_result[0] == testutil.mock_responses.get("jobs_delete_204").get("body")
     assert delete_result[1].status == 204
+
+
+@responses.activate
+def test_batches_streams_file_path_and_file_object():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    uploads = []
+    add_batches_callback(uploads)
+
+    client = testutil.get_client()
+    client.jobs.ingest.batches(job_id="7500Y00000BSfbrQAD", csv_file=ACCOUNTS_INSERT_BULK_CSV, chunk_size=16)
+    with open(ACCOUNTS_INSERT_BULK_CSV, "rb") as f:
+        client.jobs.ingest.batches(job_id="7500Y00000BSfbrQAD", csv_file=f, chunk_size=16)
+        f.seek(0)
+        expected = f.read()
+
+    assert [body for (headers, body) in uploads] == [expected, expected]
+    assert uploads[0][0]["Transfer-Encoding"] == "chunked"
+
+
+@responses.activate
+def test_batches_streams_rows_with_gzip():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    uploads = []
+    add_batches_callback(uploads)
+
+    client = testutil.get_client()
+    rows = ({"Name": "Account %s" % i, "Description": "a, \"quoted\" value"} for i in range(1000))
+    client.jobs.ingest.batches(job_id="7500Y00000BSfbrQAD", csv_file=rows, gzip=True, chunk_size=1024)
+
+    (headers, body) = uploads[0]
+    lines = gzip.decompress(body).decode("utf-8").split("\n")
+
+    assert headers["Content-Encoding"] == "gzip"
+    assert lines[0] == "Name,Description"
+    assert lines[1] == 'Account 0,"a, ""quoted"" value"'
+    assert len(lines) == 1002
+
+
+def test_iter_csv_chunks():
+    chunks = list(jobs.iter_csv(io.StringIO("Name\n" + "sfdc_py\n" * 100), chunk_size=64))
+    row_chunks = list(jobs.iter_rows([["Name"], ["sfdc_py"]], line_ending="CRLF"))
+
+    assert b"".join(chunks) == b"Name\n" + b"sfdc_py\n" * 100
+    assert max(len(c) for c in chunks) == 64
+    assert row_chunks == [b"Name\r\nsfdc_py\r\n"]
+
+
+def add_load_callbacks(uploads, fail_upload=None):
+    jobs_url = "https://eu11.salesforce.com/services/data/v37.0/jobs/ingest"
+    created = []
+
+    def create_callback(request):
+        job = dict(json.loads(request.body), id="7500Y00000BSf%05d" % len(created), state="Open")
+        created.append(job)
+        return 200, {}, json.dumps(job)
+
+    def batches_callback(request):
+        job_id = request.url.split("/")[-2]
+        uploads[job_id] = b"".join(request.body).decode("utf-8")
+        if job_id == fail_upload:
+            return 400, {}, json.dumps([{"errorCode": "INVALIDJOBSTATE", "message": "Closed"}])
+        return 201, {}, ""
+
+    def update_callback(request):
+        job_id = request.url.split("/")[-1]
+        return 200, {}, json.dumps({"id": job_id, "state": json.loads(request.body)["state"]})
+
+    responses.add_callback(responses.POST, jobs_url, callback=create_callback)
+    responses.add_callback(responses.PUT, re.compile(jobs_url + "/.*/batches"), callback=batches_callback)
+    responses.add_callback(responses.PATCH, re.compile(jobs_url + "/.*"), callback=update_callback)
+
+
+@responses.activate
+def test_load_splits_rows_across_jobs():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    uploads = {}
+    add_load_callbacks(uploads)
+
+    client = testutil.get_client()
+    rows = ({"Name": "Account %03d" % i} for i in range(100))
+    load_result = client.jobs.ingest.load("Account", "insert", rows, max_bytes=256, max_workers=3)
+
+    job_ids = load_result[1].job_ids
+    parts = [uploads[job_id].split("\n") for job_id in job_ids]
+
+    assert len(job_ids) > 1
+    assert all(job["state"] == "UploadComplete" for job in load_result[0])
+    assert all(part[0] == "Name" and len("\n".join(part)) <= 256 for part in parts)
+    assert [row for part in parts for row in part[1:] if row] == ["Account %03d" % i for i in range(100)]
+    assert json.loads(responses.calls[2].request.body) == {
+        "object": "Account", "operation": "insert", "contentType": "CSV"}
+
+
+@responses.activate
+def test_load_aborts_job_on_failed_upload():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    uploads = {}
+    add_load_callbacks(uploads, fail_upload="7500Y00000BSf00000")
+
+    client = testutil.get_client()
+    load_result = client.jobs.ingest.load(
+        "Account", "upsert", [["Name", "Ext__c"], ["sfdc_py", "A-1"]], external_id="Ext__c")
+
+    assert load_result[0] == [{"id": "7500Y00000BSf00000", "state": "Aborted"}]
+    assert [r.status for r in load_result[1].requests[0]] == [200, 400, 200]
+    assert uploads["7500Y00000BSf00000"] == "Name,Ext__c\nsfdc_py,A-1\n"
+
+
+def add_job_info_callback(states):
+    """ Serves job info, moving each job through the states listed for it, one per poll """
+    polls = {}
+
+    def callback(request):
+        job_id = request.url.split("/")[-1]
+        polls[job_id] = polls.get(job_id, 0) + 1
+        state = states[job_id][min(polls[job_id], len(states[job_id])) - 1]
+        return 200, {}, json.dumps({"id": job_id, "state": state})
+
+    responses.add_callback(
+        responses.GET, re.compile("https://eu11.salesforce.com/services/data/v37.0/jobs/ingest/.+"), callback=callback)
+    return polls
+
+
+@responses.activate
+def test_watch_many_jobs_with_backoff():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    states = {
+        "7500Y00000BSf00001": ["InProgress", "InProgress", "JobComplete"],
+        "7500Y00000BSf00002": ["InProgress", "Failed"],
+        "7500Y00000BSf00003": ["Aborted"]}
+    polls = add_job_info_callback(states)
+
+    client = testutil.get_client()
+    completed = []
+    futures = [client.jobs.ingest.watch(
+        job_id, callback=completed.append, initial_interval=0.01, max_interval=0.02)[0] for job_id in states]
+
+    results = [f.result(timeout=5) for f in futures]
+
+    assert [r["state"] for r in results] == ["JobComplete", "Failed", "Aborted"]
+    assert sorted(j["id"] for j in completed) == sorted(states)
+    assert polls == {"7500Y00000BSf00001": 3, "7500Y00000BSf00002": 2, "7500Y00000BSf00003": 1}
+    assert client.jobs.ingest.get_monitor().polls == 6
+
+
+@responses.activate
+def test_run_job():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    add_load_callbacks({})
+    add_job_info_callback({"7500Y00000BSf00000": ["InProgress", "JobComplete"]})
+
+    client = testutil.get_client()
+    run_result = client.jobs.ingest.run(ACCOUNTS_INSERT_JOB, ACCOUNTS_INSERT_BULK_CSV, initial_interval=0.01)
+
+    assert run_result[0].result(timeout=5) == {"id": "7500Y00000BSf00000", "state": "JobComplete"}
+
+
+def test_job_cancelled_mid_poll():
+    polling = threading.Event()
+    cancelled = threading.Event()
+    states = {"7500Y00000BSf00001": ["JobComplete"], "7500Y00000BSf00002": ["InProgress", "InProgress", "JobComplete"]}
+
+    class Namespace(object):
+        def get(self, job_id, **kwargs):
+            if job_id == "7500Y00000BSf00001":
+                polling.set()
+                cancelled.wait(5)
+            return {"id": job_id, "state": states[job_id].pop(0)}, None
+
+    monitor = jobs.JobMonitor(Namespace(), initial_interval=0.01, max_interval=0.02)
+    first = monitor.watch("7500Y00000BSf00001")
+    second = monitor.watch("7500Y00000BSf00002")
+
+    assert polling.wait(5)
+    assert first.cancel()
+    cancelled.set()
+
+    assert second.result(timeout=5)["state"] == "JobComplete"
+    assert first.cancelled()
+
+
+@responses.activate
+def test_watch_settings_per_job():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    polls = add_job_info_callback({"7500Y00000BSf00001": ["JobComplete"], "7500Y00000BSf00002": ["JobComplete"]})
+
+    client = testutil.get_client()
+    slow = client.jobs.ingest.watch("7500Y00000BSf00001", initial_interval=60)[0]
+    fast = client.jobs.ingest.watch("7500Y00000BSf00002", initial_interval=0.01)[0]
+
+    assert fast.result(timeout=5)["state"] == "JobComplete"
+    assert not slow.done()
+    assert polls == {"7500Y00000BSf00002": 1}
+    client.jobs.ingest.get_monitor().close()
+
+
+def test_job_monitor_interval():
+    monitor = jobs.JobMonitor(None, initial_interval=1.0, max_interval=10.0, jitter=0.2)
+
+    assert 0.8 <= monitor.get_interval(0) <= 1.0
+    assert 3.2 <= monitor.get_interval(2) <= 4.0
+    assert 8.0 <= monitor.get_interval(10) <= 10.0
+
+
+def add_results_callback(pages):
+    """ Serves one CSV page per request, following the locator sent back in Sforce-Locator """
+    def callback(request):
+        index = int(request.params.get("locator", 0))
+        headers = {"Sforce-Locator": str(index + 1) if index + 1 < len(pages) else "null"}
+        return 200, headers, pages[index]
+
+    responses.add_callback(
+        responses.GET,
+        re.compile("https://eu11.salesforce.com/services/data/v37.0/jobs/ingest/7500Y00000BSfbrQAD/.+"),
+        callback=callback, content_type="text/csv")
+
+
+RESULT_PAGES = [
+    '"sf__Id","sf__Created","Name"\n"0010Y0000055YG7QAM","true","Account 1"\n',
+    '"sf__Id","sf__Created","Name"\n"0010Y0000055YG8QAM","true","Account ""2"", with\nnewline"\n'
+]
+
+
+@responses.activate
+def test_results_streams_rows_across_locators():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    add_results_callback(RESULT_PAGES)
+
+    client = testutil.get_client()
+    results = client.jobs.ingest.results("7500Y00000BSfbrQAD", max_records=1, chunk_size=8)
+    rows = list(results[0])
+
+    assert [r["sf__Id"] for r in rows] == ["0010Y0000055YG7QAM", "0010Y0000055YG8QAM"]
+    assert rows[1]["Name"] == 'Account "2", with\nnewline'
+    assert results[1].pages == 2
+    assert responses.calls[-1].request.params == {"locator": "1", "maxRecords": "1"}
+    assert responses.calls[-1].request.url.split("?")[0].endswith("/successfulResults")
+
+
+@responses.activate
+def test_download_writes_results_to_file(tmp_path):
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    add_results_callback(RESULT_PAGES)
+
+    client = testutil.get_client()
+    path = str(tmp_path / "failures.csv")
+    download_result = client.jobs.ingest.download("7500Y00000BSfbrQAD", path, failures=True, chunk_size=8)
+
+    with open(path) as f:
+        content = f.read()
+
+    assert content == RESULT_PAGES[0] + RESULT_PAGES[1].split("\n", 1)[1]
+    assert download_result[0] == len(content.encode("utf-8"))
+    assert responses.calls[-1].request.url.split("?")[0].endswith("/failedResults")
+
+
+@responses.activate
+def test_results_negative():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add(responses.GET, re.compile(".*/unprocessedrecords"), status=404, json=[{"errorCode": "NOT_FOUND"}])
+
+    client = testutil.get_client()
+    results = client.jobs.ingest.results("7500Y00000BSfbrQAD", unprocessed=True)
+
+    assert list(results[0]) == []
+    assert results[1].status == 404
+    assert len(results[1].exceptions) == 1
+
+
+def add_job_pages_callback(jobs_by_page):
+    """ Serves one page of jobs per request, linked by nextRecordsUrl """
+    url = "https://eu11.salesforce.com/services/data/v37.0/jobs/ingest"
+
+    def callback(request):
+        index = int(request.params.get("queryLocator", 0))
+        done = index + 1 == len(jobs_by_page)
+        body = {
+            "done": done,
+            "records": jobs_by_page[index],
+            "nextRecordsUrl": None if done else "/services/data/v37.0/jobs/ingest?queryLocator=%s" % (index + 1)}
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(responses.GET, url, callback=callback)
+
+
+def get_job(i, modstamp="2018-12-05T10:56:43.000+0000"):
+    return {"id": "7500Y00000BSf%05d" % i, "state": "JobComplete", "systemModstamp": modstamp}
+
+
+@responses.activate
+def test_list_follows_next_records_url_with_filters():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    add_job_pages_callback([[get_job(0), get_job(1)], [get_job(2)], [get_job(3)]])
+
+    client = testutil.get_client()
+    list_result = client.jobs.ingest.list(
+        is_pk_chunking_enabled=False, job_type="V2Ingest", concurrency_mode="parallel")
+
+    assert [j["id"] for j in list_result[0]] == ["7500Y00000BSf%05d" % i for i in range(4)]
+    assert responses.calls[2].request.params == {
+        "isPkChunkingEnabled": "false", "jobType": "V2Ingest", "concurrencyMode": "parallel"}
+    assert responses.calls[-1].request.params == {"queryLocator": "2"}
+
+
+@responses.activate
+def test_poller_returns_changed_jobs():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    pages = [[get_job(0), get_job(1, "2018-12-06T10:00:00.000+0000")], [get_job(2)]]
+    add_job_pages_callback(pages)
+
+    client = testutil.get_client()
+    poller = client.jobs.ingest.poller(since="2018-12-05T12:00:00.000+0000")
+    first = poller.poll()
+    pages[1] = [get_job(2, "2018-12-07T10:00:00.000+0000"), get_job(3, "2018-12-07T11:00:00.000+0000")]
+    second = poller.poll()
+    third = poller.poll()
+
+    assert [j["id"] for j in first] == ["7500Y00000BSf00001"]
+    assert [j["id"] for j in second] == ["7500Y00000BSf00002", "7500Y00000BSf00003"]
+    assert third == []
+
+
+@responses.activate
+def test_poller_forgets_finished_jobs():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    running = dict(get_job(1, "2018-12-06T10:00:00.000+0000"), state="InProgress")
+    pages = [[get_job(0), running]]
+    add_job_pages_callback(pages)
+
+    client = testutil.get_client()
+    poller = client.jobs.ingest.poller()
+    first = poller.poll()
+    pages[0] = [get_job(0), get_job(1, "2018-12-06T10:05:00.000+0000")]
+    second = poller.poll()
+    third = poller.poll()
+
+    assert [j["id"] for j in first] == ["7500Y00000BSf00000", "7500Y00000BSf00001"]
+    assert [j["state"] for j in second] == ["JobComplete"]
+    assert third == []
+    assert poller.seen == {}
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import jsonstream
+
+PAGE = {
+    "totalSize": 3,
+    "done": False,
+    "nextRecordsUrl": "/services/data/v37.0/query/01gD0000002HU6KIAW-2000",
+    "records": [{
+        "attributes": {"type": "Account", "url": "/services/data/v37.0/sobjects/Account/0010Y000004zOE%dQAM" % i},
+        "Id": "0010Y000004zOE%dQAM" % i,
+        "Name": "Acme \"%d\" \\ {[" % i,
+        "Description": "é" * 100,
+        "AnnualRevenue": 1.5e6 * i,
+        "Owner": {"attributes": {"type": "User"}, "Name": "Jane }"},
+        "Contacts": None} for i in range(3)]}
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 100000])
+def test_record_stream(size):
+    stream = jsonstream.RecordStream()
+    records = list(stream.parse(split(json.dumps(PAGE, ensure_ascii=False).encode("utf-8"), size)))
+
+    assert records == PAGE["records"]
+    assert stream.page == {k: v for (k, v) in PAGE.items() if k != "records"}
+
+
+@pytest.mark.parametrize("size", [1, 7, 100000])
+def test_record_stream_fields(size):
+    stream = jsonstream.RecordStream(fields=["Name", "AnnualRevenue"])
+    records = list(stream.parse(split(json.dumps(PAGE).encode("utf-8"), size)))
+
+    assert records == [
+        {"attributes": r["attributes"], "Name": r["Name"], "AnnualRevenue": r["AnnualRevenue"]}
+        for r in PAGE["records"]]
+    assert stream.page["nextRecordsUrl"] == PAGE["nextRecordsUrl"]
+
+
+def test_record_stream_is_incremental():
+    chunks = split(json.dumps(PAGE).encode("utf-8"), 16)
+    consumed = []
+
+    def produce():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    next(jsonstream.RecordStream().parse(produce()))
+
+    assert len(consumed) < len(chunks) / 2
+
+
+def test_record_stream_negative():
+    with pytest.raises(ValueError):
+        list(jsonstream.RecordStream().parse([b'{"records": [{"Id": "1"}']))
+    assert list(jsonstream.RecordStream("searchRecords").parse([b'[{"Id": 1', b'2}]'])) == [{"Id": 12}]
+
+
+@responses.activate
+def test_query_iter_stream():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_more_multibatch_0_200")
+    testutil.add_response("query_more_multibatch_1_200")
+    testutil.add_response("query_more_multibatch_2_200")
+    testutil.add_response("api_version_response_200")
+    client = testutil.get_client()
+
+    records, qm = client.query_iter("SELECT Id FROM Lead", stream=True, fields=["Id"], chunk_size=256)
+    expected = [
+        {"attributes": record["attributes"], "Id": record["Id"]}
+        for i in range(3)
+        for record in testutil.mock_responses["query_more_multibatch_%d_200" % i]["body"]["records"]]
+
+    assert list(records) == expected
+    assert qm.exceptions == []
+
+
+@responses.activate
+def test_query_iter_stream_negative():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add(
+        responses.GET, "https://eu11.salesforce.com/services/data/v37.0/query/", status=400,
+        body=json.dumps([{"message": "unexpected token", "errorCode": "MALFORMED_QUERY"}]))
+    client = testutil.get_client()
+
+    records, qm = client.query_iter("SELECT FROM Lead", stream=True)
+
+    assert list(records) == []
+    assert qm.status == 400
+    assert "MALFORMED_QUERY" in str(qm.exceptions[0])
+
+
+@responses.activate
+def test_search_iter():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("search_response_200")
+    client = testutil.get_client()
+
+    records, search = client.search_iter("FIND {sfdc_py} RETURNING Account(Id, Name) LIMIT 5")
+
+    assert list(records) == testutil.mock_responses["search_response_200"]["body"]["searchRecords"]
+    assert search.status == 200
@@ -0,0 +1,87 @@
+import json
+import time
+from urllib.parse import parse_qs
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import oauth
+from SalesforcePy import sfdc
+
+TOKEN_URL = "https://login.salesforce.com/services/oauth2/token"
+
+
+def get_client():
+    return sfdc.client(
+        testutil.username, testutil.password, testutil.client_id, testutil.client_secret, version="37.0")
+
+
+def add_token_callback(**extra):
+    state = {"payloads": []}
+    login_body = testutil.load_response("login_response_200")["body"]
+
+    def callback(request):
+        state["payloads"].append({k: v[0] for (k, v) in parse_qs(request.body).items()})
+        access_token = "SESSION_%d" % len(state["payloads"])
+        return 200, {}, json.dumps(dict(login_body, access_token=access_token, **extra))
+
+    responses.add_callback(responses.POST, TOKEN_URL, callback=callback)
+    return state
+
+
+@responses.activate
+def test_login_via_refresh_token():
+    state = add_token_callback(refresh_token="REFRESH_2")
+    client = get_client()
+
+    login_result = client.login_via_refresh_token("REFRESH_1")
+    client.relogin(refresh=True)
+
+    assert login_result[1].status == 200
+    assert client.session_id == "SESSION_2"
+    assert client.instance_url == "eu11.salesforce.com"
+    assert state["payloads"][0] == {
+        "grant_type": "refresh_token",
+        "client_id": testutil.client_id,
+        "client_secret": testutil.client_secret,
+        "refresh_token": "REFRESH_1"}
+    assert state["payloads"][1]["refresh_token"] == "REFRESH_2"
+
+
+@responses.activate
+def test_login_via_jwt_assertion():
+    state = add_token_callback()
+    assertions = iter(["ASSERTION_1", "ASSERTION_2"])
+    client = get_client()
+
+    client.login_via_jwt(assertion=lambda: next(assertions))
+    client.relogin(refresh=True)
+
+    assert client.session_id == "SESSION_2"
+    assert [p["grant_type"] for p in state["payloads"]] == [oauth.JWT_BEARER_GRANT] * 2
+    assert [p["assertion"] for p in state["payloads"]] == ["ASSERTION_1", "ASSERTION_2"]
+
+
+def test_jwt_assertion_requires_pyjwt(monkeypatch):
+    monkeypatch.setattr(oauth, "jwt", None)
+    with pytest.raises(ImportError):
+        oauth.get_jwt_assertion(testutil.client_id, testutil.username, "key")
+
+
+@responses.activate
+def test_token_refresher():
+    add_token_callback()
+    client = get_client()
+    client.login()
+
+    refresher = client.start_token_refresher(interval=0.01)
+    deadline = time.time() + 5
+    while refresher.refreshes == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    client.close()
+
+    assert refresher.refreshes >= 1
+    assert not refresher.thread.is_alive()
+    assert client.session_id != "SESSION_1"
+    assert "SESSION_1" in client.auth.stale
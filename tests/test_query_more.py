@@ -1,7 +1,10 @@
+import pytest
 import responses
+import time
 
 import SalesforcePy as sfdc
 import testutil
+from SalesforcePy import commons
 
 
 @responses.activate
@@ -56,3 +59,91 @@ def test_query_more_multibatch_negative():
     client = testutil.get_client()
     query_result = client.query_more("SELECT Id FROM Lead")
     assert query_result[0] is None
+
+
+@responses.activate
+def test_query_iter_records():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_more_multibatch_0_200")
+    testutil.add_response("query_more_multibatch_1_200")
+    testutil.add_response("query_more_multibatch_2_200")
+    testutil.add_response("api_version_response_200")
+    client = testutil.get_client()
+    records, qm = client.query_iter("SELECT Id FROM Lead")
+    expected = [
+        record
+        for i in range(3)
+        for record in testutil.mock_responses["query_more_multibatch_%s_200" % i]["body"]["records"]]
+
+    assert list(records) == expected
+    assert qm.exceptions == []
+
+
+@responses.activate
+def test_query_iter_pages_are_lazy():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_more_multibatch_0_200")
+    testutil.add_response("query_more_multibatch_1_200")
+    testutil.add_response("query_more_multibatch_2_200")
+    testutil.add_response("api_version_response_200")
+    client = testutil.get_client()
+    calls_after_login = len(responses.calls)
+    pages, qm = client.query_iter("SELECT Id FROM Lead", pages=True)
+
+    assert len(responses.calls) == calls_after_login
+    assert next(pages) == testutil.mock_responses["query_more_multibatch_0_200"]["body"]
+    assert len(responses.calls) == calls_after_login + 1
+    assert next(pages) == testutil.mock_responses["query_more_multibatch_1_200"]["body"]
+    assert len(responses.calls) == calls_after_login + 2
+
+
+@responses.activate
+def test_query_iter_negative():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_more_multibatch_0_200")
+    testutil.add_response("query_more_multibatch_1_no_body")
+    testutil.add_response("api_version_response_200")
+    client = testutil.get_client()
+    pages, qm = client.query_iter("SELECT Id FROM Lead", pages=True)
+
+    assert list(pages) == [testutil.mock_responses["query_more_multibatch_0_200"]["body"]]
+    assert len(qm.exceptions) == 1
+
+
+@responses.activate
+def test_query_iter_prefetch():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_more_multibatch_0_200")
+    testutil.add_response("query_more_multibatch_1_200")
+    testutil.add_response("query_more_multibatch_2_200")
+    testutil.add_response("api_version_response_200")
+    client = testutil.get_client()
+    calls_after_login = len(responses.calls)
+    pages, qm = client.query_iter("SELECT Id FROM Lead", pages=True, prefetch=1)
+
+    assert next(pages) == testutil.mock_responses["query_more_multibatch_0_200"]["body"]
+
+    deadline = time.time() + 5
+    while len(responses.calls) < calls_after_login + 2 and time.time() < deadline:
+        time.sleep(0.01)
+
+    # The second batch is requested while the first one is being consumed
+    assert len(responses.calls) >= calls_after_login + 2
+    assert list(pages) == [
+        testutil.mock_responses["query_more_multibatch_1_200"]["body"],
+        testutil.mock_responses["query_more_multibatch_2_200"]["body"]]
+    assert qm.exceptions == []
+
+
+def test_prefetch_reraises_after_buffered_items():
+    def items():
+        yield 1
+        yield 2
+        raise ValueError("boom")
+
+    prefetched = commons.prefetch(items(), depth=2)
+
+    assert next(prefetched) == 1
+    assert next(prefetched) == 2
+    with pytest.raises(ValueError):
+        next(prefetched)
@@ -0,0 +1,116 @@
+import json
+import re
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import soql
+
+QUERY_URL = "https://eu11.salesforce.com/services/data/v37.0/query/"
+LEAD_IDS = ["00Q0Y00000%05dAAA" % i for i in range(0, 1000, 7)]
+
+
+def lead_query_callback(failures=None):
+    """ Serves queries over LEAD_IDS, evaluating the Id range conditions added by ParallelQuery """
+    failures = failures if failures is not None else {}
+
+    def callback(request):
+        qs = request.params["q"]
+        ids = sorted(LEAD_IDS)
+
+        for lower in re.findall(r"Id >= '(\w+)'", qs):
+            ids = [i for i in ids if i[:15] >= lower]
+        for upper in re.findall(r"Id < '(\w+)'", qs):
+            ids = [i for i in ids if i[:15] < upper]
+
+        if qs.endswith("ORDER BY Id ASC LIMIT 1"):
+            ids = ids[:1]
+        elif qs.endswith("ORDER BY Id DESC LIMIT 1"):
+            ids = ids[-1:]
+        elif failures.get(qs, 0) > 0:
+            failures[qs] -= 1
+            return 200, {}, "null"
+
+        body = {"totalSize": len(ids), "done": True, "records": [
+            {"attributes": {"type": "Lead"}, "Id": i} for i in ids]}
+        return 200, {}, json.dumps(body)
+
+    return callback
+
+
+@responses.activate
+def test_query_parallel_by_id():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add_callback(responses.GET, QUERY_URL, callback=lead_query_callback())
+    client = testutil.get_client()
+
+    query_result = client.query_parallel("SELECT Id FROM Lead", chunks=4, max_workers=2)
+
+    assert [r["Id"] for r in query_result[0]] == sorted(LEAD_IDS)
+    assert len(query_result[1].get_chunk_queries()) == 4
+    assert query_result[1].exceptions == []
+
+
+@responses.activate
+def test_query_parallel_stream():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    responses.add_callback(responses.GET, QUERY_URL, callback=lead_query_callback())
+    client = testutil.get_client()
+
+    records, pq = client.query_parallel("SELECT Id FROM Lead WHERE IsConverted = false", chunks=3, stream=True)
+
+    assert sorted(r["Id"] for r in records) == sorted(LEAD_IDS)
+    assert all("(IsConverted = false) AND (Id" in qs for qs in pq.get_chunk_queries())
+
+
+@responses.activate
+def test_query_parallel_retries_failed_chunk():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    failures = {}
+    responses.add_callback(responses.GET, QUERY_URL, callback=lead_query_callback(failures))
+    client = testutil.get_client()
+    pq_result = client.query_parallel("SELECT Id FROM Lead", chunks=2, retries=1, stream=True)
+    failures[pq_result[1].get_chunk_queries()[0]] = 1
+
+    assert sorted(r["Id"] for r in pq_result[0]) == sorted(LEAD_IDS)
+    assert pq_result[1].exceptions == []
+
+
+@responses.activate
+def test_query_parallel_negative():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    failures = {}
+    responses.add_callback(responses.GET, QUERY_URL, callback=lead_query_callback(failures))
+    client = testutil.get_client()
+    pq_result = client.query_parallel("SELECT Id FROM Lead", chunks=2, retries=1, stream=True)
+    failures[pq_result[1].get_chunk_queries()[1]] = 2
+
+    boundary = soql.id_boundaries(min(LEAD_IDS), max(LEAD_IDS), 2)[0]
+
+    assert sorted(r["Id"] for r in pq_result[0]) == sorted(i for i in LEAD_IDS if i[:15] < boundary)
+    assert len(pq_result[1].exceptions) == 1
+
+
+def test_query_parallel_rejects_limit():
+    with pytest.raises(ValueError):
+        soql.check_sliceable("SELECT Id FROM Lead LIMIT 10")
+
+
+def test_add_condition_ignores_subqueries_and_literals():
+    qs = "SELECT Id, (SELECT Id FROM Contacts WHERE Name = 'x') FROM Account WHERE Name = 'A LIMIT' ORDER BY Id"
+
+    assert soql.add_condition(qs, "Id < '001000000000000'") == (
+        "SELECT Id, (SELECT Id FROM Contacts WHERE Name = 'x') FROM Account "
+        "WHERE (Name = 'A LIMIT') AND (Id < '001000000000000') ORDER BY Id")
+    soql.check_sliceable(qs)
+
+
+def test_datetime_boundaries():
+    boundaries = soql.datetime_boundaries("2019-01-01T00:00:00.000+0000", "2019-01-05T00:00:00.000+0000", 4)
+
+    assert boundaries == ["2019-01-02T00:00:00Z", "2019-01-03T00:00:00Z", "2019-01-04T00:00:00Z"]
@@ -0,0 +1,105 @@
+import concurrent.futures
+import json
+import threading
+import time
+
+import responses
+
+import testutil
+from SalesforcePy import sfdc
+
+LOGIN_URL = "https://login.salesforce.com/services/oauth2/token"
+QUERY_URL = "https://eu11.salesforce.com/services/data/v37.0/query/"
+INSERT_URL = "https://eu11.salesforce.com/services/data/v37.0/sobjects/Account"
+INVALID_SESSION = [{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}]
+
+
+def get_client():
+    client = sfdc.client(
+        testutil.username, testutil.password, testutil.client_id, testutil.client_secret, version="37.0")
+    client.login()
+    return client
+
+
+def add_session_callbacks(delay=0):
+    state = {"logins": 0, "valid": None, "lock": threading.Lock()}
+    login_body = testutil.load_response("login_response_200")["body"]
+    query_body = testutil.load_response("query_response_200")["body"]
+
+    def login(request):
+        with state["lock"]:
+            state["logins"] += 1
+            state["valid"] = "SESSION_%d" % state["logins"]
+        return 200, {}, json.dumps(dict(login_body, access_token=state["valid"]))
+
+    def authorized(body, status):
+        def callback(request):
+            if request.headers.get("Authorization") == "OAuth %s" % state["valid"]:
+                return status, {}, json.dumps(body)
+            time.sleep(delay)
+            return 401, {}, json.dumps(INVALID_SESSION)
+        return callback
+
+    responses.add_callback(responses.POST, LOGIN_URL, callback=login)
+    responses.add_callback(responses.GET, QUERY_URL, callback=authorized(query_body, 200))
+    responses.add_callback(responses.POST, INSERT_URL, callback=authorized({"id": "0010Y0000055YG7QAM"}, 201))
+    return state
+
+
+@responses.activate
+def test_expired_session_is_renewed_and_replayed():
+    state = add_session_callbacks()
+    client = get_client()
+    state["valid"] = None
+
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    assert query_result[1].status == 200
+    assert query_result[1].exceptions == []
+    assert client.session_id == "SESSION_2"
+    assert state["logins"] == 2
+    assert (client.auth.refreshes, client.auth.replays) == (1, 1)
+
+
+@responses.activate
+def test_concurrent_requests_renew_once():
+    state = add_session_callbacks(delay=0.05)
+    client = get_client()
+    state["valid"] = None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda i: client.query("SELECT Id, Name FROM Account LIMIT 10"), range(8)))
+
+    assert [r[1].status for r in results] == [200] * 8
+    assert state["logins"] == 2
+    assert client.auth.refreshes == 1
+
+
+@responses.activate
+def test_stale_request_uses_renewed_session():
+    state = add_session_callbacks()
+    client = get_client()
+    state["valid"] = None
+
+    stale_query = sfdc.Query(
+        client.session_id, client.instance_url, "SELECT Id, Name FROM Account LIMIT 10", **client.client_kwargs)
+    client.query("SELECT Id, Name FROM Account LIMIT 10")
+    stale_query.request()
+
+    assert stale_query.status == 200
+    assert stale_query.get_headers()["Authorization"] == "OAuth SESSION_1"
+    assert client.auth.replays == 1
+
+
+@responses.activate
+def test_non_idempotent_request_is_not_replayed():
+    state = add_session_callbacks()
+    client = get_client()
+    state["valid"] = None
+
+    insert_result = client.sobjects(object_type="Account").insert({"Name": "sfdc_py"})
+
+    assert insert_result[1].status == 401
+    assert client.session_id == "SESSION_2"
+    assert (client.auth.refreshes, client.auth.replays) == (1, 0)
@@ -0,0 +1,65 @@
+import os
+
+import responses
+
+import testutil
+from SalesforcePy import jobs
+from SalesforcePy import reconcile
+
+RESULTS_URL = "https://eu11.salesforce.com/services/data/v37.0/jobs/ingest/7500Y00000BSfbrQAD/%s"
+
+
+def test_record_passes_rows_through():
+    rows = [["Name", "Ext__c"], ["a", "1"], ["b", "2"]]
+
+    with reconcile.ReconciliationIndex(key_columns=["Ext__c"]) as index:
+        recorded = list(index.record(iter(rows)))
+
+        assert recorded == rows
+        assert [o["key"] for o in index.iter_outcomes()] == [{"Ext__c": "1"}, {"Ext__c": "2"}]
+        assert index.get_counts() == {"missing": 2}
+
+
+def test_match_assigns_duplicates_in_order(tmp_path):
+    path = str(tmp_path / "index.sqlite3")
+    index = reconcile.ReconciliationIndex(path)
+    list(index.record([{"Name": "a"}, {"Name": "b"}, {"Name": "a"}]))
+
+    unmatched = index.match([{"sf__Id": "001A", "sf__Created": "true", "Name": "a"}, {"Name": "z"}], "success")
+    index.match([{"sf__Id": "", "sf__Error": "DUPLICATE_VALUE:dup", "Name": "a"}], "failure")
+    outcomes = list(index.iter_outcomes())
+    index.close()
+
+    assert unmatched == 1
+    assert [(o["status"], o["id"], o["error"]) for o in outcomes] == [
+        ("success", "001A", None), ("missing", None, None), ("failure", None, "DUPLICATE_VALUE:dup")]
+    assert os.path.exists(path)
+
+
+@responses.activate
+def test_join_job_results():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    uploads = []
+    responses.add_callback(responses.PUT, RESULTS_URL % "batches",
+                           callback=lambda request: uploads.append(b"".join(request.body)) or (201, {}, ""))
+    responses.add(responses.GET, RESULTS_URL % "successfulResults", content_type="text/csv",
+                  body='"sf__Id","sf__Created","Name","Ext__c"\n"001A","true","b","2"\n')
+    responses.add(responses.GET, RESULTS_URL % "failedResults", content_type="text/csv",
+                  body='"sf__Id","sf__Error","Name","Ext__c"\n"","REQUIRED_FIELD_MISSING:Name","","3"\n')
+    responses.add(responses.GET, RESULTS_URL % "unprocessedrecords", content_type="text/csv",
+                  body='"Name","Ext__c"\n"a","1"\n')
+
+    client = testutil.get_client()
+    rows = [{"Name": "a", "Ext__c": "1"}, {"Name": "b", "Ext__c": "2"}, {"Name": None, "Ext__c": "3"}]
+
+    with reconcile.ReconciliationIndex(key_columns=["Ext__c"]) as index:
+        client.jobs.ingest.batches("7500Y00000BSfbrQAD", index.record(rows))
+        join_result = index.join(client.jobs.ingest, "7500Y00000BSfbrQAD")
+        outcomes = list(index.iter_outcomes())
+
+    assert join_result[0] == 0
+    assert [o["status"] for o in outcomes] == ["unprocessed", "success", "failure"]
+    assert outcomes[1]["id"] == "001A"
+    assert outcomes[2]["error"] == "REQUIRED_FIELD_MISSING:Name"
+    assert uploads == [b"".join(jobs.iter_rows(rows))]
@@ -0,0 +1,125 @@
+import json
+import tracemalloc
+
+import responses
+
+import testutil
+from SalesforcePy import records
+
+QUERY_URL = "https://eu11.salesforce.com/services/data/v37.0/query/"
+URL_PREFIX = "/services/data/v37.0/sobjects/Contact/"
+
+
+def get_contact(i):
+    return {
+        "attributes": {"type": "Contact", "url": URL_PREFIX + "0030Y00000%05dAAA" % i},
+        "Id": "0030Y00000%05dAAA" % i,
+        "FirstName": "First %d" % i,
+        "LastName": "Last %d" % i,
+        "Email": "contact%d@example.com" % i,
+        "Account": {
+            "attributes": {"type": "Account", "url": "/services/data/v37.0/sobjects/Account/0010Y000004zOE5QAM"},
+            "Name": "GenePoint"}}
+
+
+def test_compact_record_behaves_like_dict():
+    contact = get_contact(1)
+    record = records.compact(contact, records.SchemaCache())
+
+    assert record == contact
+    assert record["FirstName"] == "First 1"
+    assert record.get("Phone") is None
+    assert record["Account"]["Name"] == "GenePoint"
+    assert record["attributes"] == contact["attributes"]
+    assert record["Account"]["attributes"] == contact["Account"]["attributes"]
+    assert list(record.keys()) == list(contact.keys())
+    assert records.to_dict(record) == contact
+    assert type(record.to_dict()["Account"]) is dict
+
+
+def test_compact_shares_schemas():
+    cache = records.SchemaCache()
+    page = records.compact_page({"totalSize": 2, "done": True, "records": [get_contact(1), get_contact(2)]}, cache)
+
+    assert page["records"][0]._schema is page["records"][1]._schema
+    assert len(cache) == 2
+
+
+def test_compact_subquery():
+    account = {
+        "attributes": {"type": "Account", "url": "/services/data/v37.0/sobjects/Account/0010Y000004zOE5QAM"},
+        "Id": "0010Y000004zOE5QAM",
+        "Contacts": {"totalSize": 2, "done": True, "records": [get_contact(1), get_contact(2)]}}
+    record = records.compact(account, records.SchemaCache())
+
+    assert isinstance(record["Contacts"]["records"][1], records.Record)
+    assert record == account
+    assert record.to_dict() == account
+
+
+def test_compact_uses_less_memory():
+    page = json.dumps({"totalSize": 5000, "done": True, "records": [get_contact(i) for i in range(5000)]})
+
+    def measure(compact):
+        tracemalloc.start()
+        try:
+            result = json.loads(page)
+            if compact:
+                records.compact_page(result, records.SchemaCache())
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    assert measure(True) < measure(False) * 0.75
+
+
+@responses.activate
+def test_query_compact():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("query_response_200")
+    client = testutil.get_client()
+
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10", compact=True)
+    expected = testutil.mock_responses["query_response_200"]["body"]
+
+    assert all(isinstance(r, records.Record) for r in query_result[0]["records"])
+    assert query_result[0] == expected
+    assert query_result[1].status == 200
+
+
+@responses.activate
+def test_query_more_compact_shares_schemas_across_batches():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("query_more_multibatch_0_200")
+    testutil.add_response("query_more_multibatch_1_200")
+    testutil.add_response("query_more_multibatch_2_200")
+    client = testutil.get_client()
+
+    query_result = client.query_more("SELECT Id FROM Lead", compact=True)
+    schemas = set(id(page["records"][0]._schema) for page in query_result[0])
+
+    assert len(query_result[0]) == 3
+    assert len(schemas) == 1
+    assert len(query_result[1].schemas) == 1
+
+
+@responses.activate
+def test_query_parallel_compact_shares_schemas_across_slices():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    lead_ids = ["00Q0Y00000%05dAAA" % i for i in range(10)]
+
+    def callback(request):
+        body = {"totalSize": 10, "done": True, "records": [{"attributes": {"type": "Lead"}, "Id": i} for i in lead_ids]}
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(responses.GET, QUERY_URL, callback=callback)
+    client = testutil.get_client()
+
+    query_result = client.query_parallel("SELECT Id FROM Lead", chunks=2, compact=True, stream=True)
+    schemas = set(id(r._schema) for r in query_result[0])
+
+    assert len(schemas) == 1
+    assert len(query_result[1].schemas) == 1
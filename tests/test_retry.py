@@ -0,0 +1,108 @@
+import time
+
+import requests
+import responses
+
+import testutil
+from SalesforcePy import retry
+from SalesforcePy import sfdc
+
+QUERY_URL = "https://eu11.salesforce.com/services/data/v37.0/query/"
+UPDATE_URL = "https://eu11.salesforce.com/services/data/v37.0/sobjects/Account/0010Y0000055YG7QAM"
+UNABLE_TO_LOCK_ROW = [
+    {"message": "unable to obtain exclusive access to this record", "errorCode": "UNABLE_TO_LOCK_ROW"}]
+
+
+def get_client(**kwargs):
+    testutil.add_response("login_response_200")
+    client = sfdc.client(
+        testutil.username, testutil.password, testutil.client_id, testutil.client_secret, version="37.0", **kwargs)
+    client.login()
+    return client
+
+
+def get_calls(url):
+    return [c for c in responses.calls if c.request.url.split("?")[0] == url]
+
+
+@responses.activate
+def test_query_retried_after_503():
+    client = get_client(retry=True)
+    responses.add(responses.GET, QUERY_URL, status=503, headers={"Retry-After": "0"})
+    responses.add(responses.GET, QUERY_URL, status=503, headers={"Retry-After": "0"})
+    testutil.add_response("query_response_200")
+
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    assert query_result[1].status == 200
+    assert len(get_calls(QUERY_URL)) == 3
+    assert client.retry_policy.get_stats() == {"GET /services/data/v37.0/query/": {"retries": 2, "wait": 0.0}}
+
+
+@responses.activate
+def test_connection_error_retried_until_budget_exhausted():
+    client = get_client(retry=retry.RetryPolicy(retries=2, backoff_factor=0))
+    responses.add(responses.GET, QUERY_URL, body=requests.exceptions.ConnectionError("Connection reset by peer"))
+
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    assert len(get_calls(QUERY_URL)) == 3
+    assert isinstance(query_result[1].exceptions[0], requests.exceptions.ConnectionError)
+
+
+@responses.activate
+def test_lock_error_retried_only_with_non_idempotent_budget():
+    for (non_idempotent_retries, calls, status) in ((0, 1, 400), (1, 2, 204)):
+        responses.reset()
+        client = get_client(retry=retry.RetryPolicy(non_idempotent_retries=non_idempotent_retries, backoff_factor=0))
+        responses.add(responses.PATCH, UPDATE_URL, status=400, json=UNABLE_TO_LOCK_ROW)
+        responses.add(responses.PATCH, UPDATE_URL, status=204)
+
+        update_result = client.sobjects(object_type="Account", id="0010Y0000055YG7QAM").update({"Name": "sfdc_py"})
+
+        assert len(get_calls(UPDATE_URL)) == calls
+        assert update_result[1].status == status
+
+    assert client.retry_policy.get_stats() == {
+        "PATCH /services/data/v37.0/sobjects/Account/{id}": {"retries": 1, "wait": 0.0}}
+
+
+@responses.activate
+def test_deadline_stops_retries():
+    client = get_client(retry=retry.RetryPolicy(retries=10, deadline=1))
+    responses.add(responses.GET, QUERY_URL, status=503, headers={"Retry-After": "5"})
+
+    started = time.time()
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    assert time.time() - started < 1
+    assert query_result[1].status == 503
+    assert len(get_calls(QUERY_URL)) == 1
+
+
+@responses.activate
+def test_retry_disabled():
+    for kwargs in ({}, {"retry": False}):
+        responses.reset()
+        client = get_client(**kwargs)
+        responses.add(responses.GET, QUERY_URL, status=503)
+
+        query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+        assert client.retry_policy is None
+        assert query_result[1].status == 503
+        assert len(get_calls(QUERY_URL)) == 1
+
+
+def test_backoff():
+    policy = retry.RetryPolicy(backoff_factor=1, max_backoff=5)
+
+    assert all(0 <= policy.get_backoff(attempt) <= min(5, 2 ** attempt) for attempt in range(6) for i in range(20))
+    assert policy.get_backoff(0, {"Retry-After": "7"}) == 7.0
+    assert policy.get_backoff(0, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+
+def test_get_endpoint():
+    assert retry.get_endpoint("GET", UPDATE_URL) == "GET /services/data/v37.0/sobjects/Account/{id}"
+    assert retry.get_endpoint("GET", QUERY_URL + "0010Y0000055YG7-500") == (
+        "GET /services/data/v37.0/query/0010Y0000055YG7-500")
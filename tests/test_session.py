@@ -0,0 +1,63 @@
+import requests
+import responses
+
+import SalesforcePy as sfdc
+import testutil
+
+
+@responses.activate
+def test_requests_share_client_session():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("query_response_200")
+    testutil.add_response("insert_response_201")
+    testutil.add_response("jobs_create_200")
+
+    client = testutil.get_client()
+    query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+    insert_result = client.sobjects(object_type="Account").insert({"Name": "sfdc_py"})
+    create_result = client.jobs.ingest.create(job_resource={"object": "Account", "operation": "insert"})
+
+    assert isinstance(client.session, requests.Session)
+    assert query_result[1].session is client.session
+    assert insert_result[1].session is client.session
+    assert create_result[1].session is client.session
+
+
+def test_pool_kwargs():
+    client = sfdc.client(
+        username=testutil.username,
+        password=testutil.password,
+        client_id=testutil.client_id,
+        client_secret=testutil.client_secret,
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=3
+    )
+    adapter = client.session.get_adapter("https://eu11.salesforce.com")
+
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 3
+
+
+@responses.activate
+def test_user_session_is_not_closed():
+    testutil.add_response("login_response_200")
+    testutil.add_response("query_response_200")
+    testutil.add_response("logout_response_200")
+    session = requests.Session()
+    closed = []
+    session.close = lambda: closed.append(True)
+
+    with sfdc.client(
+            username=testutil.username,
+            password=testutil.password,
+            client_id=testutil.client_id,
+            client_secret=testutil.client_secret,
+            version="37.0",
+            session=session) as client:
+        query_result = client.query("SELECT Id, Name FROM Account LIMIT 10")
+
+    assert query_result[1].session is session
+    assert closed == []
@@ -0,0 +1,95 @@
+import os
+import stat
+
+import pytest
+import responses
+
+import testutil
+from SalesforcePy import commons
+from SalesforcePy import sfdc
+from SalesforcePy import tokens
+
+LOGIN_URL = "https://login.salesforce.com/services/oauth2/token"
+
+
+def get_client(token_store, **kwargs):
+    return sfdc.client(
+        testutil.username, testutil.password, testutil.client_id, testutil.client_secret,
+        token_store=token_store, **kwargs)
+
+
+def get_login_calls():
+    return [c for c in responses.calls if c.request.url == LOGIN_URL]
+
+
+@responses.activate
+def test_login_resumes_stored_token():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    token_store = tokens.MemoryTokenStore()
+
+    first = get_client(token_store)
+    first_login = first.login()
+    commons.resolve_kwargs(first.client_kwargs)
+    second = get_client(token_store)
+    second_login = second.login()
+
+    assert len(get_login_calls()) == 1
+    assert (first_login[1].from_cache, second_login[1].from_cache) == (False, True)
+    assert second_login[0]["access_token"] == first_login[0]["access_token"]
+    assert second.session_id == first.session_id
+    assert second.instance_url == "eu11.salesforce.com"
+    assert second.client_kwargs["version"] == "37.0"
+
+
+@responses.activate
+def test_login_refresh():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    token_store = tokens.MemoryTokenStore()
+
+    for refresh in (False, True):
+        client = get_client(token_store)
+        login_result = client.login(refresh=refresh)
+        commons.resolve_kwargs(client.client_kwargs)
+
+    assert len(get_login_calls()) == 2
+    assert not login_result[1].from_cache
+
+
+@responses.activate
+def test_logout_deletes_token():
+    testutil.add_response("login_response_200")
+    testutil.add_response("api_version_response_200")
+    testutil.add_response("logout_response_200")
+    token_store = tokens.MemoryTokenStore()
+    client = get_client(token_store, version="39.0")
+
+    client.login()
+    key = client.get_token_key()
+    assert token_store.get(key)["version"] == "39.0"
+
+    client.logout()
+    assert token_store.get(key) is None
+
+
+def test_file_token_store(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    key = tokens.get_token_key(None, testutil.username, testutil.client_id)
+    token = tokens.new_token("00D0Y000001dL8V!AQ", "eu11.salesforce.com", "45.0")
+
+    tokens.FileTokenStore(path).put(key, token)
+
+    assert tokens.FileTokenStore(path).get(key) == token
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    tokens.FileTokenStore(path).delete(key)
+    assert tokens.FileTokenStore(path).get(key) is None
+
+
+def test_incomplete_token_store():
+    class GetOnlyTokenStore(tokens.TokenStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyTokenStore()
@@ -2,6 +2,7 @@ import json
 import os
 import responses
 import SalesforcePy as sfdc
+from SalesforcePy import commons
 
 username = "jsoap@universalcontainers.com"
 password = "p@ssword1"
@@ -15,13 +16,18 @@ tests_dir = os.path.dirname(os.path.realpath(__file__))
 mock_responses = {}
 
 
-def add_response(res_key):
+def load_response(res_key):
     if res_key in mock_responses:
         res = mock_responses[res_key]
     else:
         with open(os.path.join(tests_dir, "fixtures/%s.json" % res_key)) as f:
             res = mock_responses[res_key] = json.loads(f.read())
 
+    return res
+
+
+def add_response(res_key):
+    res = load_response(res_key)
     body =  None if res["body"] is None else json.dumps(res["body"])
 
     responses.add(
@@ -32,14 +38,17 @@ def add_response(res_key):
         content_type=res["content_type"])
 
 
-def get_client():
+def get_client(**kwargs):
     client = sfdc.client(
         username=username,
         password=password,
         client_id=client_id,
-        client_secret=client_secret
+        client_secret=client_secret,
+        **kwargs
     )
     client.login()
+    # wait for the api version discovered in the background, so that tests see every call of the login
+    commons.resolve_kwargs(client.client_kwargs)
     return client
 
 
@@ -52,4 +61,6 @@ def get_client_with_proxy():
         proxies=proxies
     )
     client.login()
+    # wait for the api version discovered in the background, so that tests see every call of the login
+    commons.resolve_kwargs(client.client_kwargs)
     return client